@@ -1,7 +1,16 @@
 """safe_lyrics_checker package."""
 
-from .quote_safety import CheckResult, check_quote_safety
-from .rights_engine import RightsResult, RightsStatus, check_lyrics_rights
+from importlib import import_module
+
+# Public names resolve lazily (PEP 562) so ``import safe_lyrics_checker`` stays
+# cheap for short-lived CLI invocations.
+_EXPORTS = {
+    "CheckResult": "quote_safety",
+    "RightsResult": "rights_engine",
+    "RightsStatus": "rights_engine",
+    "check_quote_safety": "quote_safety",
+    "check_lyrics_rights": "rights_engine",
+}
 
 __all__ = [
     "CheckResult",
@@ -10,3 +19,12 @@ __all__ = [
     "check_quote_safety",
     "check_lyrics_rights",
 ]
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,229 @@
+"""Offline person-authority index for lyricist life dates.
+
+Authority dumps (CSV or JSON Lines of names with birth and death years) are
+bulk-imported with ``safe-lyrics-checker import-authority`` into SQLite,
+keyed by a normalized name: case, accents, punctuation, "Last, First" order
+and trailing life dates do not matter. :meth:`AuthorityIndex.resolve` then
+fills in death years for candidates and evidence pages without any network
+traffic, so life+70 verdicts no longer depend on a work page mentioning when
+the lyricist died.
+
+Resolution is conservative, because a name match alone says nothing about
+which of several namesakes wrote a work: a death year is only attached when
+the work's publication year is known and the person's life dates fit it.
+People born after publication or dead long before it are ignored, and a name
+whose remaining records disagree on the death year is treated as unknown.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import re
+import sqlite3
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Optional
+
+from .metrics import METRICS
+from .search_sources.models import Candidate
+from .url_sources.models import UrlMetadata
+
+DEFAULT_AUTHORITY_DB = Path(".cache/safe_lyrics_checker_authority.sqlite")
+IMPORT_BATCH_SIZE = 1000
+LOOKUP_CACHE_SIZE = 4096
+# A work published more than this long after its lyricist's death is far more
+# likely to be by a namesake than a posthumous first edition.
+MAX_POSTHUMOUS_YEARS = 30
+MAX_LIFESPAN_YEARS = 110
+
+LIFESPAN_RE = re.compile(r"\(?\b(1[5-9]\d{2}|20\d{2})?\s*-\s*(1[5-9]\d{2}|20\d{2})?\)?\s*$")
+_DATES_RE = re.compile(r"[,(]?\s*(?:b\.|d\.|fl\.|ca\.)?\s*\d{3,4}\s*-?\s*(?:\d{3,4})?\s*\)?\.?\s*$")
+_FULLER_FORM_RE = re.compile(r"\([^)]*\)")
+_PUNCT_RE = re.compile(r"[^\w\s]")
+
+
+@dataclass(frozen=True)
+class Person:
+    name: str
+    birth_year: Optional[int] = None
+    death_year: Optional[int] = None
+
+
+def normalize_person(name: str) -> str:
+    """Match key for a personal name: ``"Newton, John, 1725-1807"`` -> ``"john newton"``."""
+
+    # Dates first, then LoC fuller forms: "Weatherly, Fred E. (Frederic Edward)".
+    name = _FULLER_FORM_RE.sub(" ", _DATES_RE.sub("", name.strip()))
+    parts = [part.strip() for part in name.split(",") if part.strip()]
+    if len(parts) >= 2:
+        # Library headings: "Surname, Forenames[, other qualifiers]".
+        name = f"{parts[1]} {parts[0]}"
+    decomposed = unicodedata.normalize("NFKD", name)
+    ascii_only = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(_PUNCT_RE.sub(" ", ascii_only).lower().split())
+
+
+def _year(value: object) -> Optional[int]:
+    if value in (None, ""):
+        return None
+    try:
+        return int(str(value).strip()[:4])
+    except ValueError:
+        return None
+
+
+def _person(name: str, birth: object, death: object) -> Optional[Person]:
+    name = name.strip()
+    if not name:
+        return None
+    birth_year, death_year = _year(birth), _year(death)
+    if birth_year is None and death_year is None:
+        # Headings often carry the dates: "Newton, John, 1725-1807".
+        match = LIFESPAN_RE.search(name)
+        if match:
+            birth_year, death_year = _year(match.group(1)), _year(match.group(2))
+    return Person(name=name, birth_year=birth_year, death_year=death_year)
+
+
+def _read_csv(handle: IO[str]) -> Iterator[tuple[Person, list[str]]]:
+    for row in csv.DictReader(handle):
+        person = _person(row.get("name") or "", row.get("birth_year"), row.get("death_year"))
+        if person is not None:
+            yield person, [alt for alt in (row.get("alt_names") or "").split("|") if alt.strip()]
+
+
+def _read_jsonl(handle: IO[str]) -> Iterator[tuple[Person, list[str]]]:
+    for line in handle:
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        person = _person(str(item.get("name") or ""), item.get("birth_year"), item.get("death_year"))
+        if person is not None:
+            yield person, [str(alt) for alt in item.get("alt_names") or [] if str(alt).strip()]
+
+
+AUTHORITY_FORMATS = {"csv": _read_csv, "jsonl": _read_jsonl}
+
+
+def _plausible_author(person: Person, publication_year: int) -> bool:
+    death_year = person.death_year
+    if death_year is None or death_year < publication_year - MAX_POSTHUMOUS_YEARS:
+        return False
+    if person.birth_year is not None:
+        return person.birth_year <= publication_year
+    return death_year <= publication_year + MAX_LIFESPAN_YEARS
+
+
+class AuthorityIndex:
+    def __init__(self, db_path: Path = DEFAULT_AUTHORITY_DB):
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+        self._lookup = lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self._query)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path)
+
+    def _init_db(self) -> None:
+        with self._connect() as conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS persons (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    birth_year INTEGER,
+                    death_year INTEGER
+                );
+                CREATE UNIQUE INDEX IF NOT EXISTS persons_identity
+                    ON persons (name, IFNULL(birth_year, 0), IFNULL(death_year, 0));
+                CREATE TABLE IF NOT EXISTS person_names (
+                    name_key TEXT NOT NULL,
+                    person_id INTEGER NOT NULL REFERENCES persons (id),
+                    PRIMARY KEY (name_key, person_id)
+                ) WITHOUT ROWID;
+                """
+            )
+
+    def add(self, entries: Iterable[tuple[Person, Iterable[str]]]) -> int:
+        count = 0
+        with self._connect() as conn:
+            for person, alt_names in entries:
+                conn.execute(
+                    "INSERT OR IGNORE INTO persons (name, birth_year, death_year) VALUES (?, ?, ?)",
+                    (person.name, person.birth_year, person.death_year),
+                )
+                (person_id,) = conn.execute(
+                    "SELECT id FROM persons WHERE name = ? AND IFNULL(birth_year, 0) = ? AND IFNULL(death_year, 0) = ?",
+                    (person.name, person.birth_year or 0, person.death_year or 0),
+                ).fetchone()
+                keys = {normalize_person(name) for name in (person.name, *alt_names)}
+                conn.executemany(
+                    "INSERT OR IGNORE INTO person_names (name_key, person_id) VALUES (?, ?)",
+                    [(key, person_id) for key in keys if key],
+                )
+                count += 1
+                if count % IMPORT_BATCH_SIZE == 0:
+                    conn.commit()
+        self._lookup.cache_clear()
+        return count
+
+    def _query(self, name_key: str) -> tuple[Person, ...]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT p.name, p.birth_year, p.death_year FROM person_names n "
+                "JOIN persons p ON p.id = n.person_id WHERE n.name_key = ?",
+                (name_key,),
+            ).fetchall()
+        return tuple(Person(name, birth, death) for name, birth, death in rows)
+
+    def lookup(self, name: str) -> tuple[Person, ...]:
+        """Every person recorded under ``name``'s normalized key."""
+
+        key = normalize_person(name)
+        return self._lookup(key) if key else ()
+
+    def resolve(self, name: Optional[str], publication_year: Optional[int]) -> Optional[Person]:
+        """The one dated person ``name`` can safely be taken to mean for a work
+        published in ``publication_year``, if any."""
+
+        if not name or publication_year is None:
+            return None
+        people = [person for person in self.lookup(name) if _plausible_author(person, publication_year)]
+        if not people or len({person.death_year for person in people}) != 1:
+            return None
+        return people[0]
+
+    def death_year(self, name: Optional[str], publication_year: Optional[int]) -> Optional[int]:
+        person = self.resolve(name, publication_year)
+        return None if person is None else person.death_year
+
+
+def fill_candidate(candidate: Candidate, authority: Optional[AuthorityIndex]) -> Candidate:
+    """Fill a missing lyricist death year from ``authority``."""
+
+    if authority is not None and candidate.lyricist_death_year is None and candidate.lyricist:
+        death_year = authority.death_year(candidate.lyricist, candidate.publication_year)
+        if death_year is not None:
+            METRICS.incr("authority_hits", source=candidate.source)
+            candidate.lyricist_death_year = death_year
+    return candidate
+
+
+def fill_url_metadata(metadata: UrlMetadata, authority: Optional[AuthorityIndex]) -> UrlMetadata:
+    """Fill a missing death year for an evidence page's named lyricist or composer."""
+
+    if authority is not None and metadata.lyricist_death_year is None and metadata.lyricist_or_composer:
+        death_year = authority.death_year(metadata.lyricist_or_composer, metadata.publication_year)
+        if death_year is not None:
+            METRICS.incr("authority_hits", source="url")
+            metadata.lyricist_death_year = death_year
+    return metadata
+
+
+def import_authority(path: Path, authority_format: str, db_path: Path = DEFAULT_AUTHORITY_DB) -> int:
+    reader = AUTHORITY_FORMATS[authority_format]
+    with path.open(encoding="utf-8", newline="") as handle:
+        return AuthorityIndex(db_path).add(reader(handle))
@@ -0,0 +1,164 @@
+"""Batch URL evaluation split into an I/O stage and a CPU stage.
+
+Fetches run on a thread pool; HTML parsing and rights checks run on a
+process pool so large batches use every core instead of one GIL. Workers
+only receive the URL and reopen the shared cache backend themselves, so page
+bodies are never pickled across the process boundary. At most ``queue_size``
+URLs are in flight at once, and results come back in input order. Metrics
+recorded in a worker travel back with its result and are merged into the
+parent's :data:`~safe_lyrics_checker.metrics.METRICS`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+import os
+from collections import deque
+from pathlib import Path
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable, Iterator, Optional
+
+from .authority import AuthorityIndex
+from .cache_backends import BackendError, CacheBackend, open_backend
+from .http_cache import HttpCache
+from .metrics import METRICS
+from .rights_engine import RightsResult
+from .url_sources.evaluator import RawPage, extract_evidence, fetch_evidence
+from .url_sources.models import UrlEvaluation, UrlMetadata
+
+DEFAULT_FETCH_WORKERS = 8
+
+Result = tuple[RightsResult, UrlEvaluation]
+
+_worker_backend: Optional[CacheBackend] = None
+_worker_authority: Optional[AuthorityIndex] = None
+
+
+def _init_worker(backend_spec: str, authority_db: Optional[str] = None) -> None:
+    global _worker_backend, _worker_authority
+    _worker_backend = open_backend(backend_spec)
+    _worker_authority = AuthorityIndex(Path(authority_db)) if authority_db is not None else None
+
+
+def _digest(body: str) -> str:
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def _extract_cached(
+    url: str, jurisdiction: str, digest: str, record: Optional[UrlMetadata] = None
+) -> tuple[Optional[Result], dict]:
+    """Parse ``url``'s cached body if it is the one the parent fetched.
+
+    Returns ``None`` as the result when the store lacks that body, and the
+    metrics this call recorded for the parent to merge.
+    """
+
+    try:
+        entry = _worker_backend.get(url) if _worker_backend is not None else None
+    except BackendError:
+        entry = None
+    result = None
+    # A missing or different entry (the store failed, or holds another copy)
+    # is left for the parent to parse from the body it actually fetched.
+    if entry is not None and _digest(entry[1]) == digest:
+        result = extract_evidence(url, entry[1], jurisdiction, _worker_authority, record)
+    return result, METRICS.snapshot(reset=True)
+
+
+def _chain(
+    fetched: Future,
+    url: str,
+    jurisdiction: str,
+    cpu_pool: Optional[Executor],
+    authority: Optional[AuthorityIndex] = None,
+) -> Future:
+    done: Future = Future()
+
+    def extract_here(page: RawPage) -> None:
+        try:
+            done.set_result(extract_evidence(url, page.body, jurisdiction, authority, page.record))
+        except BaseException as exc:
+            done.set_exception(exc)
+
+    def on_fetched(source: Future) -> None:
+        try:
+            result = source.result()
+        except BaseException as exc:
+            done.set_exception(exc)
+            return
+        if not isinstance(result, RawPage):
+            done.set_result(result)
+        elif cpu_pool is None:
+            extract_here(result)
+        else:
+
+            def forward(parsed: Future) -> None:
+                try:
+                    value, metrics = parsed.result()
+                except BaseException as exc:
+                    done.set_exception(exc)
+                    return
+                METRICS.merge(metrics)
+                if value is None:
+                    extract_here(result)
+                else:
+                    done.set_result(value)
+
+            submitted = cpu_pool.submit(_extract_cached, url, jurisdiction, _digest(result.body), result.record)
+            submitted.add_done_callback(forward)
+
+    fetched.add_done_callback(on_fetched)
+    return done
+
+
+def evaluate_urls(
+    urls: Iterable[str],
+    jurisdiction: str,
+    *,
+    cache: HttpCache | None = None,
+    workers: Optional[int] = None,
+    fetch_workers: int = DEFAULT_FETCH_WORKERS,
+    queue_size: Optional[int] = None,
+    authority: Optional[AuthorityIndex] = None,
+) -> Iterator[tuple[str, RightsResult, UrlEvaluation]]:
+    """Yield ``(url, rights, evaluation)`` for each URL, like :func:`evaluate_url`.
+
+    ``workers`` is the CPU process count (default: all cores); ``0`` parses in
+    the fetching threads instead, which suits small batches and is always
+    the case when the cache replays an archive.
+    """
+
+    cache = cache or HttpCache()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    queue_size = queue_size or 4 * (fetch_workers + workers)
+    backend_spec = getattr(cache.backend, "spec", None)
+    cpu_pool: Optional[Executor] = None
+    # Replayed bodies never reach the backend, so workers could not read them.
+    if workers > 0 and backend_spec is not None and cache.replay is None:
+        # Workers start while fetch threads are running, so never fork.
+        cpu_pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(backend_spec, str(authority.db_path) if authority is not None else None),
+        )
+
+    in_flight: deque[tuple[str, Future]] = deque()
+    with ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix="batch-fetch") as io_pool:
+        try:
+            for url in urls:
+                fetched = io_pool.submit(fetch_evidence, url, jurisdiction, cache, authority)
+                in_flight.append((url, _chain(fetched, url, jurisdiction, cpu_pool, authority)))
+                if len(in_flight) >= queue_size:
+                    url, result = in_flight.popleft()
+                    yield (url, *result.result())
+            while in_flight:
+                url, result = in_flight.popleft()
+                yield (url, *result.result())
+        finally:
+            for _, result in in_flight:
+                result.cancel()
+            if cpu_pool is not None:
+                cpu_pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,430 @@
+"""Benchmark suite for the checker's hot paths.
+
+Run it with ``safe-lyrics-checker bench``. Network benchmarks talk to a local
+stub HTTP server that serves catalog pages, so results do not depend on the
+real catalogs. Results can be written as JSON and compared against an earlier
+run to catch slowdowns.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Optional
+from urllib.parse import urlsplit
+
+DEFAULT_CORPUS_SIZES = (1_000, 100_000)
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_REPEAT = 3
+SEARCH_QUERY = "amazing grace"
+
+
+@dataclass
+class BenchResult:
+    name: str
+    iterations: int
+    seconds_per_op: float
+    params: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def ops_per_second(self) -> float:
+        return 1.0 / self.seconds_per_op if self.seconds_per_op else float("inf")
+
+
+@dataclass
+class BenchContext:
+    pages: dict[str, str]
+    corpus_sizes: tuple[int, ...] = DEFAULT_CORPUS_SIZES
+    repeat: int = DEFAULT_REPEAT
+    # Scratch space for cache files; :func:`run_benchmarks` uses (and removes)
+    # a temporary directory when none is given.
+    workdir: Optional[Path] = None
+
+
+def _measure(fn: Callable[[], Any], *, iterations: int, repeat: int) -> float:
+    """Return the best per-operation time over ``repeat`` runs."""
+
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        best = min(best, (time.perf_counter() - started) / iterations)
+    return best
+
+
+# --- synthetic catalog pages ------------------------------------------------
+# Generated stand-ins shaped like catalog search and work pages, plus the
+# structured records (Gutenberg RDF, MediaWiki API JSON) sources read first.
+# Real pages can be benchmarked instead with ``--fixtures``.
+
+
+def _search_page(domain: str, link_prefix: str, titles: list[str]) -> str:
+    nav = "".join(f"<li><a href='/nav/{i}'>Navigation entry {i}</a></li>" for i in range(120))
+    results = "".join(
+        f"<li class='booklink'><a href='{link_prefix}{idx}'>{title}</a>"
+        f"<span class='subtitle'>Hymn collection {idx}</span></li>"
+        for idx, title in enumerate(titles, start=1)
+    )
+    return (
+        f"<html><head><title>Search results - {domain}</title></head><body>"
+        f"<ul class='nav'>{nav}</ul><ol class='results'>{results}</ol></body></html>"
+    )
+
+
+def _work_page(title: str, published: int, died: int, padding_kb: int = 40) -> str:
+    filler = "<p>Catalog notes and cross references for this edition.</p>" * (padding_kb * 1024 // 58)
+    return (
+        f"<html><head><title>{title}</title></head><body>"
+        f"<table class='bibrec'><tr><th>Title</th><td>{title}</td></tr>"
+        f"<tr><th>Text</th><td>Words by John Newton. died {died}.</td></tr>"
+        f"<tr><th>Release</th><td>Published {published}.</td></tr>"
+        f"<tr><th>Copyright</th><td>not renewed</td></tr></table>{filler}</body></html>"
+    )
+
+
+def _gutenberg_rdf(ebook: int, title: str, died: int) -> str:
+    # Like the real catalog records: creator and death date, no publication year.
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"\n'
+        '         xmlns:pgterms="http://www.gutenberg.org/2009/pgterms/"\n'
+        '         xmlns:dcterms="http://purl.org/dc/terms/">\n'
+        f'  <pgterms:ebook rdf:about="ebooks/{ebook}">\n'
+        f"    <dcterms:title>{title}</dcterms:title>\n"
+        "    <dcterms:creator>\n"
+        '      <pgterms:agent rdf:about="2009/agents/1">\n'
+        "        <pgterms:name>Newton, John</pgterms:name>\n"
+        f"        <pgterms:deathdate>{died}</pgterms:deathdate>\n"
+        "      </pgterms:agent>\n"
+        "    </dcterms:creator>\n"
+        "  </pgterms:ebook>\n"
+        "</rdf:RDF>\n"
+    )
+
+
+def _mediawiki_search(titles: list[str]) -> str:
+    return json.dumps({"query": {"search": [{"title": title} for title in titles]}})
+
+
+def _mediawiki_parse(title: str, published: int, died: int) -> str:
+    wikitext = f"|Lyricist=[[:Category:Newton, John|John Newton]] (1725-{died})\n|First Publication={published}\n"
+    return json.dumps({"parse": {"title": title, "wikitext": {"*": wikitext}}})
+
+
+def builtin_pages() -> dict[str, str]:
+    from .search_sources.gutenberg import SPEC as GUTENBERG
+    from .search_sources.imslp import SPEC as IMSLP
+
+    titles = [f"Amazing Grace Hymnal Volume {n}" for n in range(1, 6)]
+    imslp_titles = [f"Amazing Grace {n}" for n in range(1, 6)]
+    pages = {
+        "https://www.gutenberg.org/ebooks/search/?query=amazing+grace": _search_page(
+            "gutenberg.org", "/ebooks/", titles
+        ),
+        "https://imslp.org/wiki/Special:Search?search=amazing+grace": _search_page(
+            "imslp.org", "/wiki/Amazing_Grace_", titles
+        ),
+        IMSLP.api.search_url(SEARCH_QUERY, IMSLP.result_limit): _mediawiki_search(imslp_titles),
+    }
+    for idx, title in enumerate(titles, start=1):
+        gutenberg_url = f"https://www.gutenberg.org/ebooks/{idx}"
+        imslp_url = f"https://imslp.org/wiki/Amazing_Grace_{idx}"
+        pages[gutenberg_url] = _work_page(title, 1900 + idx, 1807)
+        pages[GUTENBERG.api.record_url(gutenberg_url)] = _gutenberg_rdf(idx, title, 1807)
+        pages[imslp_url] = _work_page(title, 1779, 1807)
+        pages[IMSLP.api.record_url(imslp_url)] = _mediawiki_parse(imslp_titles[idx - 1], 1779, 1807)
+    return pages
+
+
+def load_fixture_pages(directory: Path) -> dict[str, str]:
+    """Load the pages listed in ``manifest.json`` (URL -> file name)."""
+
+    manifest = json.loads((directory / "manifest.json").read_text(encoding="utf-8"))
+    return {url: (directory / name).read_text(encoding="utf-8") for url, name in manifest.items()}
+
+
+# --- local stub upstream ----------------------------------------------------
+
+
+def _stub_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"/{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+
+
+def _content_type(body: str) -> str:
+    head = body.lstrip()[:1]
+    if head in ("{", "["):
+        return "application/json"
+    if body.lstrip().startswith("<?xml"):
+        return "application/rdf+xml; charset=utf-8"
+    return "text/html; charset=utf-8"
+
+
+class StubCatalogServer:
+    """Serve ``pages`` (keyed by original URL) from a local HTTP server.
+
+    Paths with no page answer 404 and are collected in ``misses``.
+    """
+
+    def __init__(self, pages: dict[str, str]) -> None:
+        routes = {_stub_key(url): (body.encode("utf-8"), _content_type(body)) for url, body in pages.items()}
+        misses: list[str] = []
+        self.misses = misses
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                route = routes.get(self.path)
+                if route is None:
+                    misses.append(self.path)
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body, content_type = route
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                return None
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        host, port = self._server.server_address[:2]
+        self.base_url = f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubCatalogServer":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def session(self):
+        """Return a ``requests.Session`` that routes every URL to this server."""
+
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        base_url = self.base_url
+
+        class LocalAdapter(HTTPAdapter):
+            def send(self, request, **kwargs):
+                request.url = f"{base_url}{_stub_key(request.url)}"
+                return super().send(request, **kwargs)
+
+        session = requests.Session()
+        adapter = LocalAdapter()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+
+# --- benchmarks -------------------------------------------------------------
+
+
+def bench_rights_check(ctx: BenchContext) -> list[BenchResult]:
+    from .rights_engine import check_lyrics_rights
+
+    cases = [
+        {"jurisdiction": "US", "publication_year": 1920},
+        {"jurisdiction": "US", "publication_year": 1950, "renewal_status": "not_renewed"},
+        {"jurisdiction": "US", "publication_year": 1990, "lyricist_death_year": 1940},
+        {"jurisdiction": "UK", "lyricist_death_year": 1960},
+        {"jurisdiction": "AU"},
+    ]
+
+    def run() -> None:
+        for case in cases:
+            check_lyrics_rights(**case)
+
+    per_batch = _measure(run, iterations=20_000, repeat=ctx.repeat)
+    return [BenchResult("rights_check", 20_000 * len(cases), per_batch / len(cases))]
+
+
+def _corpus(size: int) -> list[str]:
+    return [f"Synthetic corpus line number {n} with a few extra words" for n in range(size)]
+
+
+def bench_quote_check(ctx: BenchContext) -> list[BenchResult]:
+    from .quote_safety import KnownLyricsIndex, check_quote_safety
+
+    excerpt = "a line that is not in the corpus at all"
+    results: list[BenchResult] = []
+    for size in ctx.corpus_sizes:
+        corpus = _corpus(size)
+        iterations = max(1, min(200, 200_000 // size))
+        per_op = _measure(lambda: check_quote_safety(excerpt, known_lyrics=corpus), iterations=iterations, repeat=ctx.repeat)
+        results.append(BenchResult("quote_check_list", iterations, per_op, {"corpus_lines": size}))
+
+        index = KnownLyricsIndex(corpus)
+        per_op = _measure(lambda: check_quote_safety(excerpt, known_lyrics=index), iterations=2_000, repeat=ctx.repeat)
+        results.append(BenchResult("quote_check_index", 2_000, per_op, {"corpus_lines": size}))
+    return results
+
+
+def bench_extract_metadata(ctx: BenchContext) -> list[BenchResult]:
+    from .url_sources.common import extract_metadata_generic
+
+    page = max(ctx.pages.values(), key=len)
+    per_op = _measure(lambda: extract_metadata_generic(page), iterations=20, repeat=ctx.repeat)
+    return [BenchResult("extract_metadata_generic", 20, per_op, {"page_bytes": len(page)})]
+
+
+def bench_http_cache(ctx: BenchContext) -> list[BenchResult]:
+    from .http_cache import HttpCache
+
+    with StubCatalogServer(ctx.pages) as server:
+        cache = HttpCache(db_path=ctx.workdir / "cache-bench.sqlite", session=server.session())
+        urls = list(ctx.pages)
+        for url in urls:
+            cache.get_text(url)
+
+        def hit() -> None:
+            for url in urls:
+                cache.get_text(url)
+
+        hit_per_op = _measure(hit, iterations=20, repeat=ctx.repeat) / len(urls)
+
+        counter = iter(range(10**9))
+
+        def miss() -> None:
+            cold = HttpCache(db_path=ctx.workdir / f"cache-miss-{next(counter)}.sqlite", session=cache.session)
+            cold.get_text(urls[0])
+
+        miss_per_op = _measure(miss, iterations=10, repeat=ctx.repeat)
+
+    return [
+        BenchResult("http_cache_hit", 20 * len(urls), hit_per_op),
+        BenchResult("http_cache_miss", 10, miss_per_op),
+    ]
+
+
+def bench_search(ctx: BenchContext) -> list[BenchResult]:
+    from .http_cache import HttpCache
+    from .search_engine import search_candidates
+
+    sources = sorted({_source_for(url) for url in ctx.pages} - {None})
+    counter = iter(range(10**9))
+    with StubCatalogServer(ctx.pages) as server:
+        session = server.session()
+
+        def cold() -> None:
+            cache = HttpCache(db_path=ctx.workdir / f"search-cold-{next(counter)}.sqlite", session=session)
+            search_candidates(SEARCH_QUERY, sources=sources, max_results=5, cache=cache)
+
+        warm_cache = HttpCache(db_path=ctx.workdir / "search-warm.sqlite", session=session)
+        search_candidates(SEARCH_QUERY, sources=sources, max_results=5, cache=warm_cache)
+
+        def warm() -> None:
+            search_candidates(SEARCH_QUERY, sources=sources, max_results=5, cache=warm_cache)
+
+        cold_per_op = _measure(cold, iterations=3, repeat=ctx.repeat)
+        warm_per_op = _measure(warm, iterations=10, repeat=ctx.repeat)
+
+    params = {"sources": sources}
+    return [
+        BenchResult("search_cold_cache", 3, cold_per_op, params),
+        BenchResult("search_warm_cache", 10, warm_per_op, params),
+    ]
+
+
+def _source_for(url: str) -> Optional[str]:
+    from .search_sources.registry import SOURCES
+
+    spec = SOURCES.for_host(urlsplit(url).hostname or "")
+    return getattr(spec, "name", None)
+
+
+def bench_cli_startup(ctx: BenchContext) -> list[BenchResult]:
+    argv = ["rights-check", "--jurisdiction", "US", "--publication-year", "1929"]
+    script = f"from safe_lyrics_checker.cli import main; main({argv!r})"
+    per_op = _measure(
+        lambda: subprocess.run([sys.executable, "-c", script], check=True, capture_output=True),
+        iterations=5,
+        repeat=ctx.repeat,
+    )
+    return [BenchResult("cli_startup_rights_check", 5, per_op)]
+
+
+BENCHMARKS: dict[str, Callable[[BenchContext], list[BenchResult]]] = {
+    "rights_check": bench_rights_check,
+    "quote_check": bench_quote_check,
+    "extract_metadata": bench_extract_metadata,
+    "http_cache": bench_http_cache,
+    "search": bench_search,
+    "cli_startup": bench_cli_startup,
+}
+
+
+def run_benchmarks(ctx: BenchContext, names: Optional[list[str]] = None) -> list[BenchResult]:
+    scratch = None
+    if ctx.workdir is None:
+        scratch = tempfile.TemporaryDirectory(prefix="safe-lyrics-bench-")
+        ctx.workdir = Path(scratch.name)
+    try:
+        results: list[BenchResult] = []
+        for name in names or list(BENCHMARKS):
+            results.extend(BENCHMARKS[name](ctx))
+        return results
+    finally:
+        if scratch is not None:
+            ctx.workdir = None
+            scratch.cleanup()
+
+
+# --- reporting --------------------------------------------------------------
+
+
+def _result_key(result: dict[str, Any]) -> str:
+    params = ",".join(f"{k}={v}" for k, v in sorted(result.get("params", {}).items()))
+    return f"{result['name']}[{params}]" if params else result["name"]
+
+
+def results_document(results: list[BenchResult]) -> dict[str, Any]:
+    return {
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "results": [asdict(result) for result in results],
+    }
+
+
+def compare_results(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[str]:
+    """Return a description of every benchmark slower than baseline by ``threshold``."""
+
+    previous = {_result_key(result): result for result in baseline.get("results", [])}
+    regressions: list[str] = []
+    for result in current.get("results", []):
+        key = _result_key(result)
+        before = previous.get(key)
+        if before is None or not before["seconds_per_op"]:
+            continue
+        ratio = result["seconds_per_op"] / before["seconds_per_op"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{key}: {before['seconds_per_op'] * 1e6:.1f}us -> {result['seconds_per_op'] * 1e6:.1f}us ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def format_table(results: list[BenchResult]) -> str:
+    lines = [f"{'benchmark':<52} {'per op':>14} {'ops/s':>14}"]
+    for result in results:
+        key = _result_key(asdict(result))
+        lines.append(f"{key:<52} {result.seconds_per_op * 1e6:>12.1f}us {result.ops_per_second:>14.1f}")
+    return "\n".join(lines)
@@ -0,0 +1,311 @@
+"""Storage backends for :class:`~safe_lyrics_checker.http_cache.HttpCache`.
+
+A backend maps a URL to ``(fetched_at, body)``. Freshness, revalidation and
+network access stay in ``HttpCache``; backends only store entries. A store
+that is unreachable or full raises :class:`BackendError`, which ``HttpCache``
+treats as a miss (or a skipped store) so fetching carries on from the origin.
+
+- :class:`SqliteBackend` (default) is a single SQLite file in WAL mode.
+- :class:`LmdbBackend` is a memory-mapped LMDB environment that many
+  processes on one host can read concurrently without lock contention. It
+  needs the optional ``lmdb`` package (``pip install 'safe_lyrics_checker[lmdb]'``).
+- :class:`RemoteBackend` talks to a :class:`CacheServer` over HTTP, so
+  workers on several hosts can share one warm cache. Writes carry the shared
+  token from ``$SAFE_LYRICS_CHECKER_CACHE_TOKEN``; a server started without
+  one is read-only.
+
+:func:`open_backend` builds a backend from a spec string such as
+``sqlite:/var/cache/slc.sqlite``, ``lmdb:/var/cache/slc.lmdb`` or
+``http://cache-host:8766``.
+"""
+
+from __future__ import annotations
+
+import hmac
+import os
+import sqlite3
+import struct
+import sys
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional, Protocol
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from .defaults import DEFAULT_SERVER_HOST, DEFAULT_SERVER_PORT
+
+DEFAULT_LMDB_MAP_SIZE = 1 << 30
+DEFAULT_REMOTE_TIMEOUT_SECONDS = 5
+CACHE_TOKEN_ENV = "SAFE_LYRICS_CHECKER_CACHE_TOKEN"
+
+Entry = tuple[int, str]
+
+
+class BackendError(Exception):
+    """The cache store could not complete a read or write."""
+
+
+class CacheBackend(Protocol):
+    # The :func:`open_backend` spec reopening this store in another process.
+    spec: str
+
+    def get(self, url: str) -> Optional[Entry]:
+        ...
+
+    def set(self, url: str, fetched_at: int, body: str) -> None:
+        ...
+
+
+class SqliteBackend:
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    @property
+    def spec(self) -> str:
+        return f"sqlite:{self.db_path}"
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_db(self) -> None:
+        with self._connect() as conn:
+            # WAL lets readers proceed while another process writes.
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS http_cache (
+                    url TEXT PRIMARY KEY,
+                    fetched_at INTEGER NOT NULL,
+                    body TEXT NOT NULL
+                )
+                """
+            )
+
+    def get(self, url: str) -> Optional[Entry]:
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT fetched_at, body FROM http_cache WHERE url = ?", (url,)
+                ).fetchone()
+        except sqlite3.Error as exc:
+            raise BackendError(f"SQLite cache read failed: {exc}") from exc
+        return None if row is None else (int(row[0]), str(row[1]))
+
+    def set(self, url: str, fetched_at: int, body: str) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO http_cache (url, fetched_at, body) VALUES (?, ?, ?)",
+                    (url, fetched_at, body),
+                )
+        except sqlite3.Error as exc:
+            raise BackendError(f"SQLite cache write failed: {exc}") from exc
+
+
+_LMDB_HEADER = struct.Struct(">q")
+
+
+class LmdbBackend:
+    def __init__(self, path: Path, map_size: int = DEFAULT_LMDB_MAP_SIZE) -> None:
+        try:
+            import lmdb
+        except ImportError as exc:
+            raise RuntimeError(
+                "The LMDB cache backend needs the 'lmdb' package: pip install 'safe_lyrics_checker[lmdb]'"
+            ) from exc
+        self.path = path
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._env = lmdb.open(str(path), map_size=map_size, max_readers=512)
+        self._error = lmdb.Error
+
+    @property
+    def spec(self) -> str:
+        return f"lmdb:{self.path}"
+
+    def get(self, url: str) -> Optional[Entry]:
+        try:
+            with self._env.begin() as txn:
+                value = txn.get(url.encode("utf-8"))
+        except self._error as exc:
+            raise BackendError(f"LMDB cache read failed: {exc}") from exc
+        if value is None:
+            return None
+        (fetched_at,) = _LMDB_HEADER.unpack_from(value)
+        return fetched_at, zlib.decompress(value[_LMDB_HEADER.size :]).decode("utf-8")
+
+    def set(self, url: str, fetched_at: int, body: str) -> None:
+        value = _LMDB_HEADER.pack(fetched_at) + zlib.compress(body.encode("utf-8"))
+        try:
+            with self._env.begin(write=True) as txn:
+                txn.put(url.encode("utf-8"), value)
+        except self._error as exc:
+            # Typically MapFullError once the map size is reached.
+            raise BackendError(f"LMDB cache write failed: {exc}") from exc
+
+    def close(self) -> None:
+        self._env.close()
+
+
+class RemoteBackend:
+    def __init__(
+        self, base_url: str, session: Optional[requests.Session] = None, *, token: Optional[str] = None
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.session = session or requests.Session()
+        self.token = token
+
+    @property
+    def spec(self) -> str:
+        return self.base_url
+
+    def get(self, url: str) -> Optional[Entry]:
+        try:
+            response = self.session.get(
+                f"{self.base_url}/entry", params={"url": url}, timeout=DEFAULT_REMOTE_TIMEOUT_SECONDS
+            )
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            return int(response.headers["X-Fetched-At"]), response.content.decode("utf-8")
+        except (requests.RequestException, KeyError, ValueError) as exc:
+            raise BackendError(f"cache server {self.base_url} read failed: {exc}") from exc
+
+    def set(self, url: str, fetched_at: int, body: str) -> None:
+        headers = {"X-Fetched-At": str(fetched_at)}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        try:
+            response = self.session.put(
+                f"{self.base_url}/entry",
+                params={"url": url},
+                data=body.encode("utf-8"),
+                headers=headers,
+                timeout=DEFAULT_REMOTE_TIMEOUT_SECONDS,
+            )
+            response.raise_for_status()
+        except requests.RequestException as exc:
+            raise BackendError(f"cache server {self.base_url} write failed: {exc}") from exc
+
+
+class _CacheHandler(BaseHTTPRequestHandler):
+    server: "CacheServer"
+
+    def _entry_url(self) -> Optional[str]:
+        parsed = urlparse(self.path)
+        if parsed.path != "/entry":
+            self._reply(404, b"")
+            return None
+        values = parse_qs(parsed.query).get("url")
+        if not values:
+            self._reply(400, b"Missing url parameter.")
+            return None
+        return values[0]
+
+    def do_GET(self) -> None:
+        url = self._entry_url()
+        if url is None:
+            return
+        entry = self.server.backend.get(url)
+        if entry is None:
+            self._reply(404, b"")
+            return
+        self._reply(200, entry[1].encode("utf-8"), fetched_at=entry[0])
+
+    def do_PUT(self) -> None:
+        # Anyone who can write could plant a page that every worker then trusts.
+        if self.server.token is None:
+            self._reply(403, f"Writes are disabled; restart with ${CACHE_TOKEN_ENV} set.".encode("utf-8"))
+            return
+        supplied = self.headers.get("Authorization", "").encode("utf-8")
+        if not hmac.compare_digest(supplied, f"Bearer {self.server.token}".encode("utf-8")):
+            self._reply(401, b"Missing or wrong cache token.")
+            return
+        url = self._entry_url()
+        if url is None:
+            return
+        try:
+            fetched_at = int(self.headers["X-Fetched-At"])
+        except (TypeError, ValueError):
+            self._reply(400, b"Missing X-Fetched-At header.")
+            return
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.server.backend.set(url, fetched_at, body.decode("utf-8"))
+        self._reply(204, b"")
+
+    def _reply(self, status: int, body: bytes, fetched_at: Optional[int] = None) -> None:
+        self.send_response(status)
+        if fetched_at is not None:
+            self.send_header("X-Fetched-At", str(fetched_at))
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class CacheServer(ThreadingHTTPServer):
+    """Small HTTP front end sharing one backend with :class:`RemoteBackend` clients.
+
+    Reads are open; writes need ``Authorization: Bearer <token>``, and are
+    refused outright when ``token`` is ``None``.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        backend: CacheBackend,
+        *,
+        token: Optional[str] = None,
+        verbose: bool = False,
+    ) -> None:
+        super().__init__(address, _CacheHandler)
+        self.backend = backend
+        self.token = token or None
+        self.verbose = verbose
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def open_backend(spec: str) -> CacheBackend:
+    if spec.startswith(("http://", "https://")):
+        return RemoteBackend(spec, token=os.environ.get(CACHE_TOKEN_ENV))
+    kind, sep, location = spec.partition(":")
+    if not sep or not location:
+        raise ValueError(f"Cache backend must look like sqlite:PATH, lmdb:PATH or http://HOST:PORT, got {spec!r}")
+    if kind == "sqlite":
+        return SqliteBackend(Path(location))
+    if kind == "lmdb":
+        return LmdbBackend(Path(location))
+    raise ValueError(f"Unknown cache backend: {kind!r}")
+
+
+def serve_cache(
+    backend: CacheBackend,
+    host: str = DEFAULT_SERVER_HOST,
+    port: int = DEFAULT_SERVER_PORT,
+    *,
+    token: Optional[str] = None,
+    verbose: bool = False,
+) -> None:
+    server = CacheServer((host, port), backend, token=token, verbose=verbose)
+    print(f"Serving HTTP cache on {server.url}", file=sys.stderr)
+    if server.token is None:
+        print(f"WARN: ${CACHE_TOKEN_ENV} is not set; the cache is read-only.", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -3,13 +3,58 @@
 from __future__ import annotations
 
 import argparse
+import os
+import sys
 from pathlib import Path
-from typing import Sequence
+from typing import TYPE_CHECKING, Sequence
 
-from .quote_safety import check_quote_safety
-from .rights_engine import RightsStatus, check_lyrics_rights
-from .search_engine import SOURCES, evaluate_candidate, search_candidates
-from .url_sources import evaluate_url
+from .defaults import (
+    DEFAULT_HOST,
+    DEFAULT_PORT,
+    DEFAULT_QUEUE_SIZE,
+    DEFAULT_RATE,
+    DEFAULT_REFRESH_WINDOW_SECONDS,
+    DEFAULT_SERVER_HOST,
+    DEFAULT_SERVER_PORT,
+    DEFAULT_WORKERS,
+)
+from .quote_safety import KnownLyricsIndex, LyricsIndex, check_quote_safety
+from .rights_engine import RightsResult, RightsStatus, check_lyrics_rights
+
+if TYPE_CHECKING:
+    from .search_sources.models import Candidate
+
+# Network, search and service modules are imported inside the subcommands that
+# need them so pure-computation commands like rights-check start quickly.
+
+OUTPUT_FORMATS = ["text", "json", "jsonl"]
+
+
+def _duration(text: str) -> float:
+    from .deadline import parse_duration
+
+    try:
+        return parse_duration(text)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
+def _add_authority_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--authority-db",
+        type=Path,
+        help="Person-authority index (from import-authority) to fill in lyricist death years offline.",
+    )
+
+
+def _add_format_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--format",
+        dest="output_format",
+        choices=OUTPUT_FORMATS,
+        default="text",
+        help="Output format: human-readable text (default), one JSON document, or JSON Lines.",
+    )
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -19,6 +64,60 @@ def build_parser() -> argparse.ArgumentParser:
             "Metadata-only lyric rights checker with optional quote safety heuristics."
         ),
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a per-stage timing and counter breakdown to stderr on exit.",
+    )
+    archive_group = parser.add_mutually_exclusive_group()
+    archive_group.add_argument(
+        "--record",
+        type=Path,
+        metavar="ARCHIVE",
+        help="Record every HTTP response (headers, body, latency) into this archive file.",
+    )
+    archive_group.add_argument(
+        "--replay",
+        type=Path,
+        metavar="ARCHIVE",
+        help="Serve HTTP responses from this archive file with no network access.",
+    )
+    parser.add_argument(
+        "--cache-backend",
+        default=os.environ.get("SAFE_LYRICS_CHECKER_CACHE"),
+        metavar="SPEC",
+        help=(
+            "HTTP cache storage: sqlite:PATH, lmdb:PATH or http://HOST:PORT "
+            "(default: $SAFE_LYRICS_CHECKER_CACHE, else the --cache-db SQLite file)."
+        ),
+    )
+    parser.add_argument(
+        "--stale-while-revalidate",
+        type=int,
+        metavar="SECONDS",
+        help="Serve cache entries up to this long past their TTL at once and refresh them in the background.",
+    )
+    parser.add_argument(
+        "--stale-if-error",
+        type=int,
+        metavar="SECONDS",
+        help="Serve cache entries up to this long past their TTL when a fresh fetch fails.",
+    )
+    parser.add_argument(
+        "--hedge",
+        action="store_true",
+        help="Send a duplicate request when a fetch runs past its host's p95 latency and use the first answer.",
+    )
+    parser.add_argument(
+        "--no-negative-cache",
+        action="store_true",
+        help="Re-request URLs that recently failed (404/403/timeout/anti-bot) instead of reusing the failure.",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        action="store_true",
+        help="With --replay, wait for each response's originally recorded latency.",
+    )
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     rights_parser = subparsers.add_parser(
@@ -33,6 +132,7 @@ def build_parser() -> argparse.ArgumentParser:
         choices=["unknown", "renewed", "not_renewed"],
         default="unknown",
     )
+    _add_format_argument(rights_parser)
 
     search_parser = subparsers.add_parser(
         "search",
@@ -43,14 +143,35 @@ def build_parser() -> argparse.ArgumentParser:
     search_parser.add_argument("--max-results", type=int, default=10)
     search_parser.add_argument(
         "--sources",
-        default=",".join(SOURCES.keys()),
-        help="Comma-separated subset of sources: gutenberg,imslp,cpdl,loc,archive,worldcat,copyright",
+        help=(
+            "Comma-separated subset of sources: gutenberg,imslp,cpdl,loc,archive,worldcat,copyright,local "
+            "plus any installed plugin sources (default: all)."
+        ),
     )
     search_parser.add_argument(
         "--strict",
         action="store_true",
         help="Fail fast on source HTTP errors instead of skipping failed sources.",
     )
+    search_parser.add_argument(
+        "--first",
+        action="store_true",
+        help="Stop after the first candidate with a definitive SAFE/NOT_SAFE verdict and exit with its code.",
+    )
+    search_parser.add_argument(
+        "--work-store",
+        type=Path,
+        help="Persistent work store: answers repeat queries and skips enrichment for works already resolved.",
+    )
+    search_parser.add_argument(
+        "--deadline",
+        type=_duration,
+        metavar="DURATION",
+        help="Latency budget such as 5s or 800ms; when it runs out, unfinished fetches are "
+        "abandoned and the candidates gathered so far are printed as partial results.",
+    )
+    _add_authority_argument(search_parser)
+    _add_format_argument(search_parser)
 
     quote_parser = subparsers.add_parser(
         "quote-check",
@@ -63,13 +184,21 @@ def build_parser() -> argparse.ArgumentParser:
         help="Lyric excerpt text. If omitted, --file is required.",
     )
     quote_parser.add_argument("--file", type=Path, help="Read excerpt text from a file.")
-    quote_parser.add_argument(
+    quote_lyrics_group = quote_parser.add_mutually_exclusive_group()
+    quote_lyrics_group.add_argument(
         "--known-lyrics-file",
         type=Path,
         help="Optional file with one known lyric segment per line.",
     )
+    quote_lyrics_group.add_argument(
+        "--known-lyrics-index",
+        type=Path,
+        metavar="PREFIX",
+        help="Known-lyrics index built by build-lyrics-index, queried in place instead of loaded.",
+    )
     quote_parser.add_argument("--max-words", type=int, default=90)
     quote_parser.add_argument("--max-lines", type=int, default=4)
+    _add_format_argument(quote_parser)
 
     evaluate_url_parser = subparsers.add_parser(
         "evaluate-url",
@@ -77,6 +206,212 @@ def build_parser() -> argparse.ArgumentParser:
     )
     evaluate_url_parser.add_argument("--jurisdiction", choices=["US", "UK", "AU"], required=True)
     evaluate_url_parser.add_argument("url", help="Single evidence URL to fetch and evaluate.")
+    _add_authority_argument(evaluate_url_parser)
+    _add_format_argument(evaluate_url_parser)
+
+    evaluate_urls_parser = subparsers.add_parser(
+        "evaluate-urls",
+        help="Evaluate many evidence URLs, fetching on threads and parsing on all CPU cores.",
+    )
+    evaluate_urls_parser.add_argument("--jurisdiction", choices=["US", "UK", "AU"], required=True)
+    evaluate_urls_parser.add_argument("urls_file", type=Path, help="File of evidence URLs, one per line.")
+    evaluate_urls_parser.add_argument(
+        "--workers",
+        type=int,
+        help="Parsing processes (default: one per CPU core; 0 parses in the fetch threads).",
+    )
+    evaluate_urls_parser.add_argument("--fetch-workers", type=int, help="Concurrent fetch threads.")
+    _add_authority_argument(evaluate_urls_parser)
+    _add_format_argument(evaluate_urls_parser)
+
+    import_catalog_parser = subparsers.add_parser(
+        "import-catalog",
+        help="Bulk-import catalog metadata into the offline 'local' search source.",
+    )
+    import_catalog_parser.add_argument(
+        "path",
+        type=Path,
+        help="Catalog dump: RDF file/directory/tar archive, or loc.gov JSON/JSONL.",
+    )
+    import_catalog_parser.add_argument(
+        "--format",
+        dest="catalog_format",
+        choices=["gutenberg-rdf", "loc-json"],
+        required=True,
+    )
+    import_catalog_parser.add_argument(
+        "--catalog-db",
+        type=Path,
+        help="Catalog index path (default: $SAFE_LYRICS_CHECKER_CATALOG, else "
+        ".cache/safe_lyrics_checker_catalog.sqlite). The 'local' source reads the same default.",
+    )
+
+    import_authority_parser = subparsers.add_parser(
+        "import-authority",
+        help="Bulk-import person authority records (names with birth/death years) for offline death-year lookup.",
+    )
+    import_authority_parser.add_argument(
+        "path",
+        type=Path,
+        help="CSV (name,birth_year,death_year[,alt_names]) or JSON Lines with the same fields.",
+    )
+    import_authority_parser.add_argument(
+        "--format",
+        dest="authority_format",
+        choices=["csv", "jsonl"],
+        required=True,
+    )
+    import_authority_parser.add_argument(
+        "--authority-db",
+        type=Path,
+        help="Authority index path (default: .cache/safe_lyrics_checker_authority.sqlite).",
+    )
+
+    build_index_parser = subparsers.add_parser(
+        "build-lyrics-index",
+        help="Compile a known-lyrics corpus into an on-disk index queried without loading it.",
+    )
+    build_index_parser.add_argument("corpus", type=Path, help="Corpus file with one known lyric segment per line.")
+    build_index_parser.add_argument(
+        "--output",
+        type=Path,
+        required=True,
+        metavar="PREFIX",
+        help="Writes PREFIX.lyrics (compiled) or PREFIX.bloom and PREFIX.sqlite (bloom).",
+    )
+    build_index_parser.add_argument(
+        "--format",
+        dest="index_format",
+        choices=["compiled", "bloom"],
+        default="compiled",
+        help="compiled: one mmap-shared file of sorted line hashes (default); "
+        "bloom: a small Bloom filter in front of an exact SQLite store.",
+    )
+    build_index_parser.add_argument(
+        "--false-positive-rate",
+        type=float,
+        default=0.01,
+        help="Bloom filter false-positive rate for --format bloom; lower costs more bits per line (default: 0.01).",
+    )
+
+    bench_parser = subparsers.add_parser(
+        "bench",
+        help="Run the built-in performance benchmarks.",
+    )
+    bench_parser.add_argument(
+        "--only",
+        help="Comma-separated benchmarks: rights_check,quote_check,extract_metadata,http_cache,search,cli_startup",
+    )
+    bench_parser.add_argument(
+        "--corpus-sizes",
+        default="1000,100000",
+        help="Comma-separated known-lyrics corpus sizes for quote_check (e.g. 1000,1000000,10000000).",
+    )
+    bench_parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark; the best is kept.")
+    bench_parser.add_argument(
+        "--fixtures",
+        type=Path,
+        help="Directory of catalog pages with a manifest.json (default: built-in synthetic pages).",
+    )
+    bench_parser.add_argument("--output", type=Path, help="Write machine-readable results to this JSON file.")
+    bench_parser.add_argument("--compare", type=Path, help="Baseline results JSON to compare against.")
+    bench_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown versus --compare before failing (0.25 = 25%%).",
+    )
+
+    cache_parser = subparsers.add_parser("cache", help="Manage the HTTP cache.")
+    cache_subparsers = cache_parser.add_subparsers(dest="cache_command", required=True)
+    warm_parser = cache_subparsers.add_parser(
+        "warm",
+        help="Pre-fetch search and work pages for known queries or URLs.",
+    )
+    warm_parser.add_argument(
+        "--queries",
+        type=Path,
+        help="File of search queries, one per line ('#' starts a comment).",
+    )
+    warm_parser.add_argument("--urls", type=Path, help="File of URLs to fetch, one per line.")
+    warm_parser.add_argument(
+        "--sources",
+        default=None,
+        help="Comma-separated sources to warm for --queries (default: all registered sources).",
+    )
+    warm_parser.add_argument("--max-results", type=int, default=5, help="Work pages to fetch per source and query.")
+    warm_parser.add_argument(
+        "--rate",
+        type=float,
+        default=DEFAULT_RATE,
+        help="Maximum network fetches per second (default: %(default)s).",
+    )
+    warm_parser.add_argument(
+        "--refresh-within",
+        type=int,
+        default=DEFAULT_REFRESH_WINDOW_SECONDS,
+        help="Refresh entries expiring within this many seconds (default: %(default)s).",
+    )
+    warm_parser.add_argument(
+        "--cache-db",
+        type=Path,
+        help="HTTP cache database path (default: .cache/safe_lyrics_checker.sqlite).",
+    )
+
+    cache_serve_parser = cache_subparsers.add_parser(
+        "serve",
+        help=(
+            "Share one cache with other hosts' workers (use with --cache-backend http://HOST:PORT). "
+            "Writes need the shared token in $SAFE_LYRICS_CHECKER_CACHE_TOKEN."
+        ),
+    )
+    cache_serve_parser.add_argument(
+        "--host", default=DEFAULT_SERVER_HOST, help="Bind address (default: %(default)s)."
+    )
+    cache_serve_parser.add_argument(
+        "--port", type=int, default=DEFAULT_SERVER_PORT, help="Bind port (default: %(default)s)."
+    )
+    cache_serve_parser.add_argument(
+        "--cache-db",
+        type=Path,
+        help="SQLite file backing the server when --cache-backend is not set.",
+    )
+    cache_serve_parser.add_argument("--verbose", action="store_true", help="Log every request to stderr.")
+
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Run a long-lived JSON service exposing the checker commands.",
+    )
+    serve_parser.add_argument("--host", default=DEFAULT_HOST, help="Bind address (default: %(default)s).")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Bind port (default: %(default)s).")
+    serve_parser.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent request workers (default: %(default)s)."
+    )
+    serve_parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help="Requests allowed to wait for a worker before new ones get HTTP 503 (default: %(default)s).",
+    )
+    serve_lyrics_group = serve_parser.add_mutually_exclusive_group()
+    serve_lyrics_group.add_argument(
+        "--known-lyrics-file",
+        type=Path,
+        help="Known lyric segments (one per line) preloaded for quote-check requests.",
+    )
+    serve_lyrics_group.add_argument(
+        "--known-lyrics-index",
+        type=Path,
+        metavar="PREFIX",
+        help="Known-lyrics index built by build-lyrics-index, queried from disk.",
+    )
+    _add_authority_argument(serve_parser)
+    serve_parser.add_argument(
+        "--cache-db",
+        type=Path,
+        help="HTTP cache database path (default: .cache/safe_lyrics_checker.sqlite).",
+    )
+    serve_parser.add_argument("--verbose", action="store_true", help="Log every request to stderr.")
 
     return parser
 
@@ -87,6 +422,18 @@ def _load_lines(path: Path | None) -> list[str]:
     return path.read_text(encoding="utf-8").splitlines()
 
 
+def _load_known_lyrics(args: argparse.Namespace) -> LyricsIndex:
+    if args.known_lyrics_index is None:
+        return KnownLyricsIndex(_load_lines(args.known_lyrics_file))
+
+    from .lyrics_index import open_lyrics_index
+
+    try:
+        return open_lyrics_index(args.known_lyrics_index)
+    except (OSError, ValueError) as exc:
+        raise SystemExit(str(exc)) from exc
+
+
 def _resolve_excerpt(args: argparse.Namespace) -> str:
     if args.excerpt:
         return args.excerpt
@@ -95,6 +442,14 @@ def _resolve_excerpt(args: argparse.Namespace) -> str:
     raise SystemExit("You must provide either excerpt text or --file.")
 
 
+def _status_exit_code(status: RightsStatus) -> int:
+    if status is RightsStatus.SAFE:
+        return 0
+    if status is RightsStatus.NOT_SAFE:
+        return 1
+    return 2
+
+
 def _run_rights_check(args: argparse.Namespace) -> int:
     result = check_lyrics_rights(
         jurisdiction=args.jurisdiction,
@@ -102,17 +457,22 @@ def _run_rights_check(args: argparse.Namespace) -> int:
         lyricist_death_year=args.lyricist_death_year,
         renewal_status=args.renewal_status,
     )
+    if args.output_format != "text":
+        from .serialization import rights_record, write_record
+
+        write_record(sys.stdout, rights_record(result, args.jurisdiction))
+        return _status_exit_code(result.status)
+
     print(result.status.value)
     print(result.explanation)
+    return _status_exit_code(result.status)
 
-    if result.status is RightsStatus.SAFE:
-        return 0
-    if result.status is RightsStatus.NOT_SAFE:
-        return 1
-    return 2
 
+def _parse_sources(sources_raw: str | None) -> list[str]:
+    from .search_sources.registry import SOURCES
 
-def _parse_sources(sources_raw: str) -> list[str]:
+    if sources_raw is None:
+        return list(SOURCES)
     selected = [s.strip() for s in sources_raw.split(",") if s.strip()]
     invalid = [s for s in selected if s not in SOURCES]
     if invalid:
@@ -120,46 +480,150 @@ def _parse_sources(sources_raw: str) -> list[str]:
     return selected
 
 
+def _print_candidate(idx: int, candidate: Candidate, rights: RightsResult) -> None:
+    print(f"[{idx}] {candidate.title}")
+    print(f"  Source: {candidate.source}")
+    print(f"  Work URL: {candidate.work_url}")
+    print(f"  Lyricist/Composer: {candidate.lyricist or candidate.composer or 'unknown'}")
+    print(f"  Publication year: {candidate.publication_year if candidate.publication_year is not None else 'unknown'}")
+    print(f"  Lyricist death year: {candidate.lyricist_death_year if candidate.lyricist_death_year is not None else 'unknown'}")
+    print(f"  Renewal status: {candidate.renewal_status}")
+    print(f"  Rights status: {rights.status.value}")
+    print(f"  Explanation: {rights.explanation}")
+    print("  Evidence URLs:")
+    for url in candidate.evidence_urls:
+        print(f"    - {url}")
+    sys.stdout.flush()
+
+
+def _open_cache_backend(spec: str):
+    from .cache_backends import open_backend
+
+    try:
+        return open_backend(spec)
+    except (ValueError, RuntimeError) as exc:
+        raise SystemExit(str(exc)) from exc
+
+
+def _build_cache(args: argparse.Namespace, **kwargs):
+    from .http_cache import HttpCache
+
+    if args.cache_backend:
+        kwargs["backend"] = _open_cache_backend(args.cache_backend)
+    if args.stale_while_revalidate is not None:
+        kwargs["stale_while_revalidate"] = args.stale_while_revalidate
+    if args.stale_if_error is not None:
+        kwargs["stale_if_error"] = args.stale_if_error
+    if args.hedge:
+        kwargs["hedge"] = True
+    if args.no_negative_cache:
+        kwargs["negative_ttls"] = {}
+    if args.record or args.replay:
+        from .http_archive import HttpArchive
+
+        if args.record:
+            kwargs["recorder"] = HttpArchive(args.record)
+        if args.replay:
+            if not args.replay.exists():
+                raise SystemExit(f"Replay archive not found: {args.replay}")
+            kwargs["replay"] = HttpArchive(args.replay, replay_latency=args.replay_latency)
+    cache = HttpCache(**kwargs)
+    args.open_caches.append(cache)
+    return cache
+
+
 def _run_search(args: argparse.Namespace) -> int:
+    from .search_engine import evaluate_candidate, iter_candidates
+
     selected_sources = _parse_sources(args.sources)
-    candidates = search_candidates(
+    store = None
+    if args.work_store is not None:
+        from .work_store import WorkStore
+
+        store = WorkStore(args.work_store)
+    deadline = None
+    if args.deadline is not None:
+        from .deadline import Deadline
+
+        deadline = Deadline(args.deadline)
+    candidates = iter_candidates(
         args.query,
         sources=selected_sources,
         max_results=args.max_results,
+        cache=_build_cache(args),
         strict=args.strict,
+        jurisdiction=args.jurisdiction if args.first else None,
+        store=store,
+        deadline=deadline,
+        authority=_open_authority(args),
     )
 
-    if not candidates:
-        print("No candidates found from selected sources.")
-        return 2
-
-    for idx, candidate in enumerate(candidates, start=1):
+    if args.output_format != "text":
+        from .serialization import candidate_record, dumps, search_status_record, write_record
+
+        if args.output_format == "json":
+            # Stream the document's candidate array instead of building it in memory.
+            sys.stdout.write(f'{{"query":{dumps(args.query)},"jurisdiction":{dumps(args.jurisdiction)},"candidates":[')
+
+    # Results are printed as each candidate finishes enrichment. With --first,
+    # a candidate that a merged later hit made definitive comes through again
+    # and is reprinted under its original number with its final verdict. In
+    # jsonl that repeat is a candidate_update record; a json document holds
+    # only each candidate's final record, so --first buffers them.
+    numbers: dict[int, int] = {}
+    final_records: dict[int, dict] = {}
+    written = 0
+    rights = None
+    for candidate in candidates:
+        repeated = id(candidate) in numbers
+        number = numbers.setdefault(id(candidate), len(numbers) + 1)
         rights = evaluate_candidate(candidate, args.jurisdiction)
-        print(f"[{idx}] {candidate.title}")
-        print(f"  Source: {candidate.source}")
-        print(f"  Work URL: {candidate.work_url}")
-        print(f"  Lyricist/Composer: {candidate.lyricist or candidate.composer or 'unknown'}")
-        print(f"  Publication year: {candidate.publication_year if candidate.publication_year is not None else 'unknown'}")
-        print(f"  Lyricist death year: {candidate.lyricist_death_year if candidate.lyricist_death_year is not None else 'unknown'}")
-        print(f"  Renewal status: {candidate.renewal_status}")
-        print(f"  Rights status: {rights.status.value}")
-        print(f"  Explanation: {rights.explanation}")
-        print("  Evidence URLs:")
-        for url in candidate.evidence_urls:
-            print(f"    - {url}")
-
+        if args.output_format == "jsonl":
+            write_record(sys.stdout, candidate_record(candidate, rights, update=repeated))
+            sys.stdout.flush()
+        elif args.output_format == "json" and args.first:
+            final_records[number] = candidate_record(candidate, rights)
+        elif args.output_format == "json":
+            written += 1
+            sys.stdout.write(("," if written > 1 else "") + dumps(candidate_record(candidate, rights)))
+        else:
+            _print_candidate(number, candidate, rights)
+    if final_records:
+        sys.stdout.write(",".join(dumps(record) for record in final_records.values()))
+    found = len(numbers)
+
+    partial = deadline is not None and deadline.partial
+    if args.output_format == "json":
+        sys.stdout.write(f'],"partial":{dumps(partial)}}}\n')
+    elif args.output_format == "jsonl" and partial:
+        write_record(sys.stdout, search_status_record(args.query, partial=True))
+    elif partial:
+        print(f"WARN: deadline of {args.deadline:g}s reached — results are partial.", file=sys.stderr)
+
+    if not found:
+        if args.output_format == "text":
+            print("No candidates found from selected sources.")
+        return 2
+    if args.first:
+        # --first reports the verdict it stopped on, like rights-check.
+        return _status_exit_code(rights.status)
     return 0
 
 
 def _run_quote_check(args: argparse.Namespace) -> int:
     excerpt = _resolve_excerpt(args)
-    known_lyrics = _load_lines(args.known_lyrics_file)
     result = check_quote_safety(
         excerpt,
-        known_lyrics=known_lyrics,
+        known_lyrics=_load_known_lyrics(args),
         max_words=args.max_words,
         max_lines=args.max_lines,
     )
+    if args.output_format != "text":
+        from .serialization import check_result_record, write_record
+
+        write_record(sys.stdout, check_result_record(result))
+        return 0 if result.is_safe else 1
+
     status = "SAFE" if result.is_safe else "UNSAFE"
     print(f"Result: {status}")
     for note in result.notes:
@@ -172,7 +636,17 @@ def _display_unknown(value: str | int | None) -> str:
 
 
 def _run_evaluate_url(args: argparse.Namespace) -> int:
-    rights, evaluation = evaluate_url(args.url, args.jurisdiction)
+    from .url_sources import evaluate_url
+
+    rights, evaluation = evaluate_url(
+        args.url, args.jurisdiction, cache=_build_cache(args), authority=_open_authority(args)
+    )
+
+    if args.output_format != "text":
+        from .serialization import url_evaluation_record, write_record
+
+        write_record(sys.stdout, url_evaluation_record(args.url, rights, evaluation))
+        return _status_exit_code(rights.status)
 
     if evaluation.warning:
         print(f"WARN: {evaluation.warning}")
@@ -185,18 +659,222 @@ def _run_evaluate_url(args: argparse.Namespace) -> int:
     print(f"Lyricist death year: {_display_unknown(evaluation.metadata.lyricist_death_year)}")
     print(f"Publication year: {_display_unknown(evaluation.metadata.publication_year)}")
     print(f"US renewal status: {evaluation.metadata.renewal_status.upper() if evaluation.metadata.renewal_status != 'unknown' else 'UNKNOWN'}")
+    return _status_exit_code(rights.status)
+
+
+def _run_evaluate_urls(args: argparse.Namespace) -> int:
+    from .batch import evaluate_urls
+
+    if not args.urls_file.exists():
+        raise SystemExit(f"URL list not found: {args.urls_file}")
+    # Unset options keep evaluate_urls' defaults (batch.DEFAULT_FETCH_WORKERS).
+    options = {"fetch_workers": args.fetch_workers} if args.fetch_workers is not None else {}
+    results = evaluate_urls(
+        _load_entries(args.urls_file),
+        args.jurisdiction,
+        cache=_build_cache(args),
+        workers=args.workers,
+        authority=_open_authority(args),
+        **options,
+    )
 
-    if rights.status is RightsStatus.SAFE:
+    if args.output_format != "text":
+        from .serialization import dumps, url_evaluation_record, write_record
+
+        if args.output_format == "json":
+            sys.stdout.write(f'{{"jurisdiction":{dumps(args.jurisdiction)},"results":[')
+        for idx, (url, rights, evaluation) in enumerate(results):
+            record = url_evaluation_record(url, rights, evaluation)
+            if args.output_format == "jsonl":
+                write_record(sys.stdout, record)
+            else:
+                sys.stdout.write(("," if idx else "") + dumps(record))
+        if args.output_format == "json":
+            sys.stdout.write("]}\n")
         return 0
-    if rights.status is RightsStatus.NOT_SAFE:
-        return 1
-    return 2
+
+    for url, rights, evaluation in results:
+        warning = f"  WARN: {evaluation.warning}" if evaluation.warning else ""
+        print(f"{rights.status.value:<9} {url}{warning}")
+    return 0
+
+
+def _run_import_catalog(args: argparse.Namespace) -> int:
+    from .search_sources.local_catalog import default_catalog_db, import_catalog
+
+    if not args.path.exists():
+        raise SystemExit(f"Catalog dump not found: {args.path}")
+    db_path = args.catalog_db or default_catalog_db()
+    count = import_catalog(args.path, args.catalog_format, db_path)
+    print(f"Imported {count} catalog records into {db_path}")
+    return 0
+
+
+def _open_authority(args: argparse.Namespace):
+    if args.authority_db is None:
+        return None
+    from .authority import AuthorityIndex
+
+    if not args.authority_db.exists():
+        raise SystemExit(f"Authority index not found: {args.authority_db}")
+    return AuthorityIndex(args.authority_db)
+
+
+def _run_import_authority(args: argparse.Namespace) -> int:
+    from .authority import DEFAULT_AUTHORITY_DB, import_authority
+
+    if not args.path.exists():
+        raise SystemExit(f"Authority dump not found: {args.path}")
+    db_path = args.authority_db or DEFAULT_AUTHORITY_DB
+    count = import_authority(args.path, args.authority_format, db_path)
+    print(f"Imported {count} authority records into {db_path}")
+    return 0
+
+
+def _run_build_lyrics_index(args: argparse.Namespace) -> int:
+    from .lyrics_index import bloom_path, build_bloom_index, compile_corpus, compiled_path, lines_db_path
+
+    if not args.corpus.exists():
+        raise SystemExit(f"Corpus not found: {args.corpus}")
+    if args.index_format == "compiled":
+        count = compile_corpus(args.corpus, args.output)
+        print(f"Compiled {count} known lyric lines into {compiled_path(args.output)}")
+        return 0
+    try:
+        count = build_bloom_index(args.corpus, args.output, args.false_positive_rate)
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+    print(f"Indexed {count} known lyric lines into {bloom_path(args.output)} and {lines_db_path(args.output)}")
+    return 0
+
+
+def _load_entries(path: Path | None) -> list[str]:
+    lines = (line.strip() for line in _load_lines(path))
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def _run_cache_warm(args: argparse.Namespace) -> int:
+    from .cache_warm import warm_cache
+
+    if args.queries is None and args.urls is None:
+        raise SystemExit("cache warm needs --queries and/or --urls.")
+    cache_kwargs = {"db_path": args.cache_db} if args.cache_db else {}
+
+    report = warm_cache(
+        _build_cache(args, **cache_kwargs),
+        queries=_load_entries(args.queries),
+        urls=_load_entries(args.urls),
+        sources=_parse_sources(args.sources),
+        max_results=args.max_results,
+        rate=args.rate,
+        refresh_window=args.refresh_within,
+    )
+    print(
+        f"Warmed {report.queries} queries and {report.urls} URLs: "
+        f"{report.fetched} fetched, {report.failed} failed."
+    )
+    return 1 if report.failed else 0
+
+
+def _run_cache_serve(args: argparse.Namespace) -> int:
+    from .cache_backends import CACHE_TOKEN_ENV, SqliteBackend, serve_cache
+    from .http_cache import DEFAULT_CACHE_DB
+
+    if args.cache_backend:
+        backend = _open_cache_backend(args.cache_backend)
+    else:
+        backend = SqliteBackend(args.cache_db or DEFAULT_CACHE_DB)
+    serve_cache(
+        backend,
+        args.host,
+        args.port,
+        token=os.environ.get(CACHE_TOKEN_ENV),
+        verbose=args.verbose,
+    )
+    return 0
+
+
+def _run_bench(args: argparse.Namespace) -> int:
+    import json
+
+    from .bench import (
+        BENCHMARKS,
+        BenchContext,
+        builtin_pages,
+        compare_results,
+        format_table,
+        load_fixture_pages,
+        results_document,
+        run_benchmarks,
+    )
+
+    names = [n.strip() for n in args.only.split(",") if n.strip()] if args.only else None
+    invalid = [n for n in names or [] if n not in BENCHMARKS]
+    if invalid:
+        raise SystemExit(f"Unknown benchmark(s): {', '.join(invalid)}")
+
+    ctx = BenchContext(
+        pages=load_fixture_pages(args.fixtures) if args.fixtures else builtin_pages(),
+        corpus_sizes=tuple(int(size) for size in args.corpus_sizes.split(",") if size.strip()),
+        repeat=args.repeat,
+    )
+    results = run_benchmarks(ctx, names)
+    print(format_table(results))
+
+    document = results_document(results)
+    if args.output:
+        args.output.write_text(json.dumps(document, indent=2), encoding="utf-8")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare_results(document, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+def _run_serve(args: argparse.Namespace) -> int:
+    import requests
+
+    from .service import CheckerService, serve
+
+    cache_kwargs = {"db_path": args.cache_db} if args.cache_db else {}
+    service = CheckerService(
+        cache=_build_cache(args, session=requests.Session(), **cache_kwargs),
+        known_lyrics=_load_known_lyrics(args),
+        authority=_open_authority(args),
+    )
+    serve(
+        service=service,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        queue_size=args.queue_size,
+        verbose=args.verbose,
+    )
+    return 0
 
 
 def main(argv: Sequence[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
+    args.open_caches = []
+
+    try:
+        return _dispatch(args)
+    finally:
+        # Background revalidations (--stale-while-revalidate) finish before
+        # the command exits, so the refreshed entries are stored.
+        for cache in args.open_caches:
+            cache.close()
+        if args.profile:
+            from .metrics import METRICS
+
+            print(METRICS.format_profile(), file=sys.stderr)
+
 
+def _dispatch(args: argparse.Namespace) -> int:
     if args.command == "rights-check":
         return _run_rights_check(args)
     if args.command == "search":
@@ -205,6 +883,22 @@ def main(argv: Sequence[str] | None = None) -> int:
         return _run_quote_check(args)
     if args.command == "evaluate-url":
         return _run_evaluate_url(args)
+    if args.command == "evaluate-urls":
+        return _run_evaluate_urls(args)
+    if args.command == "import-catalog":
+        return _run_import_catalog(args)
+    if args.command == "import-authority":
+        return _run_import_authority(args)
+    if args.command == "build-lyrics-index":
+        return _run_build_lyrics_index(args)
+    if args.command == "bench":
+        return _run_bench(args)
+    if args.command == "cache" and args.cache_command == "warm":
+        return _run_cache_warm(args)
+    if args.command == "cache" and args.cache_command == "serve":
+        return _run_cache_serve(args)
+    if args.command == "serve":
+        return _run_serve(args)
 
     raise SystemExit("Unknown command")
 
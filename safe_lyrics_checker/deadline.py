@@ -0,0 +1,91 @@
+"""End-to-end latency budgets for search and evaluation calls.
+
+A :class:`Deadline` is installed with :func:`deadline_scope`; every network
+fetch made by :class:`~safe_lyrics_checker.http_cache.HttpCache` inside the
+scope uses at most the remaining budget as its timeout and fails at once with
+:class:`DeadlineExceeded` when nothing is left. :meth:`Deadline.share` splits
+the remaining budget across outstanding work so one slow catalog cannot use
+it all. Cut-short work marks the deadline ``partial``.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+import requests
+
+_DURATION_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(ms|s|m)?\s*$")
+_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, None: 1.0}
+
+
+class DeadlineExceeded(requests.Timeout):
+    """A fetch was skipped or cut short because the call's deadline ran out."""
+
+
+class Deadline:
+    def __init__(self, seconds: float, *, _parent: Optional[Deadline] = None) -> None:
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        if _parent is not None:
+            self.expires_at = min(self.expires_at, _parent.expires_at)
+        self._root: Deadline = _parent._root if _parent is not None else self
+        self._partial = False
+
+    @property
+    def partial(self) -> bool:
+        """Whether any work was skipped or cut short by this deadline."""
+
+        return self._root._partial
+
+    def mark_partial(self) -> None:
+        self._root._partial = True
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def share(self, parts: int) -> Deadline:
+        """A sub-deadline for one of ``parts`` remaining pieces of work."""
+
+        return Deadline(self.remaining() / max(parts, 1), _parent=self)
+
+    def timeout(self, default: float) -> float:
+        """The timeout for the next fetch; raises when the budget is spent."""
+
+        remaining = self.remaining()
+        if remaining <= 0:
+            self.mark_partial()
+            raise DeadlineExceeded(f"deadline of {self._root.seconds:g}s reached")
+        return min(default, remaining)
+
+
+_CURRENT: ContextVar[Optional[Deadline]] = ContextVar("safe_lyrics_checker_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _CURRENT.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    token = _CURRENT.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _CURRENT.reset(token)
+
+
+def parse_duration(text: str) -> float:
+    """Parse ``5s``, ``500ms``, ``1.5m`` or plain seconds."""
+
+    match = _DURATION_RE.match(text)
+    if match is None:
+        raise ValueError(f"Invalid duration {text!r}; use e.g. 5s, 500ms or 1m")
+    return float(match.group(1)) * _UNIT_SECONDS[match.group(2)]
@@ -0,0 +1,20 @@
+"""Defaults shared by the command line and the modules it drives.
+
+This module imports nothing, so ``cli.build_parser`` can use these values as
+argparse defaults without loading the network stack. The modules that own
+each setting re-export it under the same name.
+"""
+
+# ``serve`` (safe_lyrics_checker.service)
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 8
+DEFAULT_QUEUE_SIZE = 64
+
+# ``cache serve`` (safe_lyrics_checker.cache_backends)
+DEFAULT_SERVER_HOST = "127.0.0.1"
+DEFAULT_SERVER_PORT = 8766
+
+# ``cache warm`` (safe_lyrics_checker.cache_warm)
+DEFAULT_RATE = 1.0
+DEFAULT_REFRESH_WINDOW_SECONDS = 24 * 60 * 60
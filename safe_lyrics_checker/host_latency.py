@@ -0,0 +1,85 @@
+"""Per-host latency tracking for adaptive fetch timeouts and hedging.
+
+:class:`HostLatency` keeps a rolling window of time-to-headers samples per
+host. Once a host has enough samples, its connect timeout becomes a multiple
+of its p95 and its read timeout a multiple of its p99, clamped to sane
+bounds: a stalled fast host is given up on in a second or two, while a slow
+but healthy one is allowed past the fixed default. The p95 is also the point
+after which :class:`~safe_lyrics_checker.http_cache.HttpCache` sends a hedged
+duplicate request when hedging is on.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Optional
+
+DEFAULT_WINDOW = 200
+DEFAULT_MIN_SAMPLES = 8
+CONNECT_TIMEOUT_BOUNDS = (1.0, 15.0)
+READ_TIMEOUT_BOUNDS = (2.0, 60.0)
+CONNECT_MULTIPLIER = 2.0
+READ_MULTIPLIER = 3.0
+HEDGE_FLOOR_SECONDS = 0.05
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _clamp(value: float, bounds: tuple[float, float]) -> float:
+    return min(max(value, bounds[0]), bounds[1])
+
+
+class HostLatency:
+    def __init__(
+        self,
+        default_timeout: float,
+        *,
+        window: int = DEFAULT_WINDOW,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+    ) -> None:
+        # Used for both timeouts until a host has ``min_samples`` samples.
+        self.default_timeout = float(default_timeout)
+        self.window = window
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque[float]] = {}
+
+    def observe(self, host: str, seconds: float) -> None:
+        """Record one time-to-headers sample (or the timeout a fetch hit)."""
+
+        with self._lock:
+            samples = self._samples.get(host)
+            if samples is None:
+                samples = self._samples[host] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def _ordered(self, host: str) -> Optional[list[float]]:
+        with self._lock:
+            samples = self._samples.get(host)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            return sorted(samples)
+
+    def percentile(self, host: str, fraction: float) -> Optional[float]:
+        ordered = self._ordered(host)
+        return None if ordered is None else _percentile(ordered, fraction)
+
+    def timeouts(self, host: str) -> tuple[float, float]:
+        """``(connect, read)`` timeouts for the next fetch from ``host``."""
+
+        ordered = self._ordered(host)
+        if ordered is None:
+            return self.default_timeout, self.default_timeout
+        return (
+            _clamp(CONNECT_MULTIPLIER * _percentile(ordered, 0.95), CONNECT_TIMEOUT_BOUNDS),
+            _clamp(READ_MULTIPLIER * _percentile(ordered, 0.99), READ_TIMEOUT_BOUNDS),
+        )
+
+    def hedge_after(self, host: str) -> Optional[float]:
+        """Seconds to wait before hedging a fetch from ``host``, once known."""
+
+        p95 = self.percentile(host, 0.95)
+        return None if p95 is None else max(p95, HEDGE_FLOOR_SECONDS)
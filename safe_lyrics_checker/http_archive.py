@@ -0,0 +1,117 @@
+"""Record/replay archive of HTTP responses for deterministic offline runs.
+
+An archive is a single SQLite file holding each response's status, headers,
+zlib-compressed body and original latency. :class:`HttpCache` writes to it in
+record mode and serves from it, with no network, in replay mode.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+import zlib
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class ReplayMissError(requests.ConnectionError):
+    """Raised in replay mode for a URL that was never recorded."""
+
+
+class HttpArchive:
+    def __init__(self, path: Path, *, replay_latency: bool = False):
+        self.path = path
+        self.replay_latency = replay_latency
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path)
+
+    def _init_db(self) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS http_archive (
+                    url TEXT PRIMARY KEY,
+                    status INTEGER NOT NULL,
+                    reason TEXT NOT NULL,
+                    headers TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    elapsed REAL NOT NULL,
+                    recorded_at INTEGER NOT NULL
+                )
+                """
+            )
+
+    def record(
+        self,
+        url: str,
+        *,
+        status: int,
+        body: str,
+        elapsed: float,
+        headers: Optional[dict[str, str]] = None,
+        reason: str = "",
+        replace: bool = True,
+    ) -> None:
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        with self._connect() as conn:
+            conn.execute(
+                f"{verb} INTO http_archive (url, status, reason, headers, body, elapsed, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    status,
+                    reason,
+                    json.dumps(headers or {}),
+                    zlib.compress(body.encode("utf-8")),
+                    elapsed,
+                    int(time.time()),
+                ),
+            )
+
+    def record_response(self, url: str, response: Any, elapsed: float, body: Optional[str] = None) -> None:
+        # Pass ``body`` to archive a response without reading its content.
+        self.record(
+            url,
+            status=int(getattr(response, "status_code", None) or 200),
+            reason=str(getattr(response, "reason", "") or ""),
+            headers=dict(getattr(response, "headers", None) or {}),
+            body=response.text if body is None else body,
+            elapsed=elapsed,
+        )
+
+    def replay(self, url: str) -> requests.Response:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT status, reason, headers, body, elapsed FROM http_archive WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            raise ReplayMissError(f"No recorded response for {url}")
+
+        status, reason, headers, body, elapsed = row
+        if self.replay_latency and elapsed > 0:
+            time.sleep(elapsed)
+
+        response = requests.Response()
+        response.url = url
+        response.status_code = int(status)
+        response.reason = reason
+        response.headers = CaseInsensitiveDict(json.loads(headers))
+        response._content = zlib.decompress(body)
+        # The body is already in memory; there is no connection to release.
+        response._content_consumed = True
+        response.encoding = "utf-8"
+        response.elapsed = timedelta(seconds=elapsed)
+        return response
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return int(conn.execute("SELECT COUNT(*) FROM http_archive").fetchone()[0])
@@ -1,63 +1,441 @@
 from __future__ import annotations
 
-import sqlite3
+import json
+import re
+import sys
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+from urllib.parse import urlparse
 
 import requests
 
+from .cache_backends import BackendError, CacheBackend, Entry, SqliteBackend
+from .deadline import DeadlineExceeded, current_deadline
+from .host_latency import HostLatency
+from .metrics import METRICS
+
+if TYPE_CHECKING:
+    from .http_archive import HttpArchive
+
 
 DEFAULT_CACHE_DB = Path('.cache/safe_lyrics_checker.sqlite')
 DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
 DEFAULT_TIMEOUT_SECONDS = 15
 DEFAULT_USER_AGENT = "safe-lyrics-checker/0.1 (+metadata-only)"
+REVALIDATE_WORKERS = 2
+HEDGE_WORKERS = 8
+
+# Only HTML bodies are scanned, and only this far: interstitials put their
+# markers in the title and first script tags. Matching the title rather than
+# the whole text keeps pages and records that merely mention a captcha usable.
+CHALLENGE_SCAN_BYTES = 4096
+CHALLENGE_TITLE_MARKERS = ("attention required", "just a moment", "access denied", "captcha")
+CHALLENGE_SCRIPT_MARKERS = ("cf-chl-", "_cf_chl_opt", "/cdn-cgi/challenge-platform/")
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+CHALLENGE_STATUSES = frozenset({403, 429, 503})
+# Anything else (PDF, images, audio, archives) is never parsed or cached.
+TEXT_CONTENT_TYPES = ("text/", "application/json", "application/xml", "application/xhtml+xml")
+TEXT_CONTENT_SUFFIXES = ("+json", "+xml")
+
+# Failed fetches are remembered per failure class for this long, so dead
+# evidence URLs are not re-requested (and re-timed-out) on every call.
+DEFAULT_NEGATIVE_TTLS = {
+    "not-found": 24 * 60 * 60,
+    "content-type": 24 * 60 * 60,
+    "forbidden": 60 * 60,
+    "challenge": 60 * 60,
+    "http-error": 60 * 60,
+    "rate-limited": 5 * 60,
+    "server-error": 5 * 60,
+    "timeout": 5 * 60,
+    "network": 60,
+}
+NEGATIVE_KEY_PREFIX = "failure:"
+
+
+class UnusableResponseError(requests.RequestException):
+    """An upstream answer that must not be parsed or cached.
+
+    ``kind`` is ``"challenge"`` for anti-bot interstitials and
+    ``"content-type"`` for non-text bodies; ``detail`` says what gave it away.
+    """
+
+    def __init__(self, kind: str, detail: str, response: object = None) -> None:
+        super().__init__(f"{kind}: {detail}", response=response)
+        self.kind = kind
+        self.detail = detail
+
+
+@dataclass(frozen=True)
+class CachedPage:
+    """A body from :meth:`HttpCache.fetch`.
+
+    ``stale`` is set when the body is older than the TTL; ``error`` carries the
+    fetch failure that a stale body was served in place of, if any.
+    """
+
+    body: str
+    stale: bool = False
+    error: Optional[str] = None
 
 
 class HttpCache:
-    def __init__(self, db_path: Path = DEFAULT_CACHE_DB, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+    def __init__(
+        self,
+        db_path: Path = DEFAULT_CACHE_DB,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        session: Optional[requests.Session] = None,
+        recorder: Optional[HttpArchive] = None,
+        replay: Optional[HttpArchive] = None,
+        stale_while_revalidate: int = 0,
+        stale_if_error: int = 0,
+        backend: Optional[CacheBackend] = None,
+        negative_ttls: Optional[dict[str, int]] = None,
+        adaptive_timeouts: bool = True,
+        hedge: bool = False,
+    ):
         self.db_path = db_path
         self.ttl_seconds = ttl_seconds
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._init_db()
-
-    def _connect(self) -> sqlite3.Connection:
-        return sqlite3.connect(self.db_path)
-
-    def _init_db(self) -> None:
-        with self._connect() as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS http_cache (
-                    url TEXT PRIMARY KEY,
-                    fetched_at INTEGER NOT NULL,
-                    body TEXT NOT NULL
-                )
-                """
-            )
+        # Seconds past the TTL during which a stale body is returned at once
+        # while it is refreshed in the background, or returned in place of a
+        # failed fetch.
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        self.session = session
+        # ``recorder`` archives every response seen; ``replay`` answers every
+        # fetch from an archive instead of the network, and bypasses the cache
+        # backend so repeat replays stay deterministic and never pollute it.
+        self.recorder = recorder
+        self.replay = replay
+        self._revalidate_lock = threading.Lock()
+        self._revalidating: set[str] = set()
+        self._revalidator: Optional[ThreadPoolExecutor] = None
+        # Failure class -> seconds a failed fetch is answered from the cache;
+        # classes missing from the map (or ``{}``) are never negatively cached.
+        self.negative_ttls = DEFAULT_NEGATIVE_TTLS if negative_ttls is None else negative_ttls
+        # Per-host latency history sizing connect/read timeouts; with
+        # ``hedge``, a fetch slower than its host's p95 gets a duplicate
+        # request and the first response wins.
+        self.latency = HostLatency(DEFAULT_TIMEOUT_SECONDS) if adaptive_timeouts else None
+        self.hedge = hedge and adaptive_timeouts
+        self._hedger: Optional[ThreadPoolExecutor] = None
+        # ``db_path`` is only used when no other storage backend is given.
+        self.backend = backend if backend is not None else SqliteBackend(db_path)
 
     def get_text(self, url: str) -> str:
+        page = self.fetch(url)
+        if page.error is not None:
+            print(f"WARN: {url} fetch failed ({page.error}) — serving stale cached copy.", file=sys.stderr)
+        return page.body
+
+    def fetch(self, url: str) -> CachedPage:
         now = int(time.time())
-        with self._connect() as conn:
-            row = conn.execute(
-                "SELECT fetched_at, body FROM http_cache WHERE url = ?", (url,)
-            ).fetchone()
-            if row is not None:
-                fetched_at, body = row
-                if now - int(fetched_at) <= self.ttl_seconds:
-                    return str(body)
-
-        response = requests.get(
-            url,
-            timeout=DEFAULT_TIMEOUT_SECONDS,
-            headers={"User-Agent": DEFAULT_USER_AGENT},
-        )
-        response.raise_for_status()
-        body = response.text
+        host = (urlparse(url).hostname or "").lower()
+        if self.replay is not None:
+            return CachedPage(self._fetch(url, host))
+        with METRICS.span("cache_lookup", host=host):
+            entry = self._backend_get(url, host)
+        age = None
+        if entry is not None:
+            age = now - entry[0]
+            cached = entry[1]
+            if age <= self.ttl_seconds + self.stale_while_revalidate:
+                stale = age > self.ttl_seconds
+                if stale:
+                    METRICS.incr("cache_stale_hits", host=host)
+                    self._revalidate_in_background(url)
+                else:
+                    METRICS.incr("cache_hits", host=host)
+                if self.recorder is not None:
+                    # Keep recorded sessions complete even when the cache was warm.
+                    self.recorder.record(url, status=200, body=cached, elapsed=0.0, replace=False)
+                return CachedPage(cached, stale=stale)
+        METRICS.incr("cache_misses", host=host)
+
+        try:
+            failure = self._cached_failure(url, now)
+            if failure is not None:
+                METRICS.incr("cache_negative_hits", host=host)
+                raise failure
+            try:
+                return CachedPage(self._fetch_and_store(url, host))
+            except requests.RequestException as exc:
+                self._store_failure(url, exc)
+                raise
+        except requests.RequestException as exc:
+            if age is None or age > self.ttl_seconds + self.stale_if_error:
+                raise
+            METRICS.incr("cache_stale_errors", host=host)
+            return CachedPage(cached, stale=True, error=_describe_error(exc))
+
+    def close(self) -> None:
+        """Wait for background revalidations and hedged requests to finish."""
+
+        with self._revalidate_lock:
+            executors = (self._revalidator, self._hedger)
+            self._revalidator = self._hedger = None
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+    def _fetch_and_store(self, url: str, host: str) -> str:
+        fetched_at = int(time.time())
+        body = self._fetch(url, host)
+        with METRICS.span("cache_store", host=host):
+            self._backend_set(url, fetched_at, body, host)
+        return body
+
+    def _backend_get(self, key: str, host: str) -> Optional[Entry]:
+        # An unavailable store is a miss: the origin can still answer.
+        try:
+            return self.backend.get(key)
+        except BackendError:
+            METRICS.incr("cache_backend_errors", host=host, op="get")
+            return None
 
-        with self._connect() as conn:
-            conn.execute(
-                "INSERT OR REPLACE INTO http_cache (url, fetched_at, body) VALUES (?, ?, ?)",
-                (url, now, body),
-            )
+    def _backend_set(self, key: str, fetched_at: int, body: str, host: str) -> None:
+        try:
+            self.backend.set(key, fetched_at, body)
+        except BackendError:
+            METRICS.incr("cache_backend_errors", host=host, op="set")
 
+    def _fetch(self, url: str, host: str) -> str:
+        with METRICS.span("fetch", host=host):
+            response, elapsed = self._send(url)
+            try:
+                # Headers arrive before the body; reject blocked or binary
+                # responses without downloading them.
+                try:
+                    _check_headers(response)
+                except UnusableResponseError:
+                    if self.recorder is not None:
+                        self.recorder.record_response(url, response, elapsed, body="")
+                    raise
+                if self.recorder is not None:
+                    self.recorder.record_response(url, response, elapsed)
+                response.raise_for_status()
+                body = response.text
+            finally:
+                close = getattr(response, "close", None)
+                if close is not None:
+                    close()
+        _record_transfer(host, response, body)
+        headers = getattr(response, "headers", None) or {}
+        if is_challenge_page(body, headers.get("content-type", "")):
+            METRICS.incr("challenge_pages", host=host)
+            raise UnusableResponseError("challenge", "anti-bot marker in page", response=response)
         return body
+
+    def _cached_failure(self, url: str, now: int) -> Optional[requests.RequestException]:
+        if not self.negative_ttls:
+            return None
+        entry = self._backend_get(NEGATIVE_KEY_PREFIX + url, (urlparse(url).hostname or "").lower())
+        if entry is None:
+            return None
+        record = json.loads(entry[1])
+        if now - entry[0] > self.negative_ttls.get(record["kind"], -1):
+            return None
+        return _failure_error(url, record)
+
+    def _store_failure(self, url: str, exc: requests.RequestException) -> None:
+        record = _failure_record(exc)
+        if record is not None and record["kind"] in self.negative_ttls:
+            host = (urlparse(url).hostname or "").lower()
+            self._backend_set(NEGATIVE_KEY_PREFIX + url, int(time.time()), json.dumps(record), host)
+
+    def _revalidate_in_background(self, url: str) -> None:
+        with self._revalidate_lock:
+            if url in self._revalidating:
+                return
+            self._revalidating.add(url)
+            if self._revalidator is None:
+                self._revalidator = ThreadPoolExecutor(
+                    max_workers=REVALIDATE_WORKERS, thread_name_prefix="cache-revalidate"
+                )
+            self._revalidator.submit(self._revalidate, url)
+
+    def _revalidate(self, url: str) -> None:
+        host = (urlparse(url).hostname or "").lower()
+        try:
+            self._fetch_and_store(url, host)
+        except Exception:
+            # The stale copy stays in place; the next read past the TTL retries.
+            METRICS.incr("cache_revalidate_errors", host=host)
+        finally:
+            with self._revalidate_lock:
+                self._revalidating.discard(url)
+
+    def _send(self, url: str) -> tuple[requests.Response, float]:
+        if self.replay is not None:
+            return self.replay.replay(url), 0.0
+
+        host = (urlparse(url).hostname or "").lower()
+        connect, read = (
+            self.latency.timeouts(host)
+            if self.latency is not None
+            else (DEFAULT_TIMEOUT_SECONDS, DEFAULT_TIMEOUT_SECONDS)
+        )
+        deadline = current_deadline()
+        budget = read if deadline is None else deadline.timeout(read)
+        started = time.perf_counter()
+        try:
+            response = self._get(url, host, (min(connect, budget), budget))
+        except requests.Timeout as exc:
+            if budget < read:
+                # Only the shortened budget ran out; the host itself may be fine.
+                deadline.mark_partial()
+                raise DeadlineExceeded(f"{url} did not answer within the remaining {budget:.2f}s") from exc
+            if self.latency is not None:
+                # Count the timeout as a (censored) sample so a slow host's
+                # timeouts grow instead of failing it forever.
+                self.latency.observe(host, read)
+            raise
+        elapsed = time.perf_counter() - started
+        if self.latency is not None:
+            self.latency.observe(host, elapsed)
+        return response, elapsed
+
+    def _get(self, url: str, host: str, timeout: tuple[float, float]) -> requests.Response:
+        # A shared session keeps upstream connections pooled between calls.
+        get = self.session.get if self.session is not None else requests.get
+        headers = {"User-Agent": DEFAULT_USER_AGENT}
+        hedge_after = self.latency.hedge_after(host) if self.hedge and self.latency is not None else None
+        if hedge_after is None:
+            return get(url, timeout=timeout, headers=headers, stream=True)
+
+        pool = self._hedge_pool()
+        attempts = [pool.submit(get, url, timeout=timeout, headers=headers, stream=True)]
+        done, _ = wait(attempts, timeout=hedge_after)
+        if not done:
+            METRICS.incr("hedged_requests", host=host)
+            # Hedges are the only requests sent again; there is no retry loop.
+            METRICS.incr("retries", host=host, reason="hedge")
+            attempts.append(pool.submit(get, url, timeout=timeout, headers=headers, stream=True))
+        pending = set(attempts)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for attempt in done:
+                try:
+                    response = attempt.result()
+                except requests.RequestException as exc:
+                    error = exc
+                    continue
+                for other in pending:
+                    other.add_done_callback(_close_response)
+                if attempt is not attempts[0]:
+                    METRICS.incr("hedge_wins", host=host)
+                return response
+        assert error is not None
+        raise error
+
+    def _hedge_pool(self) -> ThreadPoolExecutor:
+        with self._revalidate_lock:
+            if self._hedger is None:
+                self._hedger = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="cache-hedge")
+            return self._hedger
+
+
+def _close_response(attempt: Future) -> None:
+    if not attempt.cancelled() and attempt.exception() is None:
+        close = getattr(attempt.result(), "close", None)
+        if close is not None:
+            close()
+
+
+def is_challenge_page(body: str, content_type: str = "") -> bool:
+    """Whether ``body`` is an anti-bot interstitial rather than the page asked for.
+
+    Without a ``content_type`` the body counts as HTML when it starts with markup.
+    """
+
+    head = body[:CHALLENGE_SCAN_BYTES]
+    content_type = content_type.split(";")[0].strip().lower()
+    if content_type:
+        if content_type not in HTML_CONTENT_TYPES:
+            return False
+    elif not head.lstrip().startswith("<"):
+        return False
+    head = head.lower()
+    title = _TITLE_RE.search(head)
+    if title is not None and any(marker in title.group(1) for marker in CHALLENGE_TITLE_MARKERS):
+        return True
+    return any(marker in head for marker in CHALLENGE_SCRIPT_MARKERS)
+
+
+def _check_headers(response: requests.Response) -> None:
+    headers = getattr(response, "headers", None) or {}
+    status = getattr(response, "status_code", None)
+    if headers.get("cf-mitigated", "").lower() == "challenge":
+        raise UnusableResponseError("challenge", "cf-mitigated: challenge", response=response)
+    if status in CHALLENGE_STATUSES and "cloudflare" in headers.get("server", "").lower():
+        raise UnusableResponseError("challenge", f"HTTP {status} from Cloudflare", response=response)
+    content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type and not (
+        content_type.startswith(TEXT_CONTENT_TYPES) or content_type.endswith(TEXT_CONTENT_SUFFIXES)
+    ):
+        raise UnusableResponseError("content-type", content_type, response=response)
+
+
+def _record_transfer(host: str, response: requests.Response, body: str) -> None:
+    content = getattr(response, "content", None)
+    METRICS.incr("bytes_fetched", len(content) if isinstance(content, bytes) else len(body), host=host)
+    # ``elapsed`` covers connect, TLS and server think time up to the headers.
+    elapsed = getattr(response, "elapsed", None)
+    if elapsed is not None:
+        METRICS.observe("upstream_wait", elapsed.total_seconds(), host=host)
+
+
+def _describe_error(exc: requests.RequestException) -> str:
+    response = getattr(exc, "response", None)
+    if response is not None and getattr(response, "status_code", None):
+        return f"{response.status_code} {response.reason or ''}".strip()
+    return str(exc).strip() or exc.__class__.__name__
+
+
+def _failure_record(exc: requests.RequestException) -> Optional[dict]:
+    if isinstance(exc, DeadlineExceeded):
+        return None
+    if isinstance(exc, UnusableResponseError):
+        return {"kind": exc.kind, "detail": exc.detail}
+    if isinstance(exc, requests.Timeout):
+        return {"kind": "timeout", "detail": str(exc)}
+    if isinstance(exc, requests.ConnectionError):
+        return {"kind": "network", "detail": str(exc)}
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    if not isinstance(exc, requests.HTTPError) or not status:
+        return None
+    if status in (404, 410):
+        kind = "not-found"
+    elif status == 403:
+        kind = "forbidden"
+    elif status == 429:
+        kind = "rate-limited"
+    elif status >= 500:
+        kind = "server-error"
+    else:
+        kind = "http-error"
+    return {"kind": kind, "status": status, "reason": getattr(exc.response, "reason", None) or ""}
+
+
+def _failure_error(url: str, record: dict) -> requests.RequestException:
+    """Rebuild the exception a cached failure stands for, so callers keep
+    their usual handling (and warnings) for it."""
+
+    kind = record["kind"]
+    if kind in ("challenge", "content-type"):
+        return UnusableResponseError(kind, record["detail"])
+    if kind == "timeout":
+        return requests.Timeout(record["detail"])
+    if kind == "network":
+        return requests.ConnectionError(record["detail"])
+    response = requests.Response()
+    response.url = url
+    response.status_code = record["status"]
+    response.reason = record["reason"]
+    return requests.HTTPError(f"{response.status_code} {response.reason} (cached failure)", response=response)
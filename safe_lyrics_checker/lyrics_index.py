@@ -0,0 +1,266 @@
+"""On-disk known-lyrics indexes for corpora too large to hold in memory.
+
+Both formats are compiled offline from a corpus (one lyric segment per line)
+and queried in place, so loading is instant and every process on a host
+shares one page-cache copy instead of building its own normalized set.
+
+``build_bloom_index`` writes two files next to ``PREFIX``:
+
+- ``PREFIX.bloom``: a Bloom filter over normalized lines, memory-mapped at
+  query time so only the pages a lookup touches are resident.
+- ``PREFIX.sqlite``: the exact normalized lines.
+
+:class:`BloomLyricsIndex` answers most misses from the filter alone and
+confirms possible matches against SQLite, so there are no false negatives
+and false positives never reach the caller.
+
+``compile_corpus`` writes ``PREFIX.lyrics``: a header, the sorted 64-bit
+hashes of every normalized line, an offsets table, and the UTF-8 lines in
+hash order. :class:`CompiledLyricsIndex` binary-searches the hashes through a
+``memoryview`` over ``mmap`` and compares the matching line bytes, without
+copying the file or touching SQLite.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import math
+import mmap
+import sqlite3
+import struct
+import sys
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .quote_safety import LyricsIndex, normalize_line
+
+DEFAULT_FALSE_POSITIVE_RATE = 0.01
+
+_BLOOM_MAGIC = b"SLCBLOOM"
+_BLOOM_VERSION = 1
+# magic, version, hash count, bit count, line count
+_BLOOM_HEADER = struct.Struct("<8sIIQQ")
+_COMPILED_MAGIC = b"SLCLYRIX"
+_COMPILED_VERSION = 1
+# magic, version, line count
+_COMPILED_HEADER = struct.Struct("<8sIxxxxQ")
+_INSERT_BATCH = 10_000
+
+
+def bloom_path(prefix: Path) -> Path:
+    return prefix.with_name(prefix.name + ".bloom")
+
+
+def lines_db_path(prefix: Path) -> Path:
+    return prefix.with_name(prefix.name + ".sqlite")
+
+
+def compiled_path(prefix: Path) -> Path:
+    return prefix.with_name(prefix.name + ".lyrics")
+
+
+def bloom_parameters(count: int, false_positive_rate: float) -> tuple[int, int]:
+    """Return ``(bits, hashes)`` for ``count`` entries at ``false_positive_rate``."""
+
+    if not 0 < false_positive_rate < 1:
+        raise ValueError("false_positive_rate must be between 0 and 1")
+    count = max(count, 1)
+    bits = max(64, math.ceil(-count * math.log(false_positive_rate) / math.log(2) ** 2))
+    bits = (bits + 7) // 8 * 8
+    return bits, max(1, round(bits / count * math.log(2)))
+
+
+def _positions(normalized: str, bits: int, hashes: int) -> Iterator[int]:
+    digest = hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest()
+    first = int.from_bytes(digest[:8], "little")
+    second = int.from_bytes(digest[8:], "little") | 1
+    for i in range(hashes):
+        yield (first + i * second) % bits
+
+
+def _read_corpus(path: Path) -> Iterator[str]:
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield normalize_line(line)
+
+
+def _line_hash(encoded: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(encoded, digest_size=8).digest(), "little")
+
+
+def _store_lines(db_path: Path, lines: Iterable[str]) -> int:
+    db_path.unlink(missing_ok=True)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE known_lyrics (line TEXT PRIMARY KEY) WITHOUT ROWID")
+        batch: list[tuple[str]] = []
+        for line in lines:
+            batch.append((line,))
+            if len(batch) >= _INSERT_BATCH:
+                conn.executemany("INSERT OR IGNORE INTO known_lyrics (line) VALUES (?)", batch)
+                batch.clear()
+        conn.executemany("INSERT OR IGNORE INTO known_lyrics (line) VALUES (?)", batch)
+        return int(conn.execute("SELECT COUNT(*) FROM known_lyrics").fetchone()[0])
+
+
+def build_bloom_index(
+    corpus_path: Path,
+    prefix: Path,
+    false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+) -> int:
+    """Compile ``corpus_path`` into ``PREFIX.bloom`` and ``PREFIX.sqlite``.
+
+    Returns the number of distinct normalized lines. The filter is sized from
+    that count after the exact store is written, so the corpus is read once.
+    """
+
+    prefix.parent.mkdir(parents=True, exist_ok=True)
+    db_path = lines_db_path(prefix)
+    count = _store_lines(db_path, _read_corpus(corpus_path))
+    bits, hashes = bloom_parameters(count, false_positive_rate)
+
+    array = bytearray(bits // 8)
+    with sqlite3.connect(db_path) as conn:
+        for (line,) in conn.execute("SELECT line FROM known_lyrics"):
+            for position in _positions(line, bits, hashes):
+                array[position >> 3] |= 1 << (position & 7)
+
+    with bloom_path(prefix).open("wb") as handle:
+        handle.write(_BLOOM_HEADER.pack(_BLOOM_MAGIC, _BLOOM_VERSION, hashes, bits, count))
+        handle.write(array)
+    return count
+
+
+class BloomLyricsIndex(LyricsIndex):
+    """Known-lyrics lookup over a prebuilt ``build_bloom_index`` output."""
+
+    def __init__(self, prefix: Path) -> None:
+        self.prefix = prefix
+        self.db_path = lines_db_path(prefix)
+        path = bloom_path(prefix)
+        if not path.exists() or not self.db_path.exists():
+            raise FileNotFoundError(f"No known-lyrics index at {prefix} (expected {path} and {self.db_path})")
+        with path.open("rb") as handle:
+            self._bloom = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.hashes, self.bits, self.count = _BLOOM_HEADER.unpack_from(self._bloom)
+        if magic != _BLOOM_MAGIC or version != _BLOOM_VERSION:
+            raise ValueError(f"{path} is not a known-lyrics Bloom filter")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, timeout=30)
+
+    def might_contain(self, normalized: str) -> bool:
+        bloom, offset = self._bloom, _BLOOM_HEADER.size
+        return all(
+            bloom[offset + (position >> 3)] & (1 << (position & 7))
+            for position in _positions(normalized, self.bits, self.hashes)
+        )
+
+    def __contains__(self, normalized: object) -> bool:
+        if not isinstance(normalized, str) or not self.might_contain(normalized):
+            return False
+        with self._connect() as conn:
+            row = conn.execute("SELECT 1 FROM known_lyrics WHERE line = ?", (normalized,)).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        self._bloom.close()
+
+
+def compile_corpus(corpus_path: Path, prefix: Path) -> int:
+    """Compile ``corpus_path`` into ``PREFIX.lyrics`` and return its line count.
+
+    Lines are deduplicated and sorted by hash in a scratch SQLite file, so the
+    build never holds the corpus in memory either.
+    """
+
+    prefix.parent.mkdir(parents=True, exist_ok=True)
+    scratch = prefix.with_name(prefix.name + ".lyrics-build.sqlite")
+    scratch.unlink(missing_ok=True)
+    try:
+        with sqlite3.connect(scratch) as conn:
+            conn.execute("CREATE TABLE lines (line BLOB PRIMARY KEY, hash INTEGER NOT NULL) WITHOUT ROWID")
+            batch: list[tuple[bytes, int]] = []
+            for line in _read_corpus(corpus_path):
+                encoded = line.encode("utf-8")
+                # SQLite integers are signed; shift so ORDER BY matches unsigned order.
+                batch.append((encoded, _line_hash(encoded) - (1 << 63)))
+                if len(batch) >= _INSERT_BATCH:
+                    conn.executemany("INSERT OR IGNORE INTO lines (line, hash) VALUES (?, ?)", batch)
+                    batch.clear()
+            conn.executemany("INSERT OR IGNORE INTO lines (line, hash) VALUES (?, ?)", batch)
+            conn.execute("CREATE INDEX lines_hash ON lines (hash, line)")
+            count = int(conn.execute("SELECT COUNT(*) FROM lines").fetchone()[0])
+
+            ordered = "SELECT hash, line FROM lines ORDER BY hash, line"
+            with compiled_path(prefix).open("wb") as handle:
+                handle.write(_COMPILED_HEADER.pack(_COMPILED_MAGIC, _COMPILED_VERSION, count))
+                for hash_value, _ in conn.execute(ordered):
+                    handle.write(struct.pack("<Q", hash_value + (1 << 63)))
+                offset = 0
+                handle.write(struct.pack("<Q", offset))
+                for _, line in conn.execute(ordered):
+                    offset += len(line)
+                    handle.write(struct.pack("<Q", offset))
+                for _, line in conn.execute(ordered):
+                    handle.write(line)
+    finally:
+        scratch.unlink(missing_ok=True)
+    return count
+
+
+class CompiledLyricsIndex(LyricsIndex):
+    """Zero-copy known-lyrics lookup over a ``compile_corpus`` output."""
+
+    def __init__(self, prefix: Path) -> None:
+        self.prefix = prefix
+        path = compiled_path(prefix)
+        if not path.exists():
+            raise FileNotFoundError(f"No compiled known-lyrics corpus at {path}")
+        with path.open("rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count = _COMPILED_HEADER.unpack_from(self._map)
+        if magic != _COMPILED_MAGIC or version != _COMPILED_VERSION:
+            raise ValueError(f"{path} is not a compiled known-lyrics corpus")
+        if sys.byteorder != "little":
+            raise ValueError("Compiled known-lyrics corpora are only supported on little-endian hosts")
+        view = memoryview(self._map)
+        start = _COMPILED_HEADER.size
+        offsets_start = start + 8 * self.count
+        blob_start = offsets_start + 8 * (self.count + 1)
+        self._hashes = view[start:offsets_start].cast("Q")
+        self._offsets = view[offsets_start:blob_start].cast("Q")
+        self._blob = view[blob_start:]
+
+    def __contains__(self, normalized: object) -> bool:
+        if not isinstance(normalized, str):
+            return False
+        encoded = normalized.encode("utf-8")
+        target = _line_hash(encoded)
+        hashes, offsets = self._hashes, self._offsets
+        index = bisect.bisect_left(hashes, target)
+        while index < self.count and hashes[index] == target:
+            if self._blob[offsets[index] : offsets[index + 1]] == encoded:
+                return True
+            index += 1
+        return False
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        for view in (self._hashes, self._offsets, self._blob):
+            view.release()
+        self._map.close()
+
+
+def open_lyrics_index(prefix: Path) -> LyricsIndex:
+    """Open whichever index was built at ``prefix``, preferring the compiled corpus."""
+
+    if compiled_path(prefix).exists():
+        return CompiledLyricsIndex(prefix)
+    return BloomLyricsIndex(prefix)
@@ -0,0 +1,170 @@
+"""Lightweight per-stage timing and counters.
+
+Stages are timed with :meth:`Metrics.span` and tagged (for example with the
+source or host). Counters track cache hits/misses, bytes transferred and
+similar events. The process-wide :data:`METRICS` instance backs the CLI
+``--profile`` breakdown and the service's Prometheus ``/metrics`` endpoint.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+METRIC_PREFIX = "safe_lyrics_checker"
+# Distinct values kept per tag key; later ones are recorded as "other", so
+# arbitrary hosts in a long-running service cannot grow the series unbounded.
+MAX_TAG_VALUES = 256
+OTHER_TAG_VALUE = "other"
+
+Tags = tuple[tuple[str, str], ...]
+
+
+def _tags(tags: dict[str, Any]) -> Tags:
+    return tuple(sorted((key, str(value)) for key, value in tags.items() if value is not None))
+
+
+def _cap(tags: Tags, seen: dict[str, set[str]]) -> Tags:
+    capped = []
+    for key, value in tags:
+        values = seen.setdefault(key, set())
+        if value not in values:
+            if len(values) >= MAX_TAG_VALUES:
+                value = OTHER_TAG_VALUE
+            else:
+                values.add(value)
+        capped.append((key, value))
+    return tuple(capped)
+
+
+def _format_tags(tags: Tags) -> str:
+    return ",".join(f"{key}={value}" for key, value in tags)
+
+
+def _prometheus_labels(tags: Tags) -> str:
+    if not tags:
+        return ""
+    escaped = (
+        f'{key}="' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for key, value in tags
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # (stage, tags) -> [count, total_seconds, max_seconds]
+        self._spans: dict[tuple[str, Tags], list[float]] = {}
+        self._counters: dict[tuple[str, Tags], float] = {}
+        self._tag_values: dict[str, set[str]] = {}
+
+    @contextmanager
+    def span(self, stage: str, **tags: Any) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started, **tags)
+
+    def observe(self, stage: str, seconds: float, **tags: Any) -> None:
+        with self._lock:
+            key = (stage, _cap(_tags(tags), self._tag_values))
+            entry = self._spans.get(key)
+            if entry is None:
+                self._spans[key] = [1, seconds, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+                entry[2] = max(entry[2], seconds)
+
+    def incr(self, name: str, value: float = 1, **tags: Any) -> None:
+        with self._lock:
+            key = (name, _cap(_tags(tags), self._tag_values))
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+            self._tag_values.clear()
+
+    def snapshot(self, *, reset: bool = False) -> dict[str, Any]:
+        """Return all spans and counters; with ``reset``, also clear them atomically."""
+
+        with self._lock:
+            spans = [
+                {"stage": stage, "tags": dict(tags), "count": int(count), "total_seconds": total, "max_seconds": peak}
+                for (stage, tags), (count, total, peak) in self._spans.items()
+            ]
+            counters = [
+                {"name": name, "tags": dict(tags), "value": value}
+                for (name, tags), value in self._counters.items()
+            ]
+            if reset:
+                self._spans.clear()
+                self._counters.clear()
+                self._tag_values.clear()
+        return {"spans": spans, "counters": counters}
+
+    def merge(self, snapshot: dict[str, Any]) -> None:
+        """Add a :meth:`snapshot` taken elsewhere, e.g. in a worker process."""
+
+        with self._lock:
+            for span in snapshot["spans"]:
+                key = (span["stage"], _cap(_tags(span["tags"]), self._tag_values))
+                entry = self._spans.get(key)
+                if entry is None:
+                    self._spans[key] = [span["count"], span["total_seconds"], span["max_seconds"]]
+                else:
+                    entry[0] += span["count"]
+                    entry[1] += span["total_seconds"]
+                    entry[2] = max(entry[2], span["max_seconds"])
+            for counter in snapshot["counters"]:
+                key = (counter["name"], _cap(_tags(counter["tags"]), self._tag_values))
+                self._counters[key] = self._counters.get(key, 0) + counter["value"]
+
+    def format_profile(self) -> str:
+        with self._lock:
+            spans = sorted(self._spans.items(), key=lambda item: item[1][1], reverse=True)
+            counters = sorted(self._counters.items())
+        lines = ["Profile (stage breakdown):"]
+        if not spans:
+            lines.append("  (no timed stages)")
+        for (stage, tags), (count, total, peak) in spans:
+            label = f"{stage}[{_format_tags(tags)}]" if tags else stage
+            lines.append(
+                f"  {label:<48} {int(count):>6}x {total * 1000:>10.1f}ms total {peak * 1000:>9.1f}ms max"
+            )
+        if counters:
+            lines.append("Counters:")
+            for (name, tags), value in counters:
+                label = f"{name}[{_format_tags(tags)}]" if tags else name
+                lines.append(f"  {label:<48} {value:>12g}")
+        return "\n".join(lines)
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            spans = sorted(self._spans.items())
+            counters = sorted(self._counters.items())
+
+        metric = f"{METRIC_PREFIX}_stage_seconds"
+        lines = [f"# HELP {metric} Time spent per pipeline stage.", f"# TYPE {metric} summary"]
+        for (stage, tags), (count, total, _) in spans:
+            labels = _prometheus_labels((("stage", stage),) + tags)
+            lines.append(f"{metric}_count{labels} {int(count)}")
+            lines.append(f"{metric}_sum{labels} {total:.6f}")
+
+        declared: set[str] = set()
+        for (name, tags), value in counters:
+            metric = f"{METRIC_PREFIX}_{name}_total"
+            if metric not in declared:
+                declared.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_prometheus_labels(tags)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
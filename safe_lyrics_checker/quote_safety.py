@@ -6,6 +6,7 @@ make legal determinations about copyright status.
 
 from __future__ import annotations
 
+from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Iterable, List
 import re
@@ -31,13 +32,44 @@ def _line_count(text: str) -> int:
     return len([line for line in text.splitlines() if line.strip()])
 
 
-def _normalize(text: str) -> str:
+def normalize_line(text: str) -> str:
+    """Normalize a lyric line or excerpt the way :class:`LyricsIndex` keys are stored."""
+
     return " ".join(text.split()).strip().lower()
 
 
+class LyricsIndex(ABC):
+    """Membership test over known-lyric lines normalized with :func:`normalize_line`.
+
+    ``check_quote_safety`` queries any subclass directly instead of building
+    an in-memory set from it.
+    """
+
+    @abstractmethod
+    def __contains__(self, normalized: object) -> bool:
+        ...
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+
+class KnownLyricsIndex(LyricsIndex):
+    """Normalized known-lyrics lookup that can be built once and reused."""
+
+    def __init__(self, lines: Iterable[str] = ()) -> None:
+        self._lines = frozenset(normalize_line(item) for item in lines if item.strip())
+
+    def __contains__(self, normalized: object) -> bool:
+        return normalized in self._lines
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+
 def check_quote_safety(
     excerpt: str,
-    known_lyrics: Iterable[str] | None = None,
+    known_lyrics: Iterable[str] | LyricsIndex | None = None,
     *,
     max_words: int = 90,
     max_lines: int = 4,
@@ -45,7 +77,8 @@ def check_quote_safety(
     """Apply conservative quote-size and match heuristics.
 
     This function is optional/secondary and intentionally does not determine
-    legal public-domain status.
+    legal public-domain status. Pass a prebuilt :class:`LyricsIndex` (such as
+    :class:`KnownLyricsIndex`) to avoid re-normalizing the corpus on every call.
     """
 
     rule_hits: list[str] = []
@@ -53,7 +86,7 @@ def check_quote_safety(
 
     words = _word_count(excerpt)
     lines = _line_count(excerpt)
-    normalized = _normalize(excerpt)
+    normalized = normalize_line(excerpt)
 
     if words > max_words:
         rule_hits.append("max_words")
@@ -68,8 +101,8 @@ def check_quote_safety(
         )
 
     if normalized and known_lyrics:
-        normalized_corpus = {_normalize(item) for item in known_lyrics if item.strip()}
-        if normalized in normalized_corpus:
+        index = known_lyrics if isinstance(known_lyrics, LyricsIndex) else KnownLyricsIndex(known_lyrics)
+        if normalized in index:
             rule_hits.append("known_lyric_match")
             notes.append("Excerpt exactly matches an entry in the known-lyrics corpus.")
 
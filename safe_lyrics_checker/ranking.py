@@ -0,0 +1,106 @@
+"""Relevance scoring and duplicate merging for search candidates."""
+
+from __future__ import annotations
+
+import re
+from difflib import SequenceMatcher
+from typing import Iterable, Optional
+
+from .search_sources.models import Candidate
+from .search_sources.registry import SOURCES
+
+DEFAULT_AUTHORITY = 0.5
+TITLE_WEIGHT = 0.6
+COMPLETENESS_WEIGHT = 0.25
+AUTHORITY_WEIGHT = 0.15
+
+_NON_WORD_RE = re.compile(r"[^\w\s]+")
+
+
+def normalize_title(text: str) -> str:
+    return " ".join(_NON_WORD_RE.sub(" ", text.lower()).split())
+
+
+def normalize_person(name: Optional[str]) -> str:
+    if not name:
+        return ""
+    # "Newton, John" and "John Newton" should collapse to the same key.
+    tokens = normalize_title(name).split()
+    return " ".join(sorted(token for token in tokens if not token.isdigit()))
+
+
+def work_key(candidate: Candidate) -> tuple[str, str]:
+    return normalize_title(candidate.title), normalize_person(candidate.lyricist or candidate.composer)
+
+
+def title_similarity(query: str, title: str) -> float:
+    query_norm = normalize_title(query)
+    title_norm = normalize_title(title)
+    if not query_norm or not title_norm:
+        return 0.0
+    query_tokens = set(query_norm.split())
+    coverage = len(query_tokens & set(title_norm.split())) / len(query_tokens)
+    return 0.7 * coverage + 0.3 * SequenceMatcher(None, query_norm, title_norm).ratio()
+
+
+def completeness(candidate: Candidate) -> float:
+    present = [
+        bool(candidate.lyricist or candidate.composer),
+        candidate.publication_year is not None,
+        candidate.lyricist_death_year is not None,
+        candidate.renewal_status != "unknown",
+    ]
+    return sum(present) / len(present)
+
+
+def source_authority(source: str) -> float:
+    if source not in SOURCES:
+        return DEFAULT_AUTHORITY
+    return getattr(SOURCES[source], "authority", DEFAULT_AUTHORITY)
+
+
+def score_candidate(candidate: Candidate, query: str) -> float:
+    return (
+        TITLE_WEIGHT * title_similarity(query, candidate.title)
+        + COMPLETENESS_WEIGHT * completeness(candidate)
+        + AUTHORITY_WEIGHT * source_authority(candidate.source)
+    )
+
+
+def rank_candidates(candidates: Iterable[Candidate], query: str) -> list[Candidate]:
+    return sorted(candidates, key=lambda candidate: score_candidate(candidate, query), reverse=True)
+
+
+def merge_into(target: Candidate, duplicate: Candidate) -> Candidate:
+    """Fill gaps in ``target`` from ``duplicate`` and keep both evidence trails."""
+
+    for url in duplicate.evidence_urls:
+        if url not in target.evidence_urls:
+            target.evidence_urls.append(url)
+    for name in ("lyricist", "composer", "publication_year", "lyricist_death_year"):
+        if getattr(target, name) is None and getattr(duplicate, name) is not None:
+            setattr(target, name, getattr(duplicate, name))
+    if target.renewal_status == "unknown":
+        target.renewal_status = duplicate.renewal_status
+    return target
+
+
+def find_duplicate(candidate: Candidate, accepted: Iterable[Candidate]) -> Optional[Candidate]:
+    """Return an accepted candidate describing the same work, if any.
+
+    Titles must match. When both sides name a lyricist or composer, so must
+    they; otherwise (HTML scrapes rarely extract one) the publication years
+    must be known and equal. Two bare "Ave Maria" hits may be different works.
+    """
+
+    title, person = work_key(candidate)
+    for other in accepted:
+        other_title, other_person = work_key(other)
+        if other_title != title:
+            continue
+        if person and other_person:
+            if person == other_person:
+                return other
+        elif candidate.publication_year is not None and candidate.publication_year == other.publication_year:
+            return other
+    return None
@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import FrozenInstanceError
 from enum import Enum
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Optional
+
+
+JURISDICTIONS = ("US", "UK", "AU")
 
 
 class RightsStatus(str, Enum):
@@ -13,10 +17,86 @@ class RightsStatus(str, Enum):
     UNKNOWN = "UNKNOWN"
 
 
-@dataclass(frozen=True)
+# Explanation codes and their templates. Results store only the code and its
+# parameters; the text is rendered when ``explanation`` is read.
+EXPLANATIONS = {
+    "CUSTOM": "{0}",
+    "UNSUPPORTED_JURISDICTION": "Unsupported jurisdiction; supported values are US, UK, AU.",
+    "LIFE70_DEATH_REQUIRED": "{0}: lyricist death year is required for life+70 analysis.",
+    "LIFE70_SAFE": "{0}: lyricist died in {1} (<=1954), treated as public domain.",
+    "LIFE70_NOT_SAFE": "{0}: lyricist died in {1} (>1954), conservatively treated as not public domain.",
+    "US_YEAR_REQUIRED": "US: publication year is required.",
+    "US_PRE_1930": "US: first publication year {0} is <= 1929.",
+    "US_1930_1963_NOT_RENEWED": "US: publication in 1930-1963 with renewal status not_renewed.",
+    "US_1930_1963_UNRESOLVED": "US: publication in 1930-1963 with renewal status {0}.",
+    "US_INVALID_RENEWAL": "US: invalid renewal status; use unknown|renewed|not_renewed.",
+    "US_1964_1977": "US: publication in 1964-1977 is conservatively not safe (95-year term).",
+    "US_POST_1977_DEATH_REQUIRED": "US: lyricist death year is required for post-1977 life+70 analysis.",
+    "US_POST_1977_SAFE": "US: publication >=1978 and lyricist death year <=1954 (conservative life+70 safe).",
+    "US_POST_1977_NOT_SAFE": "US: publication >=1978 and lyricist death year >1954 (conservative not safe).",
+}
+
+
 class RightsResult:
+    """Immutable rights verdict: a status plus an explanation code.
+
+    ``RightsResult(status, explanation)`` still works and is stored under the
+    ``CUSTOM`` code; the engine itself builds results with :meth:`coded`,
+    which shares one instance per distinct outcome. Results compare and hash
+    on status, code and parameters, so a ``CUSTOM`` result never equals a
+    coded one even when their texts match.
+    """
+
+    __slots__ = ("status", "code", "params")
+
     status: RightsStatus
-    explanation: str
+    code: str
+    params: tuple[Any, ...]
+
+    def __init__(
+        self,
+        status: RightsStatus,
+        explanation: Optional[str] = None,
+        *,
+        code: str = "CUSTOM",
+        params: tuple[Any, ...] = (),
+    ) -> None:
+        if explanation is not None:
+            code, params = "CUSTOM", (explanation,)
+        object.__setattr__(self, "status", RightsStatus(status))
+        object.__setattr__(self, "code", code)
+        object.__setattr__(self, "params", params)
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def coded(status: RightsStatus, code: str, *params: Any) -> "RightsResult":
+        return RightsResult(status, code=code, params=params)
+
+    @property
+    def explanation(self) -> str:
+        return EXPLANATIONS[self.code].format(*self.params)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RightsResult):
+            return NotImplemented
+        # The rendered text is never built just to compare or hash.
+        return (self.status, self.code, self.params) == (other.status, other.code, other.params)
+
+    def __hash__(self) -> int:
+        return hash((self.status, self.code, self.params))
+
+    def __repr__(self) -> str:
+        return f"RightsResult(status={self.status!r}, explanation={self.explanation!r})"
+
+    def __reduce__(self):
+        return (_restore_result, (self.status, self.code, self.params))
+
+
+def _restore_result(status: RightsStatus, code: str, params: tuple[Any, ...]) -> RightsResult:
+    return RightsResult(status, code=code, params=params)
 
 
 def check_lyrics_rights(
@@ -32,92 +112,39 @@ def check_lyrics_rights(
     """
 
     code = jurisdiction.upper()
-    if code not in {"US", "UK", "AU"}:
-        return RightsResult(
-            status=RightsStatus.UNKNOWN,
-            explanation="Unsupported jurisdiction; supported values are US, UK, AU.",
-        )
+    if code not in JURISDICTIONS:
+        return RightsResult.coded(RightsStatus.UNKNOWN, "UNSUPPORTED_JURISDICTION")
 
     if code in {"UK", "AU"}:
         if lyricist_death_year is None:
-            return RightsResult(
-                status=RightsStatus.UNKNOWN,
-                explanation=(
-                    f"{code}: lyricist death year is required for life+70 analysis."
-                ),
-            )
+            return RightsResult.coded(RightsStatus.UNKNOWN, "LIFE70_DEATH_REQUIRED", code)
         if lyricist_death_year <= 1954:
-            return RightsResult(
-                status=RightsStatus.SAFE,
-                explanation=(
-                    f"{code}: lyricist died in {lyricist_death_year} (<=1954), treated as public domain."
-                ),
-            )
-        return RightsResult(
-            status=RightsStatus.NOT_SAFE,
-            explanation=(
-                f"{code}: lyricist died in {lyricist_death_year} (>1954), conservatively treated as not public domain."
-            ),
-        )
+            return RightsResult.coded(RightsStatus.SAFE, "LIFE70_SAFE", code, lyricist_death_year)
+        return RightsResult.coded(RightsStatus.NOT_SAFE, "LIFE70_NOT_SAFE", code, lyricist_death_year)
 
     # US rules
     if publication_year is None:
-        return RightsResult(
-            status=RightsStatus.UNKNOWN,
-            explanation="US: publication year is required.",
-        )
+        return RightsResult.coded(RightsStatus.UNKNOWN, "US_YEAR_REQUIRED")
 
     if publication_year <= 1929:
-        return RightsResult(
-            status=RightsStatus.SAFE,
-            explanation=f"US: first publication year {publication_year} is <= 1929.",
-        )
+        return RightsResult.coded(RightsStatus.SAFE, "US_PRE_1930", publication_year)
 
     if 1930 <= publication_year <= 1963:
         normalized_renewal = renewal_status.lower()
         if normalized_renewal == "not_renewed":
-            return RightsResult(
-                status=RightsStatus.SAFE,
-                explanation=(
-                    "US: publication in 1930-1963 with renewal status not_renewed."
-                ),
-            )
+            return RightsResult.coded(RightsStatus.SAFE, "US_1930_1963_NOT_RENEWED")
         if normalized_renewal in {"unknown", "renewed"}:
-            return RightsResult(
-                status=RightsStatus.UNKNOWN,
-                explanation=(
-                    f"US: publication in 1930-1963 with renewal status {normalized_renewal}."
-                ),
-            )
-        return RightsResult(
-            status=RightsStatus.UNKNOWN,
-            explanation="US: invalid renewal status; use unknown|renewed|not_renewed.",
-        )
+            return RightsResult.coded(RightsStatus.UNKNOWN, "US_1930_1963_UNRESOLVED", normalized_renewal)
+        return RightsResult.coded(RightsStatus.UNKNOWN, "US_INVALID_RENEWAL")
 
     if 1964 <= publication_year <= 1977:
-        return RightsResult(
-            status=RightsStatus.NOT_SAFE,
-            explanation="US: publication in 1964-1977 is conservatively not safe (95-year term).",
-        )
+        return RightsResult.coded(RightsStatus.NOT_SAFE, "US_1964_1977")
 
     # publication_year >= 1978
     if lyricist_death_year is None:
-        return RightsResult(
-            status=RightsStatus.UNKNOWN,
-            explanation="US: lyricist death year is required for post-1977 life+70 analysis.",
-        )
+        return RightsResult.coded(RightsStatus.UNKNOWN, "US_POST_1977_DEATH_REQUIRED")
 
     if lyricist_death_year <= 1954:
-        return RightsResult(
-            status=RightsStatus.SAFE,
-            explanation=(
-                "US: publication >=1978 and lyricist death year <=1954 (conservative life+70 safe)."
-            ),
-        )
-
-    return RightsResult(
-        status=RightsStatus.NOT_SAFE,
-        explanation=(
-            "US: publication >=1978 and lyricist death year >1954 (conservative not safe)."
-        ),
-    )
+        return RightsResult.coded(RightsStatus.SAFE, "US_POST_1977_SAFE")
+
+    return RightsResult.coded(RightsStatus.NOT_SAFE, "US_POST_1977_NOT_SAFE")
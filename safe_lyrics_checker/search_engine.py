@@ -1,63 +1,286 @@
 from __future__ import annotations
 
+import asyncio
+import contextvars
 import sys
-from typing import Callable
+from typing import TYPE_CHECKING, Any, Generator, Iterator
 
 import requests
 
+from .authority import AuthorityIndex, fill_candidate
+from .deadline import Deadline, DeadlineExceeded, deadline_scope
 from .http_cache import HttpCache
-from .rights_engine import RightsResult, check_lyrics_rights
+from .metrics import METRICS
+from .ranking import find_duplicate, merge_into, score_candidate
+from .rights_engine import RightsResult, RightsStatus, check_lyrics_rights
 from .search_sources.models import Candidate
-from .search_sources import archive, copyright_office, cpdl, gutenberg, imslp, loc, worldcat
+from .search_sources.registry import SOURCES
 
-SearchFn = Callable[[str, HttpCache | None], list[Candidate]]
-EnrichFn = Callable[[Candidate, HttpCache | None], Candidate]
+if TYPE_CHECKING:
+    from .work_store import WorkStore
 
+DEFINITIVE_STATUSES = (RightsStatus.SAFE, RightsStatus.NOT_SAFE)
 
-SOURCES: dict[str, tuple[SearchFn, EnrichFn]] = {
-    "gutenberg": (gutenberg.search, gutenberg.enrich),
-    "imslp": (imslp.search, imslp.enrich),
-    "cpdl": (cpdl.search, cpdl.enrich),
-    "loc": (loc.search, loc.enrich),
-    "archive": (archive.search, archive.enrich),
-    "worldcat": (worldcat.search, worldcat.enrich),
-    "copyright": (copyright_office.search, copyright_office.enrich),
-}
 
+class PendingCandidate:
+    """A ranked search hit whose work-page enrichment has not run yet.
 
-def search_candidates(
+    ``resolve()`` runs the source's enrichment at most once and returns the
+    enriched :class:`Candidate`. Awaiting the object runs the same step on the
+    default executor, so async callers can resolve several hits concurrently.
+    """
+
+    def __init__(self, source: str, candidate: Candidate, cache: HttpCache) -> None:
+        self.source = source
+        self.candidate = candidate
+        self._cache = cache
+        self._resolved = False
+
+    @property
+    def resolved(self) -> bool:
+        return self._resolved
+
+    def resolve(self) -> Candidate:
+        if not self._resolved:
+            with METRICS.span("enrich", source=self.source):
+                self.candidate = SOURCES[self.source].enrich(self.candidate, self._cache)
+            self._resolved = True
+        return self.candidate
+
+    def __await__(self) -> Generator[Any, None, Candidate]:
+        loop = asyncio.get_running_loop()
+        # Carry the caller's deadline scope into the executor thread.
+        return loop.run_in_executor(None, contextvars.copy_context().run, self.resolve).__await__()
+
+    def __repr__(self) -> str:
+        state = "resolved" if self._resolved else "pending"
+        return f"PendingCandidate({self.source!r}, {self.candidate.work_url!r}, {state})"
+
+
+def _warn_source_failure(source: str, stage: str, exc: Exception) -> None:
+    reason = _format_exception_reason(exc) if isinstance(exc, requests.RequestException) else exc
+    print(f"WARN: {source} {stage} failed ({reason}) — skipping.", file=sys.stderr)
+
+
+class SearchResults(list):
+    """Candidates from :func:`search_candidates`.
+
+    ``partial`` is set when the deadline cut searching or enrichment short, so
+    some sources or work pages were not consulted.
+    """
+
+    partial: bool = False
+
+
+def _gather_candidates(
+    query: str,
+    sources: list[str],
+    cache: HttpCache,
+    strict: bool,
+    deadline: Deadline | None = None,
+) -> list[tuple[str, Candidate]]:
+    gathered: list[tuple[str, Candidate]] = []
+    seen: set[tuple[str, str]] = set()
+    for position, source in enumerate(sources):
+        if deadline is not None and deadline.expired:
+            deadline.mark_partial()
+            break
+        budget = deadline.share(len(sources) - position) if deadline is not None else None
+        try:
+            with METRICS.span("search", source=source), deadline_scope(budget):
+                found = SOURCES[source].search(query, cache)
+        except DeadlineExceeded as exc:
+            _warn_source_failure(source, "search", exc)
+            continue
+        except Exception as exc:
+            if strict:
+                raise
+            _warn_source_failure(source, "search", exc)
+            continue
+        for candidate in found:
+            key = (candidate.source, candidate.work_url)
+            if key in seen:
+                continue
+            seen.add(key)
+            gathered.append((source, candidate))
+    return gathered
+
+
+def find_candidates(
     query: str,
     *,
     sources: list[str],
-    max_results: int,
     cache: HttpCache | None = None,
     strict: bool = False,
-) -> list[Candidate]:
+    deadline: Deadline | None = None,
+) -> list[PendingCandidate]:
+    """Search every source and return ranked, not-yet-enriched candidates.
+
+    With a ``deadline``, each remaining source gets an equal share of the
+    remaining budget.
+    """
+
     cache = cache or HttpCache()
-    results: list[Candidate] = []
-    seen: set[tuple[str, str]] = set()
+    gathered = _gather_candidates(query, sources, cache, strict, deadline)
+    gathered.sort(key=lambda item: score_candidate(item[1], query), reverse=True)
+    return [PendingCandidate(source, candidate, cache) for source, candidate in gathered]
 
-    for source in sources:
-        search_fn, enrich_fn = SOURCES[source]
-        try:
-            for candidate in search_fn(query, cache):
-                key = (candidate.source, candidate.work_url)
-                if key in seen:
+
+def is_definitive(candidate: Candidate, jurisdiction: str) -> bool:
+    return evaluate_candidate(candidate, jurisdiction).status in DEFINITIVE_STATUSES
+
+
+def iter_candidates(
+    query: str,
+    *,
+    sources: list[str],
+    max_results: int,
+    cache: HttpCache | None = None,
+    strict: bool = False,
+    jurisdiction: str | None = None,
+    store: WorkStore | None = None,
+    deadline: Deadline | None = None,
+    authority: AuthorityIndex | None = None,
+) -> Iterator[Candidate]:
+    """Yield enriched candidates one at a time, best-ranked first.
+
+    Search pages from all selected sources are gathered first and ranked by
+    title similarity, metadata completeness and source authority, so a weak
+    first source cannot crowd out later ones. Each candidate is yielded as
+    soon as its enrichment finishes, and enrichment stops once
+    ``max_results`` distinct works were yielded. A later hit for an already
+    yielded work is merged into that candidate instead of being yielded again.
+
+    When ``jurisdiction`` is given, the generator also stops after the first
+    candidate with a definitive SAFE/NOT_SAFE verdict, and candidates whose
+    search metadata is already definitive are not enriched at all. If that
+    verdict comes from merging a later hit into an already yielded candidate,
+    the same (updated) candidate object is yielded once more before stopping. Closing
+    the generator early cancels any remaining enrichment.
+
+    With a :class:`~safe_lyrics_checker.work_store.WorkStore`, a query the
+    store has fully answered before is served from it without searching, and
+    hits for works already in the store skip enrichment.
+
+    With a ``deadline``, searching gets half of the budget and each remaining
+    enrichment an equal share of what is left. Once it runs out, no more
+    fetches start: the remaining ranked hits are yielded with their search
+    metadata only and ``deadline.partial`` is set.
+
+    With an :class:`~safe_lyrics_checker.authority.AuthorityIndex`, missing
+    lyricist death years are filled in offline, both before enrichment (so a
+    hit it makes definitive needs no work-page fetch) and after it.
+    """
+
+    if store is not None:
+        remembered = store.lookup(query, sources)
+        if remembered:
+            METRICS.incr("work_store_hits")
+            yield from _stop_at_verdict(remembered[:max_results], jurisdiction)
+            return
+
+    results: list[Candidate] = []
+    # Only an exhausted ranked list is the full answer: stopping at
+    # max_results or at a verdict must not be replayed to callers asking for more.
+    complete = False
+    search_budget = deadline.share(2) if deadline is not None else None
+    try:
+        for pending in find_candidates(query, sources=sources, cache=cache, strict=strict, deadline=search_budget):
+            if len(results) >= max_results:
+                break
+            if authority is not None:
+                fill_candidate(pending.candidate, authority)
+            known = store.known_work(pending.source, pending.candidate.work_url) if store is not None else None
+            if known is not None:
+                enriched = merge_into(known, pending.candidate)
+            elif jurisdiction is not None and is_definitive(pending.candidate, jurisdiction):
+                enriched = pending.candidate
+            elif deadline is not None and deadline.expired:
+                deadline.mark_partial()
+                enriched = pending.candidate
+            else:
+                budget = deadline.share(max_results - len(results)) if deadline is not None else None
+                try:
+                    with deadline_scope(budget):
+                        enriched = pending.resolve()
+                except DeadlineExceeded:
+                    # Keep the search-page metadata rather than dropping the hit.
+                    enriched = pending.candidate
+                except Exception as exc:
+                    if strict:
+                        raise
+                    _warn_source_failure(pending.source, "enrichment", exc)
                     continue
-                seen.add(key)
-                enriched = enrich_fn(candidate, cache)
+                else:
+                    if authority is not None:
+                        fill_candidate(enriched, authority)
+                    if store is not None:
+                        store.remember_work(enriched)
+
+            duplicate = find_duplicate(enriched, results)
+            if duplicate is None:
                 results.append(enriched)
-                if len(results) >= max_results:
-                    return results
-        except requests.RequestException as exc:
-            if strict:
-                raise
-            print(f"WARN: {source} search failed ({_format_exception_reason(exc)}) — skipping.", file=sys.stderr)
-        except Exception as exc:
-            if strict:
-                raise
-            print(f"WARN: {source} search failed ({exc}) — skipping.", file=sys.stderr)
+                yield enriched
+                if jurisdiction is not None and is_definitive(enriched, jurisdiction):
+                    return
+                continue
+            merge_into(duplicate, enriched)
+            if jurisdiction is not None and is_definitive(duplicate, jurisdiction):
+                # The merge settled an already yielded work: yield it again so
+                # the caller sees the metadata the verdict was reached on.
+                yield duplicate
+                return
+        else:
+            complete = deadline is None or not deadline.partial
+    finally:
+        if store is not None and complete and results:
+            store.remember_query(query, sources, results)
+
+
+def _stop_at_verdict(candidates: list[Candidate], jurisdiction: str | None) -> Iterator[Candidate]:
+    for candidate in candidates:
+        yield candidate
+        if jurisdiction is not None and is_definitive(candidate, jurisdiction):
+            return
+
+
+def search_candidates(
+    query: str,
+    *,
+    sources: list[str],
+    max_results: int,
+    cache: HttpCache | None = None,
+    strict: bool = False,
+    jurisdiction: str | None = None,
+    store: WorkStore | None = None,
+    deadline: float | Deadline | None = None,
+    authority: AuthorityIndex | None = None,
+) -> SearchResults:
+    """Collect :func:`iter_candidates` into a list sorted by final score.
 
+    ``deadline`` is a latency budget in seconds (or a :class:`Deadline`); the
+    result's ``partial`` flag says whether it cut any work short.
+    """
+
+    if deadline is not None and not isinstance(deadline, Deadline):
+        deadline = Deadline(deadline)
+    results = SearchResults()
+    for candidate in iter_candidates(
+        query,
+        sources=sources,
+        max_results=max_results,
+        cache=cache,
+        strict=strict,
+        jurisdiction=jurisdiction,
+        store=store,
+        deadline=deadline,
+        authority=authority,
+    ):
+        # A re-yielded candidate (see iter_candidates) is already in the list.
+        if not any(candidate is seen for seen in results):
+            results.append(candidate)
+    results.sort(key=lambda candidate: score_candidate(candidate, query), reverse=True)
+    results.partial = deadline is not None and deadline.partial
     return results
 
 
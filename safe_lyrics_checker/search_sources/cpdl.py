@@ -2,28 +2,21 @@ from __future__ import annotations
 
 import re
 
-from ..http_cache import HttpCache
-from .common import build_search_url, enrich_from_page, extract_title_candidates
-from .models import Candidate
+from ..url_sources import cpdl as url_adapter
+from .spec import SourceSpec
+from .structured import mediawiki_api
 
 DOMAIN = "https://www.cpdl.org"
 
+SPEC = SourceSpec(
+    name="cpdl",
+    domain=DOMAIN,
+    search_path="/wiki/index.php/Special:Search?search=",
+    link_re=re.compile(r"href=['\"](/wiki/index\.php/[^'\"]+)['\"]"),
+    authority=0.8,
+    adapter=url_adapter.extract_metadata,
+    api=mediawiki_api(DOMAIN, "/wiki/api.php", "/wiki/index.php/", "cpdl"),
+)
 
-def search(query: str, cache: HttpCache | None = None) -> list[Candidate]:
-    cache = cache or HttpCache()
-    url = build_search_url(f"{DOMAIN}/wiki/index.php/Special:Search?search=", query)
-    body = cache.get_text(url)
-    links = re.findall(r"href=['\"](/wiki/index\.php/[^'\"]+)['\"]", body)
-    titles = extract_title_candidates(body)
-    candidates: list[Candidate] = []
-    for idx, link in enumerate(links[:5]):
-        title = titles[idx] if idx < len(titles) else f"{query} ({idx + 1})"
-        work_url = f"{DOMAIN}{link}"
-        candidates.append(Candidate(title=title, source="cpdl", work_url=work_url, evidence_urls=[url, work_url]))
-    return candidates
-
-
-def enrich(candidate: Candidate, cache: HttpCache | None = None) -> Candidate:
-    cache = cache or HttpCache()
-    body = cache.get_text(candidate.work_url)
-    return enrich_from_page(candidate, body, candidate.work_url)
+search = SPEC.search
+enrich = SPEC.enrich
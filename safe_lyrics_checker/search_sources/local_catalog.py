@@ -0,0 +1,346 @@
+"""Offline catalog source backed by a bulk-imported SQLite FTS5 index.
+
+Records are imported from catalog metadata dumps (Project Gutenberg RDF,
+loc.gov JSON results) with ``safe-lyrics-checker import-catalog`` and searched
+locally, so candidates arrive with years already filled in and no network
+traffic is needed. The index lives at ``$SAFE_LYRICS_CHECKER_CATALOG`` when
+set, else at ``DEFAULT_CATALOG_DB``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import tarfile
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Optional
+
+from .models import Candidate
+
+DEFAULT_CATALOG_DB = Path(".cache/safe_lyrics_checker_catalog.sqlite")
+CATALOG_ENV = "SAFE_LYRICS_CHECKER_CATALOG"
+IMPORT_BATCH_SIZE = 1000
+
+_RDF = "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}"
+_PGTERMS = "{http://www.gutenberg.org/2009/pgterms/}"
+_DCTERMS = "{http://purl.org/dc/terms/}"
+_MARCREL = "{http://id.loc.gov/vocabulary/relators/}"
+
+YEAR_RE = re.compile(r"\b(1[5-9]\d{2}|20\d{2})\b")
+LIFESPAN_RE = re.compile(r"\b(1[5-9]\d{2}|20\d{2})?\s*-\s*(1[5-9]\d{2}|20\d{2})\b")
+TOKEN_RE = re.compile(r"\w+")
+
+
+@dataclass
+class CatalogRecord:
+    title: str
+    work_url: str
+    source: str
+    lyricist: Optional[str] = None
+    composer: Optional[str] = None
+    publication_year: Optional[int] = None
+    lyricist_death_year: Optional[int] = None
+    renewal_status: str = "unknown"
+
+
+class CatalogIndex:
+    def __init__(self, db_path: Path = DEFAULT_CATALOG_DB):
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path)
+
+    def _init_db(self) -> None:
+        with self._connect() as conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS catalog_works (
+                    id INTEGER PRIMARY KEY,
+                    work_url TEXT NOT NULL UNIQUE,
+                    source TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    lyricist TEXT,
+                    composer TEXT,
+                    publication_year INTEGER,
+                    lyricist_death_year INTEGER,
+                    renewal_status TEXT NOT NULL DEFAULT 'unknown'
+                );
+                CREATE VIRTUAL TABLE IF NOT EXISTS catalog_fts USING fts5(
+                    title, lyricist, composer, content='catalog_works', content_rowid='id'
+                );
+                CREATE TRIGGER IF NOT EXISTS catalog_works_ai AFTER INSERT ON catalog_works BEGIN
+                    INSERT INTO catalog_fts(rowid, title, lyricist, composer)
+                    VALUES (new.id, new.title, new.lyricist, new.composer);
+                END;
+                CREATE TRIGGER IF NOT EXISTS catalog_works_ad AFTER DELETE ON catalog_works BEGIN
+                    INSERT INTO catalog_fts(catalog_fts, rowid, title, lyricist, composer)
+                    VALUES ('delete', old.id, old.title, old.lyricist, old.composer);
+                END;
+                CREATE TRIGGER IF NOT EXISTS catalog_works_au AFTER UPDATE ON catalog_works BEGIN
+                    INSERT INTO catalog_fts(catalog_fts, rowid, title, lyricist, composer)
+                    VALUES ('delete', old.id, old.title, old.lyricist, old.composer);
+                    INSERT INTO catalog_fts(rowid, title, lyricist, composer)
+                    VALUES (new.id, new.title, new.lyricist, new.composer);
+                END;
+                """
+            )
+
+    def add_records(self, records: Iterable[CatalogRecord]) -> int:
+        count = 0
+        batch: list[tuple] = []
+        with self._connect() as conn:
+            for record in records:
+                batch.append(
+                    (
+                        record.work_url,
+                        record.source,
+                        record.title,
+                        record.lyricist,
+                        record.composer,
+                        record.publication_year,
+                        record.lyricist_death_year,
+                        record.renewal_status,
+                    )
+                )
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    count += self._insert(conn, batch)
+                    batch = []
+            count += self._insert(conn, batch)
+        return count
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, batch: list[tuple]) -> int:
+        conn.executemany(
+            """
+            INSERT INTO catalog_works (
+                work_url, source, title, lyricist, composer,
+                publication_year, lyricist_death_year, renewal_status
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(work_url) DO UPDATE SET
+                source = excluded.source,
+                title = excluded.title,
+                lyricist = excluded.lyricist,
+                composer = excluded.composer,
+                publication_year = excluded.publication_year,
+                lyricist_death_year = excluded.lyricist_death_year,
+                renewal_status = excluded.renewal_status
+            """,
+            batch,
+        )
+        return len(batch)
+
+    def search(self, query: str, limit: int = 5) -> list[Candidate]:
+        tokens = TOKEN_RE.findall(query.lower())
+        if not tokens:
+            return []
+        match = " ".join(f'"{token}"' for token in tokens)
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT w.title, w.source, w.work_url, w.lyricist, w.composer,
+                       w.publication_year, w.lyricist_death_year, w.renewal_status
+                FROM catalog_fts
+                JOIN catalog_works w ON w.id = catalog_fts.rowid
+                WHERE catalog_fts MATCH ?
+                ORDER BY catalog_fts.rank
+                LIMIT ?
+                """,
+                (match, limit),
+            ).fetchall()
+        return [
+            Candidate(
+                title=title,
+                source=source,
+                work_url=work_url,
+                lyricist=lyricist,
+                composer=composer,
+                publication_year=publication_year,
+                lyricist_death_year=death_year,
+                renewal_status=renewal_status,
+                evidence_urls=[work_url],
+            )
+            for title, source, work_url, lyricist, composer, publication_year, death_year, renewal_status in rows
+        ]
+
+
+def _first_year(value: str | None) -> Optional[int]:
+    if not value:
+        return None
+    match = YEAR_RE.search(value)
+    return int(match.group(1)) if match else None
+
+
+def _text(element: ET.Element | None) -> Optional[str]:
+    if element is None or element.text is None:
+        return None
+    value = " ".join(element.text.split())
+    return value or None
+
+
+def _parse_gutenberg_rdf(handle: IO[bytes]) -> Iterator[CatalogRecord]:
+    root = ET.parse(handle).getroot()
+    for ebook in root.iter(f"{_PGTERMS}ebook"):
+        title = _text(ebook.find(f"{_DCTERMS}title"))
+        about = ebook.get(f"{_RDF}about", "")
+        if not title or not about:
+            continue
+
+        lyricist = composer = None
+        death_year = None
+        for role in (f"{_MARCREL}lyr", f"{_DCTERMS}creator", f"{_MARCREL}cmp"):
+            for agent in ebook.findall(f"{role}/{_PGTERMS}agent"):
+                name = _text(agent.find(f"{_PGTERMS}name"))
+                if role == f"{_MARCREL}cmp":
+                    composer = composer or name
+                    continue
+                if lyricist is None:
+                    lyricist = name
+                    death_year = _first_year(_text(agent.find(f"{_PGTERMS}deathdate")))
+
+        yield CatalogRecord(
+            title=title,
+            work_url=f"https://www.gutenberg.org/{about.lstrip('/')}",
+            source="gutenberg",
+            lyricist=lyricist,
+            composer=composer,
+            # dcterms:issued is the ebook's release date (1971 or later), not
+            # the work's publication; Gutenberg records carry no such date.
+            lyricist_death_year=death_year,
+        )
+
+
+def iter_gutenberg_rdf(path: Path) -> Iterator[CatalogRecord]:
+    """Yield records from one RDF file, a directory of them, or the tar dump."""
+
+    if path.is_dir():
+        for rdf_path in sorted(path.rglob("*.rdf")):
+            with rdf_path.open("rb") as handle:
+                yield from _parse_gutenberg_rdf(handle)
+        return
+
+    if tarfile.is_tarfile(path):
+        with tarfile.open(path) as archive:
+            for member in archive:
+                if not member.isfile() or not member.name.endswith(".rdf"):
+                    continue
+                handle = archive.extractfile(member)
+                if handle is not None:
+                    yield from _parse_gutenberg_rdf(handle)
+        return
+
+    with path.open("rb") as handle:
+        yield from _parse_gutenberg_rdf(handle)
+
+
+def _loc_names(item: dict) -> list[str]:
+    names = item.get("contributor_names") or item.get("contributor") or []
+    if isinstance(names, str):
+        names = [names]
+    return [str(name) for name in names if name]
+
+
+def _loc_record(item: dict) -> Optional[CatalogRecord]:
+    title = item.get("title")
+    work_url = item.get("url") or item.get("id")
+    if not title or not work_url:
+        return None
+    if isinstance(title, list):
+        title = title[0]
+
+    lyricist = death_year = None
+    names = _loc_names(item)
+    if names:
+        # LOC name headings carry lifespans, e.g. "Newton, John, 1725-1807".
+        lyricist = names[0]
+        lifespan = LIFESPAN_RE.search(lyricist)
+        if lifespan:
+            death_year = int(lifespan.group(2))
+
+    return CatalogRecord(
+        title=str(title),
+        work_url=str(work_url),
+        source="loc",
+        lyricist=lyricist,
+        publication_year=_first_year(str(item.get("date") or "")),
+        lyricist_death_year=death_year,
+    )
+
+
+def iter_loc_json(path: Path) -> Iterator[CatalogRecord]:
+    """Yield records from a loc.gov ``fo=json`` results file or JSON Lines dump."""
+
+    with path.open(encoding="utf-8") as handle:
+        first = handle.read(1)
+        while first.isspace():
+            first = handle.read(1)
+        handle.seek(0)
+        document = None
+        if first == "[" or (first == "{" and path.suffix != ".jsonl"):
+            try:
+                document = json.load(handle)
+            except json.JSONDecodeError:
+                if first == "[":
+                    raise
+                # JSON Lines under a .json name.
+                handle.seek(0)
+        if document is None:
+            items = (json.loads(line) for line in handle if line.strip())
+        else:
+            # A results document, a bare array, or a single record.
+            items = document.get("results", [document]) if isinstance(document, dict) else document
+        for item in items:
+            record = _loc_record(item)
+            if record is not None:
+                yield record
+
+
+def default_catalog_db() -> Path:
+    return Path(os.environ.get(CATALOG_ENV) or DEFAULT_CATALOG_DB)
+
+
+def import_catalog(path: Path, fmt: str, db_path: Path | None = None) -> int:
+    if fmt == "gutenberg-rdf":
+        records = iter_gutenberg_rdf(path)
+    elif fmt == "loc-json":
+        records = iter_loc_json(path)
+    else:
+        raise ValueError(f"Unsupported catalog format: {fmt}")
+    return CatalogIndex(db_path or default_catalog_db()).add_records(records)
+
+
+class LocalCatalogSource:
+    """Search source answering from the local catalog index only.
+
+    ``db_path`` defaults to :func:`default_catalog_db`, resolved per search so
+    ``$SAFE_LYRICS_CHECKER_CATALOG`` points search at the same index that
+    ``import-catalog`` wrote.
+    """
+
+    name = "local"
+    adapter = None
+    adapter_domain = ""
+
+    def __init__(self, db_path: Path | None = None, result_limit: int = 5) -> None:
+        self.db_path = db_path
+        self.result_limit = result_limit
+        self._index: Optional[CatalogIndex] = None
+
+    def search(self, query: str, cache: object = None) -> list[Candidate]:
+        db_path = self.db_path or default_catalog_db()
+        if self._index is None or self._index.db_path != db_path:
+            if not db_path.exists():
+                return []
+            self._index = CatalogIndex(db_path)
+        return self._index.search(query, limit=self.result_limit)
+
+    def enrich(self, candidate: Candidate, cache: object = None) -> Candidate:
+        return candidate
+
+
+SOURCE = LocalCatalogSource()
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import sys
+from array import array
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import TYPE_CHECKING, Iterator, Optional
 
+if TYPE_CHECKING:
+    from ..rights_engine import RightsResult
 
-@dataclass
+# ``slots=True`` needs Python 3.10; older interpreters get regular dataclasses.
+SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**SLOTS)
 class Candidate:
     title: str
     source: str
@@ -16,8 +24,89 @@ class Candidate:
     renewal_status: str = "unknown"
     evidence_urls: list[str] = field(default_factory=list)
 
+    def __post_init__(self) -> None:
+        # A handful of distinct values repeated across millions of records.
+        self.source = sys.intern(self.source)
+        self.renewal_status = sys.intern(self.renewal_status)
 
-@dataclass
+
+@dataclass(**SLOTS)
 class Fact:
     value: str
     source_url: str
+
+
+RENEWAL_STATUSES = ("unknown", "renewed", "not_renewed")
+# Anything else is stored as "unknown" rather than rejected.
+_RENEWAL_CODES = {status: code for code, status in enumerate(RENEWAL_STATUSES)}
+_NO_RIGHTS = 0xFFFF
+
+
+class CandidateColumns:
+    """Array-backed result set holding one column per :class:`Candidate` field.
+
+    Years are stored in ``array('h')`` (0 means unknown); sources, renewal
+    statuses and rights verdicts are small integer codes into shared tables.
+    Indexing or iterating rebuilds :class:`Candidate` objects on demand.
+    """
+
+    def __init__(self) -> None:
+        self.titles: list[str] = []
+        self.work_urls: list[str] = []
+        self.lyricists: list[Optional[str]] = []
+        self.composers: list[Optional[str]] = []
+        self.evidence_urls: list[tuple[str, ...]] = []
+        self.publication_years = array("h")
+        self.death_years = array("h")
+        self.source_codes = array("H")
+        self.renewal_codes = array("B")
+        self.rights_codes = array("H")
+        self._sources: list[str] = []
+        self._source_index: dict[str, int] = {}
+        self._rights: list[RightsResult] = []
+        self._rights_index: dict[RightsResult, int] = {}
+
+    def append(self, candidate: Candidate, rights: Optional[RightsResult] = None) -> None:
+        self.titles.append(candidate.title)
+        self.work_urls.append(candidate.work_url)
+        self.lyricists.append(candidate.lyricist)
+        self.composers.append(candidate.composer)
+        self.evidence_urls.append(tuple(candidate.evidence_urls))
+        self.publication_years.append(candidate.publication_year or 0)
+        self.death_years.append(candidate.lyricist_death_year or 0)
+        self.source_codes.append(self._code(self._sources, self._source_index, candidate.source))
+        self.renewal_codes.append(_RENEWAL_CODES.get(candidate.renewal_status, 0))
+        self.rights_codes.append(
+            _NO_RIGHTS if rights is None else self._code(self._rights, self._rights_index, rights)
+        )
+
+    @staticmethod
+    def _code(table: list, index: dict, value) -> int:
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(table)
+            table.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def __getitem__(self, idx: int) -> Candidate:
+        return Candidate(
+            title=self.titles[idx],
+            source=self._sources[self.source_codes[idx]],
+            work_url=self.work_urls[idx],
+            lyricist=self.lyricists[idx],
+            composer=self.composers[idx],
+            publication_year=self.publication_years[idx] or None,
+            lyricist_death_year=self.death_years[idx] or None,
+            renewal_status=RENEWAL_STATUSES[self.renewal_codes[idx]],
+            evidence_urls=list(self.evidence_urls[idx]),
+        )
+
+    def __iter__(self) -> Iterator[Candidate]:
+        return (self[idx] for idx in range(len(self)))
+
+    def rights(self, idx: int) -> Optional[RightsResult]:
+        code = self.rights_codes[idx]
+        return None if code == _NO_RIGHTS else self._rights[code]
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import sys
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Iterator, Mapping
+
+if TYPE_CHECKING:
+    from .spec import SourceSpec
+
+ENTRY_POINT_GROUP = "safe_lyrics_checker.sources"
+
+# Source name -> ``module:attribute`` of its spec. Nothing is imported until a
+# source is looked up, so listing or validating sources does not pull in
+# ``requests``.
+BUILTIN_SOURCES: dict[str, str] = {
+    "gutenberg": f"{__package__}.gutenberg:SPEC",
+    "imslp": f"{__package__}.imslp:SPEC",
+    "cpdl": f"{__package__}.cpdl:SPEC",
+    "loc": f"{__package__}.loc:SPEC",
+    "archive": f"{__package__}.archive:SPEC",
+    "worldcat": f"{__package__}.worldcat:SPEC",
+    "copyright": f"{__package__}.copyright_office:SPEC",
+    "local": f"{__package__}.local_catalog:SOURCE",
+}
+
+# Host domain of each built-in source, so a URL finds its source without
+# importing the others.
+BUILTIN_DOMAINS: dict[str, str] = {
+    "gutenberg": "gutenberg.org",
+    "imslp": "imslp.org",
+    "cpdl": "cpdl.org",
+    "loc": "loc.gov",
+    "archive": "archive.org",
+    "worldcat": "worldcat.org",
+    "copyright": "copyright.gov",
+}
+
+SOURCE_NAMES: tuple[str, ...] = tuple(BUILTIN_SOURCES)
+
+
+def _matches(host: str, domain: str) -> bool:
+    return bool(domain) and (host == domain or host.endswith(f".{domain}"))
+
+
+def _load_target(target: str) -> Any:
+    module_name, _, attribute = target.partition(":")
+    return getattr(import_module(module_name), attribute or "SPEC")
+
+
+def _discover_entry_points() -> dict[str, Any]:
+    from importlib.metadata import entry_points
+
+    try:
+        found = entry_points(group=ENTRY_POINT_GROUP)
+    except TypeError:  # Python < 3.10
+        found = entry_points().get(ENTRY_POINT_GROUP, [])
+    return {entry_point.name: entry_point for entry_point in found}
+
+
+class SourceRegistry(Mapping[str, "SourceSpec"]):
+    """Mapping of source name to :class:`SourceSpec`, resolved lazily.
+
+    Besides the built-in sources, third-party packages can contribute sources
+    through the ``safe_lyrics_checker.sources`` entry-point group. An entry
+    point must resolve to a :class:`SourceSpec` or a compatible object. Built-in
+    names win over entry points with the same name.
+    """
+
+    def __init__(
+        self, builtins: Mapping[str, str], *, domains: Mapping[str, str] | None = None, discover: bool = True
+    ) -> None:
+        self._targets: dict[str, Any] = dict(builtins)
+        self._domains: dict[str, str] = dict(domains or {})
+        self._loaded: dict[str, SourceSpec] = {}
+        self._discover = discover
+
+    def _ensure_discovered(self) -> None:
+        if not self._discover:
+            return
+        self._discover = False
+        for name, entry_point in _discover_entry_points().items():
+            self._targets.setdefault(name, entry_point)
+
+    def register(self, spec: "SourceSpec", *, name: str | None = None) -> None:
+        key = name or spec.name
+        self._targets[key] = spec
+        self._loaded[key] = spec
+
+    def unregister(self, name: str) -> None:
+        self._targets.pop(name, None)
+        self._loaded.pop(name, None)
+
+    def __getitem__(self, name: str) -> "SourceSpec":
+        if name not in self._loaded:
+            self._ensure_discovered()
+            target = self._targets[name]
+            if isinstance(target, str):
+                spec = _load_target(target)
+            elif hasattr(target, "load"):
+                spec = target.load()
+            else:
+                spec = target
+            self._loaded[name] = spec
+        return self._loaded[name]
+
+    def for_host(self, host: str) -> "SourceSpec | None":
+        """Return the source whose ``adapter_domain`` covers ``host``.
+
+        Built-in sources are matched on their known domain and only the match
+        is imported. Entry points carry no domain, so they are loaded only
+        when no built-in or registered source matches, and one that fails to
+        load is skipped with a warning.
+        """
+
+        host = host.lower()
+        for name, domain in self._domains.items():
+            if name in self._targets and _matches(host, domain):
+                return self[name]
+        for spec in list(self._loaded.values()):
+            if _matches(host, getattr(spec, "adapter_domain", "")):
+                return spec
+        self._ensure_discovered()
+        for name in list(self._targets):
+            if name in self._loaded or name in self._domains:
+                continue
+            try:
+                spec = self[name]
+            except Exception as exc:
+                print(f"WARN: source {name} failed to load ({exc}) — skipping.", file=sys.stderr)
+                continue
+            if _matches(host, getattr(spec, "adapter_domain", "")):
+                return spec
+        return None
+
+    def __contains__(self, name: object) -> bool:
+        self._ensure_discovered()
+        return name in self._targets
+
+    def __iter__(self) -> Iterator[str]:
+        self._ensure_discovered()
+        return iter(list(self._targets))
+
+    def __len__(self) -> int:
+        self._ensure_discovered()
+        return len(self._targets)
+
+
+SOURCES = SourceRegistry(BUILTIN_SOURCES, domains=BUILTIN_DOMAINS)
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import Callable, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from ..http_cache import HttpCache
+from ..metrics import METRICS
+from ..rights_engine import JURISDICTIONS, RightsStatus, check_lyrics_rights
+from ..url_sources.models import UrlMetadata
+from .common import build_search_url, enrich_from_page, extract_title_candidates
+from .local_catalog import CatalogRecord
+from .models import Candidate
+from .structured import StructuredApi
+
+UrlAdapter = Callable[[str], UrlMetadata]
+# Failures that mean "this endpoint is unusable right now", not a parser bug:
+# HTTP errors, and malformed JSON/RDF or payloads missing expected keys.
+STRUCTURED_ERRORS = (requests.RequestException, ValueError, KeyError, ET.ParseError)
+
+
+@dataclass(frozen=True)
+class SourceSpec:
+    """Declarative description of a catalog source.
+
+    ``search_path`` is appended to ``domain`` and must end where the quoted
+    query goes. ``link_re`` is compiled once and its first group must capture
+    the work link, either site-relative or absolute. ``adapter`` is the
+    optional ``evaluate-url`` metadata extractor for this domain.
+    ``authority`` (0-1) weights how much ranking trusts this catalog.
+    ``api`` lists structured endpoints tried before the HTML pages.
+    """
+
+    name: str
+    domain: str
+    search_path: str
+    link_re: re.Pattern[str]
+    result_limit: int = 5
+    authority: float = 0.5
+    adapter: Optional[UrlAdapter] = None
+    api: Optional[StructuredApi] = None
+
+    @property
+    def adapter_domain(self) -> str:
+        host = (urlparse(self.domain).hostname or "").lower()
+        return host[4:] if host.startswith("www.") else host
+
+    def search_url(self, query: str) -> str:
+        return build_search_url(f"{self.domain}{self.search_path}", query)
+
+    def work_url(self, link: str) -> str:
+        return link if link.startswith(("http://", "https://")) else f"{self.domain}{link}"
+
+    def search(self, query: str, cache: HttpCache | None = None) -> list[Candidate]:
+        cache = cache or HttpCache()
+        if self.api is not None and self.api.search_url is not None:
+            try:
+                return self._search_structured(query, cache)
+            except STRUCTURED_ERRORS:
+                METRICS.incr("structured_fallbacks", source=self.name, stage="search")
+        url = self.search_url(query)
+        body = cache.get_text(url)
+        links = self.link_re.findall(body)
+        titles = extract_title_candidates(body)
+        candidates: list[Candidate] = []
+        for idx, link in enumerate(links[: self.result_limit]):
+            title = titles[idx] if idx < len(titles) else f"{query} ({idx + 1})"
+            work_url = self.work_url(link)
+            candidates.append(Candidate(title=title, source=self.name, work_url=work_url, evidence_urls=[url, work_url]))
+        return candidates
+
+    def _search_structured(self, query: str, cache: HttpCache) -> list[Candidate]:
+        url = self.api.search_url(query, self.result_limit)
+        records = self.api.parse_search(cache.get_text(url))
+        return [
+            Candidate(
+                title=record.title,
+                source=self.name,
+                work_url=record.work_url,
+                lyricist=record.lyricist,
+                composer=record.composer,
+                publication_year=record.publication_year,
+                lyricist_death_year=record.lyricist_death_year,
+                renewal_status=record.renewal_status,
+                evidence_urls=[url, record.work_url],
+            )
+            for record in records[: self.result_limit]
+        ]
+
+    def structured_record(self, work_url: str, cache: HttpCache) -> Optional[tuple[str, CatalogRecord]]:
+        """Fetch and parse the structured record for ``work_url``, if this catalog has one."""
+
+        if self.api is None or self.api.record_url is None:
+            return None
+        record_url = self.api.record_url(work_url)
+        if record_url is None:
+            return None
+        try:
+            record = self.api.parse_record(cache.get_text(record_url), work_url)
+        except STRUCTURED_ERRORS:
+            METRICS.incr("structured_fallbacks", source=self.name, stage="record")
+            return None
+        return None if record is None else (record_url, record)
+
+    def enrich(self, candidate: Candidate, cache: HttpCache | None = None) -> Candidate:
+        """Fill ``candidate`` from its structured record, then from the work page.
+
+        The page is still fetched when the record is too sparse for a
+        definitive verdict in every jurisdiction (Gutenberg's RDF, for one,
+        never has a publication year), and only fills the fields the record
+        left empty. A failed page fetch then keeps the record's fields.
+        """
+
+        cache = cache or HttpCache()
+        structured = self.structured_record(candidate.work_url, cache)
+        if structured is None:
+            return enrich_from_page(candidate, cache.get_text(candidate.work_url), candidate.work_url)
+        candidate = _apply_record(candidate, *structured)
+        if _definitive_everywhere(candidate):
+            return candidate
+        try:
+            body = cache.get_text(candidate.work_url)
+        except requests.RequestException:
+            METRICS.incr("structured_page_failures", source=self.name)
+            return candidate
+        return enrich_from_page(candidate, body, candidate.work_url)
+
+
+def _definitive_everywhere(candidate: Candidate) -> bool:
+    return all(
+        check_lyrics_rights(
+            jurisdiction=jurisdiction,
+            publication_year=candidate.publication_year,
+            lyricist_death_year=candidate.lyricist_death_year,
+            renewal_status=candidate.renewal_status,
+        ).status
+        is not RightsStatus.UNKNOWN
+        for jurisdiction in JURISDICTIONS
+    )
+
+
+def _apply_record(candidate: Candidate, record_url: str, record: CatalogRecord) -> Candidate:
+    if record_url not in candidate.evidence_urls:
+        candidate.evidence_urls.append(record_url)
+    for name in ("lyricist", "composer", "publication_year", "lyricist_death_year"):
+        if getattr(candidate, name) is None:
+            setattr(candidate, name, getattr(record, name))
+    if candidate.renewal_status == "unknown":
+        candidate.renewal_status = record.renewal_status
+    return candidate
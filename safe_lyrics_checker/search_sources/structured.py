@@ -0,0 +1,231 @@
+"""Structured catalog endpoints preferred over HTML scraping.
+
+Each :class:`StructuredApi` maps a query to a JSON/RDF search endpoint and a
+work URL to its metadata record, and parses both into :class:`CatalogRecord`
+values. Years, names and death dates then come straight from catalog fields
+instead of regexes over rendered pages. Sources fall back to HTML when an
+endpoint is missing, fails, or returns something unparseable.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import re
+from dataclasses import dataclass
+from typing import Callable, Optional
+from urllib.parse import quote, quote_plus, unquote, urlparse
+
+from .local_catalog import CatalogRecord, _first_year, _loc_record, _parse_gutenberg_rdf
+
+DEATH_RE = re.compile(r"\b(?:died|death|d\.)\D{0,20}(1[5-9]\d{2}|20\d{2})", re.IGNORECASE)
+LIFESPAN_RE = re.compile(r"\b(1[5-9]\d{2}|20\d{2})?\s*[-\u2013]\s*(1[5-9]\d{2}|20\d{2})\b")
+
+
+@dataclass(frozen=True)
+class StructuredApi:
+    """``search_url(query, limit)`` and ``parse_search(body)`` cover search;
+    ``record_url(work_url)`` (``None`` when the URL has no record) and
+    ``parse_record(body, work_url)`` cover enrichment. Either half may be
+    left out.
+    """
+
+    search_url: Optional[Callable[[str, int], str]] = None
+    parse_search: Optional[Callable[[str], list[CatalogRecord]]] = None
+    record_url: Optional[Callable[[str], Optional[str]]] = None
+    parse_record: Optional[Callable[[str, str], Optional[CatalogRecord]]] = None
+
+
+def _death_from_lifespan(name: Optional[str]) -> Optional[int]:
+    match = LIFESPAN_RE.search(name or "")
+    return int(match.group(2)) if match else None
+
+
+# loc.gov: every page answers ``fo=json``.
+
+
+def loc_search_url(query: str, limit: int) -> str:
+    return f"https://www.loc.gov/search/?q={quote_plus(query)}&fo=json&c={limit}"
+
+
+def parse_loc_search(body: str) -> list[CatalogRecord]:
+    results = json.loads(body).get("results", [])
+    return [record for record in (_loc_record(item) for item in results) if record is not None]
+
+
+def loc_record_url(work_url: str) -> Optional[str]:
+    parsed = urlparse(work_url)
+    if not parsed.path.startswith(("/item/", "/resource/")):
+        return None
+    return f"{work_url}{'&' if parsed.query else '?'}fo=json"
+
+
+def parse_loc_record(body: str, work_url: str) -> Optional[CatalogRecord]:
+    item = dict(json.loads(body).get("item") or {})
+    item.setdefault("url", work_url)
+    return _loc_record(item)
+
+
+LOC_API = StructuredApi(loc_search_url, parse_loc_search, loc_record_url, parse_loc_record)
+
+
+# archive.org: advancedsearch for search, the metadata API for items.
+
+_ARCHIVE_FIELDS = ("identifier", "title", "creator", "date", "year")
+
+
+def archive_search_url(query: str, limit: int) -> str:
+    fields = "".join(f"&fl[]={name}" for name in _ARCHIVE_FIELDS)
+    return f"https://archive.org/advancedsearch.php?q={quote_plus(query)}{fields}&rows={limit}&output=json"
+
+
+def _archive_record(fields: dict, work_url: str) -> Optional[CatalogRecord]:
+    title = fields.get("title")
+    if isinstance(title, list):
+        title = title[0] if title else None
+    if not title:
+        return None
+    creator = fields.get("creator")
+    if isinstance(creator, list):
+        creator = creator[0] if creator else None
+    return CatalogRecord(
+        title=str(title),
+        work_url=work_url,
+        source="archive",
+        lyricist=str(creator) if creator else None,
+        publication_year=_first_year(str(fields.get("year") or fields.get("date") or "")),
+        lyricist_death_year=_death_from_lifespan(str(creator) if creator else None),
+    )
+
+
+def parse_archive_search(body: str) -> list[CatalogRecord]:
+    docs = json.loads(body).get("response", {}).get("docs", [])
+    records = (
+        _archive_record(doc, f"https://archive.org/details/{doc['identifier']}")
+        for doc in docs
+        if doc.get("identifier")
+    )
+    return [record for record in records if record is not None]
+
+
+def archive_record_url(work_url: str) -> Optional[str]:
+    parts = urlparse(work_url).path.strip("/").split("/")
+    if len(parts) < 2 or parts[0] != "details":
+        return None
+    return f"https://archive.org/metadata/{parts[1]}"
+
+
+def parse_archive_record(body: str, work_url: str) -> Optional[CatalogRecord]:
+    return _archive_record(json.loads(body).get("metadata") or {}, work_url)
+
+
+ARCHIVE_API = StructuredApi(archive_search_url, parse_archive_search, archive_record_url, parse_archive_record)
+
+
+# Project Gutenberg: no search API, but every ebook has a catalog RDF record.
+
+_GUTENBERG_EBOOK_RE = re.compile(r"^/ebooks/(\d+)")
+
+
+def gutenberg_record_url(work_url: str) -> Optional[str]:
+    match = _GUTENBERG_EBOOK_RE.match(urlparse(work_url).path)
+    return f"https://www.gutenberg.org/ebooks/{match.group(1)}.rdf" if match else None
+
+
+def parse_gutenberg_record(body: str, work_url: str) -> Optional[CatalogRecord]:
+    records = list(_parse_gutenberg_rdf(io.BytesIO(body.encode("utf-8"))))
+    return records[0] if records else None
+
+
+GUTENBERG_API = StructuredApi(record_url=gutenberg_record_url, parse_record=parse_gutenberg_record)
+
+
+# MediaWiki catalogs (IMSLP, CPDL): the search and parse APIs.
+
+_WIKI_FIELD_RE = re.compile(r"^\|\s*([^=|]+?)\s*=\s*(.*?)\s*$", re.MULTILINE)
+_WIKI_TEMPLATE_RE = re.compile(r"\{\{\s*(Composer|Lyricist|Librettist|Text|Pub)\s*\|([^}]*)\}\}", re.IGNORECASE)
+_WIKI_MARKUP_RE = re.compile(r"\[\[(?:[^|\]]*\|)?([^\]]*)\]\]|'{2,}")
+
+_PERSON_FIELDS = ("lyricist", "librettist", "text", "words", "poet", "author")
+_YEAR_FIELDS = ("first publication", "year of first publication", "publication", "year/date of composition")
+
+
+def _wiki_plain(value: str) -> str:
+    return " ".join(_WIKI_MARKUP_RE.sub(lambda m: m.group(1) or "", value).split())
+
+
+def _person_death_year(entry: str) -> Optional[int]:
+    death = DEATH_RE.search(entry)
+    return int(death.group(1)) if death else _death_from_lifespan(entry)
+
+
+def parse_wikitext(wikitext: str, title: str, work_url: str, source: str) -> CatalogRecord:
+    fields = {key.strip().lower(): _wiki_plain(value) for key, value in _WIKI_FIELD_RE.findall(wikitext)}
+    # Whole person entries, so life dates after the name's template are kept.
+    entries = dict(fields)
+    for name, args in _WIKI_TEMPLATE_RE.findall(wikitext):
+        values = [_wiki_plain(arg) for arg in args.split("|")]
+        key = name.lower()
+        if key == "pub":
+            # CPDL: {{Pub|1|1913|...}} -> first publication year.
+            fields.setdefault("first publication", " ".join(values[1:2]))
+        else:
+            fields.setdefault(key, values[0])
+            entries.setdefault(key, " ".join(values))
+
+    lyricist_key = next((key for key in _PERSON_FIELDS if fields.get(key)), None)
+    year = next((_first_year(fields[key]) for key in _YEAR_FIELDS if _first_year(fields.get(key))), None)
+    return CatalogRecord(
+        title=title,
+        work_url=work_url,
+        source=source,
+        lyricist=fields[lyricist_key] if lyricist_key else None,
+        composer=fields.get("composer") or None,
+        publication_year=year,
+        # Only the lyricist's own entry: "ed. 1950" elsewhere is not a death.
+        lyricist_death_year=_person_death_year(entries[lyricist_key]) if lyricist_key else None,
+    )
+
+
+def mediawiki_api(domain: str, api_path: str, page_prefix: str, source: str) -> StructuredApi:
+    """Build the structured API for a MediaWiki catalog at ``domain``.
+
+    ``page_prefix`` is the path before a page title in work URLs, e.g.
+    ``/wiki/`` on IMSLP and ``/wiki/index.php/`` on CPDL.
+    """
+
+    endpoint = f"{domain}{api_path}"
+
+    def search_url(query: str, limit: int) -> str:
+        return f"{endpoint}?action=query&list=search&srsearch={quote_plus(query)}&srlimit={limit}&format=json"
+
+    def parse_search(body: str) -> list[CatalogRecord]:
+        hits = json.loads(body).get("query", {}).get("search", [])
+        return [
+            CatalogRecord(
+                title=hit["title"],
+                work_url=f"{domain}{page_prefix}{quote(hit['title'].replace(' ', '_'))}",
+                source=source,
+            )
+            for hit in hits
+            if hit.get("title")
+        ]
+
+    def record_url(work_url: str) -> Optional[str]:
+        path = urlparse(work_url).path
+        if not path.startswith(page_prefix):
+            return None
+        page = unquote(path[len(page_prefix) :])
+        if not page or page.startswith("Special:"):
+            return None
+        return f"{endpoint}?action=parse&page={quote_plus(page)}&prop=wikitext&redirects=1&format=json"
+
+    def parse_record(body: str, work_url: str) -> Optional[CatalogRecord]:
+        parsed = json.loads(body).get("parse")
+        if not parsed:
+            return None
+        wikitext = parsed.get("wikitext", {})
+        wikitext = wikitext.get("*", "") if isinstance(wikitext, dict) else str(wikitext)
+        return parse_wikitext(wikitext, parsed.get("title") or "", work_url, source)
+
+    return StructuredApi(search_url, parse_search, record_url, parse_record)
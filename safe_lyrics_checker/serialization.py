@@ -0,0 +1,111 @@
+"""Stable JSON records for CLI and service output.
+
+Every record carries a ``kind`` and a ``schema`` version. Fields are listed
+explicitly rather than derived from the dataclasses, so internal refactors do
+not silently change the output contract.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import IO, Any, Optional
+
+from .quote_safety import CheckResult
+from .rights_engine import RightsResult
+from .search_sources.models import Candidate
+from .url_sources.models import UrlEvaluation, UrlMetadata
+
+try:  # Optional fast encoder.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+SCHEMA_VERSION = 1
+
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps(record: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(record).decode("utf-8")
+    return _ENCODER.encode(record)
+
+
+def write_record(stream: IO[str], record: Any) -> None:
+    """Write one record as a single JSON line."""
+
+    stream.write(dumps(record))
+    stream.write("\n")
+
+
+def rights_record(result: RightsResult, jurisdiction: Optional[str] = None) -> dict[str, Any]:
+    record: dict[str, Any] = {
+        "kind": "rights",
+        "schema": SCHEMA_VERSION,
+        "status": result.status.value,
+        "code": result.code,
+        "explanation": result.explanation,
+    }
+    if jurisdiction is not None:
+        record["jurisdiction"] = jurisdiction.upper()
+    return record
+
+
+def candidate_record(
+    candidate: Candidate, rights: Optional[RightsResult] = None, *, update: bool = False
+) -> dict[str, Any]:
+    """``update`` marks a record replacing an earlier one for the same work URL."""
+
+    record: dict[str, Any] = {
+        "kind": "candidate_update" if update else "candidate",
+        "schema": SCHEMA_VERSION,
+        "title": candidate.title,
+        "source": candidate.source,
+        "work_url": candidate.work_url,
+        "lyricist": candidate.lyricist,
+        "composer": candidate.composer,
+        "publication_year": candidate.publication_year,
+        "lyricist_death_year": candidate.lyricist_death_year,
+        "renewal_status": candidate.renewal_status,
+        "evidence_urls": list(candidate.evidence_urls),
+    }
+    if rights is not None:
+        record["rights"] = rights_record(rights)
+    return record
+
+
+def search_status_record(query: str, *, partial: bool) -> dict[str, Any]:
+    return {"kind": "search_status", "schema": SCHEMA_VERSION, "query": query, "partial": partial}
+
+
+def url_metadata_record(metadata: UrlMetadata) -> dict[str, Any]:
+    return {
+        "kind": "url_metadata",
+        "schema": SCHEMA_VERSION,
+        "title": metadata.title,
+        "lyricist_or_composer": metadata.lyricist_or_composer,
+        "publication_year": metadata.publication_year,
+        "lyricist_death_year": metadata.lyricist_death_year,
+        "renewal_status": metadata.renewal_status,
+    }
+
+
+def url_evaluation_record(url: str, rights: RightsResult, evaluation: UrlEvaluation) -> dict[str, Any]:
+    return {
+        "kind": "url_evaluation",
+        "schema": SCHEMA_VERSION,
+        "evidence_url": url,
+        "rights": rights_record(rights),
+        "metadata": url_metadata_record(evaluation.metadata),
+        "warning": evaluation.warning,
+    }
+
+
+def check_result_record(result: CheckResult) -> dict[str, Any]:
+    return {
+        "kind": "quote_check",
+        "schema": SCHEMA_VERSION,
+        "is_safe": result.is_safe,
+        "rule_hits": list(result.rule_hits),
+        "notes": list(result.notes),
+    }
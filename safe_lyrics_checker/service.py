@@ -0,0 +1,312 @@
+"""Long-running JSON service exposing the checker commands over HTTP.
+
+The service keeps one :class:`HttpCache`, one pooled ``requests.Session`` and
+one preloaded :class:`KnownLyricsIndex` alive for its whole lifetime, so each
+request only pays for the work it actually asks for.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Callable
+
+import requests
+
+from .authority import AuthorityIndex
+from .defaults import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_QUEUE_SIZE, DEFAULT_WORKERS
+from .http_cache import HttpCache
+from .metrics import METRICS
+from .quote_safety import KnownLyricsIndex, LyricsIndex, check_quote_safety
+from .rights_engine import check_lyrics_rights
+from .search_engine import SOURCES, evaluate_candidate, search_candidates
+from .search_sources.models import RENEWAL_STATUSES
+from .serialization import (
+    candidate_record,
+    check_result_record,
+    dumps,
+    rights_record,
+    url_evaluation_record,
+)
+from .url_sources import evaluate_url
+
+MAX_BODY_BYTES = 1024 * 1024
+
+_BUSY_BODY = b'{"error": "Server is at capacity; retry later."}'
+_BUSY_RESPONSE = (
+    b"HTTP/1.0 503 Service Unavailable\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Content-Length: " + str(len(_BUSY_BODY)).encode("ascii") + b"\r\n"
+    b"Connection: close\r\n"
+    b"\r\n" + _BUSY_BODY
+)
+
+
+class ServiceError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _require(payload: dict[str, Any], key: str) -> Any:
+    value = payload.get(key)
+    if value is None or value == "":
+        raise ServiceError(400, f"Missing required field: {key}")
+    return value
+
+
+def _number(payload: dict[str, Any], key: str, kind: type, default: Any = None) -> Any:
+    value = payload.get(key)
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        raise ServiceError(400, f"Field {key} must be a number.")
+    try:
+        return kind(value)
+    except (TypeError, ValueError) as exc:
+        raise ServiceError(400, f"Field {key} must be {'an integer' if kind is int else 'a number'}.") from exc
+
+
+def _flag(payload: dict[str, Any], key: str, default: bool = False) -> bool:
+    value = payload.get(key, default)
+    if not isinstance(value, bool):
+        raise ServiceError(400, f"Field {key} must be true or false.")
+    return value
+
+
+def _strings(payload: dict[str, Any], key: str) -> list[str] | None:
+    value = payload.get(key)
+    if not value:
+        return None
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ServiceError(400, f"Field {key} must be a list of strings.")
+    return value
+
+
+def _renewal_status(payload: dict[str, Any]) -> str:
+    value = payload.get("renewal_status", "unknown")
+    if value not in RENEWAL_STATUSES:
+        raise ServiceError(400, f"Field renewal_status must be one of: {', '.join(RENEWAL_STATUSES)}.")
+    return value
+
+
+def _sources(payload: dict[str, Any]) -> list[str]:
+    sources = _strings(payload, "sources")
+    if sources is None:
+        return list(SOURCES.keys())
+    invalid = [s for s in sources if s not in SOURCES]
+    if invalid:
+        raise ServiceError(400, f"Unsupported source(s): {', '.join(invalid)}")
+    return sources
+
+
+def _jurisdiction(payload: dict[str, Any]) -> str:
+    jurisdiction = str(_require(payload, "jurisdiction")).upper()
+    if jurisdiction not in {"US", "UK", "AU"}:
+        raise ServiceError(400, "Unsupported jurisdiction; supported values are US, UK, AU.")
+    return jurisdiction
+
+
+class CheckerService:
+    """Request handlers sharing warm state across calls."""
+
+    def __init__(
+        self,
+        *,
+        cache: HttpCache | None = None,
+        known_lyrics: LyricsIndex | None = None,
+        authority: AuthorityIndex | None = None,
+    ) -> None:
+        self.cache = cache or HttpCache(session=requests.Session())
+        self.known_lyrics = known_lyrics if known_lyrics is not None else KnownLyricsIndex()
+        self.authority = authority
+        self.routes: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {
+            "/rights-check": self.rights_check,
+            "/quote-check": self.quote_check,
+            "/search": self.search,
+            "/evaluate-url": self.evaluate_url,
+        }
+
+    def handle(self, path: str, payload: dict[str, Any]) -> dict[str, Any]:
+        route = self.routes.get(path)
+        if route is None:
+            raise ServiceError(404, f"Unknown endpoint: {path}")
+        return route(payload)
+
+    def rights_check(self, payload: dict[str, Any]) -> dict[str, Any]:
+        jurisdiction = _jurisdiction(payload)
+        result = check_lyrics_rights(
+            jurisdiction=jurisdiction,
+            publication_year=_number(payload, "publication_year", int),
+            lyricist_death_year=_number(payload, "lyricist_death_year", int),
+            renewal_status=_renewal_status(payload),
+        )
+        return rights_record(result, jurisdiction)
+
+    def quote_check(self, payload: dict[str, Any]) -> dict[str, Any]:
+        excerpt = str(_require(payload, "excerpt"))
+        extra = _strings(payload, "known_lyrics")
+        known_lyrics = KnownLyricsIndex(extra) if extra else self.known_lyrics
+        result = check_quote_safety(
+            excerpt,
+            known_lyrics=known_lyrics,
+            max_words=_number(payload, "max_words", int, 90),
+            max_lines=_number(payload, "max_lines", int, 4),
+        )
+        return check_result_record(result)
+
+    def search(self, payload: dict[str, Any]) -> dict[str, Any]:
+        query = str(_require(payload, "query"))
+        jurisdiction = _jurisdiction(payload)
+        sources = _sources(payload)
+
+        candidates = search_candidates(
+            query,
+            sources=sources,
+            max_results=_number(payload, "max_results", int, 10),
+            cache=self.cache,
+            strict=_flag(payload, "strict"),
+            # Like the CLI's --first: stop at the first definitive verdict and
+            # skip enriching hits whose search metadata already settles it.
+            jurisdiction=jurisdiction if _flag(payload, "first") else None,
+            deadline=_number(payload, "deadline", float),
+            authority=self.authority,
+        )
+        return {
+            "candidates": [
+                candidate_record(candidate, evaluate_candidate(candidate, jurisdiction))
+                for candidate in candidates
+            ],
+            "partial": candidates.partial,
+        }
+
+    def evaluate_url(self, payload: dict[str, Any]) -> dict[str, Any]:
+        url = str(_require(payload, "url"))
+        rights, evaluation = evaluate_url(url, _jurisdiction(payload), cache=self.cache, authority=self.authority)
+        return url_evaluation_record(url, rights, evaluation)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "ServiceServer"
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+            return
+        if self.path == "/metrics":
+            self._send_text(200, METRICS.render_prometheus(), "text/plain; version=0.0.4")
+            return
+        self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+
+    def do_POST(self) -> None:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length > MAX_BODY_BYTES:
+                raise ServiceError(413, "Request body too large.")
+            raw = self.rfile.read(length) if length else b"{}"
+            try:
+                payload = json.loads(raw)
+            except ValueError as exc:
+                raise ServiceError(400, f"Invalid JSON body: {exc}") from exc
+            if not isinstance(payload, dict):
+                raise ServiceError(400, "JSON body must be an object.")
+            # Only known routes become label values; clients choose the path.
+            endpoint = self.path if self.path in self.server.service.routes else "other"
+            with METRICS.span("request", endpoint=endpoint):
+                body = self.server.service.handle(self.path, payload)
+            self._send_json(200, body)
+        except ServiceError as exc:
+            self._send_json(exc.status, {"error": str(exc)})
+        except requests.RequestException as exc:
+            self._send_json(502, {"error": f"Upstream request failed: {exc}"})
+        except Exception as exc:  # pragma: no cover - defensive
+            self._send_json(500, {"error": f"Internal error: {exc}"})
+
+    def _send_json(self, status: int, body: dict[str, Any]) -> None:
+        self._send_text(status, dumps(body), "application/json")
+
+    def _send_text(self, status: int, text: str, content_type: str) -> None:
+        encoded = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ServiceServer(HTTPServer):
+    """HTTP server dispatching requests onto a bounded worker pool.
+
+    At most ``workers`` requests run at once and up to ``queue_size`` more wait
+    for a free worker; anything beyond that is answered with HTTP 503.
+    """
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        service: CheckerService,
+        *,
+        workers: int = DEFAULT_WORKERS,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        verbose: bool = False,
+    ) -> None:
+        super().__init__(address, _Handler)
+        self.service = service
+        self.verbose = verbose
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="safe-lyrics-worker")
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+
+    def process_request(self, request, client_address) -> None:
+        if not self._slots.acquire(blocking=False):
+            try:
+                request.sendall(_BUSY_RESPONSE)
+            finally:
+                self.shutdown_request(request)
+            return
+        self._pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._pool.shutdown(wait=True)
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    *,
+    service: CheckerService | None = None,
+    workers: int = DEFAULT_WORKERS,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    verbose: bool = False,
+) -> None:
+    server = ServiceServer(
+        (host, port),
+        service or CheckerService(),
+        workers=workers,
+        queue_size=queue_size,
+        verbose=verbose,
+    )
+    bound_host, bound_port = server.server_address[:2]
+    print(f"Serving safe-lyrics-checker on http://{bound_host}:{bound_port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -1,3 +1,10 @@
-from .evaluator import evaluate_url
+from importlib import import_module
 
 __all__ = ["evaluate_url"]
+
+
+def __getattr__(name: str):
+    # The evaluator imports ``requests``; defer it until actually requested.
+    if name == "evaluate_url":
+        return import_module(".evaluator", __name__).evaluate_url
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
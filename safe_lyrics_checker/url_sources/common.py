@@ -4,6 +4,7 @@ import html
 import re
 from typing import Optional
 
+from ..metrics import METRICS
 from .models import UrlMetadata
 
 PUBLICATION_RE = re.compile(r"(?:published|publication|release date|copyright)\D{0,25}(1[5-9]\d{2}|20\d{2})", re.IGNORECASE)
@@ -27,12 +28,14 @@ def extract_title(raw_html: str) -> Optional[str]:
 
 
 def extract_metadata_generic(raw_html: str) -> UrlMetadata:
-    text = html_to_text(raw_html)
-    publication = PUBLICATION_RE.search(text)
-
-    death = DEATH_RE.search(text)
-    renewal = RENEWAL_RE.search(text)
-    lyricist = BY_RE.search(text)
+    with METRICS.span("parse"):
+        text = html_to_text(raw_html)
+
+    with METRICS.span("extract"):
+        publication = PUBLICATION_RE.search(text)
+        death = DEATH_RE.search(text)
+        renewal = RENEWAL_RE.search(text)
+        lyricist = BY_RE.search(text)
 
     return UrlMetadata(
         title=extract_title(raw_html),
@@ -1,93 +1,185 @@
 from __future__ import annotations
 
+from dataclasses import replace
+from typing import NamedTuple, Optional
 from urllib.parse import urlparse
 
 import requests
 
-from ..http_cache import HttpCache
-from ..rights_engine import RightsResult, check_lyrics_rights
-from . import archive, cpdl, gutenberg, imslp, loc
+from ..authority import AuthorityIndex, fill_url_metadata
+from ..http_cache import HttpCache, UnusableResponseError, is_challenge_page
+from ..metrics import METRICS
+from ..rights_engine import RightsResult, RightsStatus, check_lyrics_rights
+from ..search_sources.registry import SOURCES
 from .common import extract_metadata_generic, has_sufficient_metadata
-from .models import UrlEvaluation
+from .models import UrlEvaluation, UrlMetadata
 
-ADAPTERS = {
-    "imslp.org": imslp.extract_metadata,
-    "cpdl.org": cpdl.extract_metadata,
-    "gutenberg.org": gutenberg.extract_metadata,
-    "archive.org": archive.extract_metadata,
-    "loc.gov": loc.extract_metadata,
-}
+ANTIBOT_WARNING = "Blocked by anti-bot protection (Cloudflare/captcha)"
 
-CLOUDFLARE_MARKERS = (
-    "cloudflare",
-    "attention required",
-    "captcha",
-    "access denied",
-)
+
+class RawPage(NamedTuple):
+    """A fetched evidence page left for :func:`extract_evidence` to parse.
+
+    ``record`` is the structured record's metadata when the catalog has one
+    too sparse for a definitive verdict; the page only fills its gaps.
+    """
+
+    body: str
+    record: Optional[UrlMetadata] = None
 
 
 def _hostname(url: str) -> str:
     return (urlparse(url).hostname or "").lower()
 
 
+def _find_spec(url: str):
+    spec = SOURCES.for_host(_hostname(url))
+    return spec if getattr(spec, "adapter", None) is not None else None
+
+
 def _find_adapter(url: str):
-    host = _hostname(url)
-    for domain, adapter in ADAPTERS.items():
-        if host == domain or host.endswith(f".{domain}"):
-            return adapter
-    return extract_metadata_generic
+    spec = _find_spec(url)
+    return spec.adapter if spec is not None else extract_metadata_generic
+
+
+def _structured_metadata(url: str, cache: HttpCache) -> UrlMetadata | None:
+    spec = _find_spec(url)
+    fetch_record = getattr(spec, "structured_record", None)
+    if fetch_record is None:
+        return None
+    structured = fetch_record(url, cache)
+    if structured is None:
+        return None
+    record = structured[1]
+    metadata = UrlMetadata(
+        title=record.title or None,
+        lyricist_or_composer=record.lyricist or record.composer,
+        publication_year=record.publication_year,
+        lyricist_death_year=record.lyricist_death_year,
+        renewal_status=record.renewal_status,
+    )
+    return metadata if has_sufficient_metadata(metadata) else None
+
+
+def _fill_gaps(record: UrlMetadata, page: UrlMetadata) -> UrlMetadata:
+    return replace(
+        record,
+        title=record.title or page.title,
+        lyricist_or_composer=record.lyricist_or_composer or page.lyricist_or_composer,
+        publication_year=record.publication_year if record.publication_year is not None else page.publication_year,
+        lyricist_death_year=(
+            record.lyricist_death_year if record.lyricist_death_year is not None else page.lyricist_death_year
+        ),
+        renewal_status=record.renewal_status if record.renewal_status != "unknown" else page.renewal_status,
+    )
 
 
 def _is_antibot_page(raw_html: str) -> bool:
-    lowered = raw_html.lower()
-    return any(marker in lowered for marker in CLOUDFLARE_MARKERS)
+    return is_challenge_page(raw_html)
+
+
+def _unknown(
+    jurisdiction: str, warning: str | None = None, metadata: UrlMetadata | None = None
+) -> tuple[RightsResult, UrlEvaluation]:
+    return (
+        check_lyrics_rights(jurisdiction=jurisdiction, publication_year=None, lyricist_death_year=None, renewal_status="unknown"),
+        UrlEvaluation(metadata=metadata or extract_metadata_generic(""), warning=warning),
+    )
+
+
+def fetch_evidence(
+    url: str, jurisdiction: str, cache: HttpCache, authority: AuthorityIndex | None = None
+) -> tuple[RightsResult, UrlEvaluation] | RawPage:
+    """I/O stage of :func:`evaluate_url`.
 
+    Returns the final result when the fetch alone settles it (a structured
+    record with a SAFE/NOT_SAFE verdict, network error), otherwise the
+    :class:`RawPage` for :func:`extract_evidence`.
+    """
 
-def evaluate_url(url: str, jurisdiction: str, *, cache: HttpCache | None = None) -> tuple[RightsResult, UrlEvaluation]:
-    cache = cache or HttpCache()
+    host = _hostname(url)
+    with METRICS.span("structured", host=host):
+        record = _structured_metadata(url, cache)
+    if record is not None:
+        record = fill_url_metadata(record, authority)
+        settled = _evaluate_metadata(record, jurisdiction, host)
+        if settled[0].status is not RightsStatus.UNKNOWN:
+            return settled
 
     try:
-        raw_html = cache.get_text(url)
-    except requests.Timeout:
-        return (
-            check_lyrics_rights(jurisdiction=jurisdiction, publication_year=None, lyricist_death_year=None, renewal_status="unknown"),
-            UrlEvaluation(metadata=extract_metadata_generic(""), warning="Request timed out"),
-        )
-    except requests.HTTPError as exc:
+        return RawPage(cache.get_text(url), record)
+    except requests.RequestException as exc:
+        if record is not None:
+            # The record alone still beats a fetch error.
+            return _evaluate_metadata(record, jurisdiction, host)
+        return _fetch_failure(exc, jurisdiction)
+
+
+def _fetch_failure(exc: requests.RequestException, jurisdiction: str) -> tuple[RightsResult, UrlEvaluation]:
+    if isinstance(exc, UnusableResponseError):
+        if exc.kind == "challenge":
+            return _unknown(jurisdiction, ANTIBOT_WARNING)
+        return _unknown(jurisdiction, f"Evidence URL is not an HTML page ({exc.detail})")
+    if isinstance(exc, requests.Timeout):
+        return _unknown(jurisdiction, "Request timed out")
+    if isinstance(exc, requests.HTTPError):
         code = getattr(getattr(exc, "response", None), "status_code", None)
         if code == 403:
-            warning = "Received HTTP 403 (possible anti-bot protection)"
-        else:
-            warning = f"HTTP error while fetching evidence URL ({code or 'unknown'})"
-        return (
-            check_lyrics_rights(jurisdiction=jurisdiction, publication_year=None, lyricist_death_year=None, renewal_status="unknown"),
-            UrlEvaluation(metadata=extract_metadata_generic(""), warning=warning),
-        )
-    except requests.RequestException as exc:
-        return (
-            check_lyrics_rights(jurisdiction=jurisdiction, publication_year=None, lyricist_death_year=None, renewal_status="unknown"),
-            UrlEvaluation(metadata=extract_metadata_generic(""), warning=f"Network error: {exc}"),
-        )
+            return _unknown(jurisdiction, "Received HTTP 403 (possible anti-bot protection)")
+        return _unknown(jurisdiction, f"HTTP error while fetching evidence URL ({code or 'unknown'})")
+    return _unknown(jurisdiction, f"Network error: {exc}")
+
 
+def extract_evidence(
+    url: str,
+    raw_html: str,
+    jurisdiction: str,
+    authority: AuthorityIndex | None = None,
+    record: UrlMetadata | None = None,
+) -> tuple[RightsResult, UrlEvaluation]:
+    """CPU stage of :func:`evaluate_url`: parse fetched HTML and check rights.
+
+    ``record`` (see :class:`RawPage`) wins over the page for every field it
+    has. ``authority`` fills in the named person's death year when neither has one.
+    """
+
+    host = _hostname(url)
     if _is_antibot_page(raw_html):
-        return (
-            check_lyrics_rights(jurisdiction=jurisdiction, publication_year=None, lyricist_death_year=None, renewal_status="unknown"),
-            UrlEvaluation(metadata=extract_metadata_generic(""), warning="Blocked by anti-bot protection (Cloudflare/captcha)"),
-        )
+        if record is not None:
+            return _evaluate_metadata(fill_url_metadata(record, authority), jurisdiction, host)
+        return _unknown(jurisdiction, ANTIBOT_WARNING)
 
     adapter = _find_adapter(url)
-    metadata = adapter(raw_html)
+    with METRICS.span("adapter", host=host):
+        metadata = adapter(raw_html)
+    if record is not None:
+        metadata = _fill_gaps(record, metadata)
 
     if not has_sufficient_metadata(metadata):
-        return (
-            check_lyrics_rights(jurisdiction=jurisdiction, publication_year=None, lyricist_death_year=None, renewal_status="unknown"),
-            UrlEvaluation(metadata=metadata),
+        return _unknown(jurisdiction, metadata=metadata)
+
+    return _evaluate_metadata(fill_url_metadata(metadata, authority), jurisdiction, host)
+
+
+def evaluate_url(
+    url: str,
+    jurisdiction: str,
+    *,
+    cache: HttpCache | None = None,
+    authority: AuthorityIndex | None = None,
+) -> tuple[RightsResult, UrlEvaluation]:
+    fetched = fetch_evidence(url, jurisdiction, cache or HttpCache(), authority)
+    if isinstance(fetched, RawPage):
+        return extract_evidence(url, fetched.body, jurisdiction, authority, fetched.record)
+    return fetched
+
+
+def _evaluate_metadata(metadata: UrlMetadata, jurisdiction: str, host: str) -> tuple[RightsResult, UrlEvaluation]:
+    with METRICS.span("evaluate", host=host):
+        rights = check_lyrics_rights(
+            jurisdiction=jurisdiction,
+            publication_year=metadata.publication_year,
+            lyricist_death_year=metadata.lyricist_death_year,
+            renewal_status=metadata.renewal_status,
         )
-
-    rights = check_lyrics_rights(
-        jurisdiction=jurisdiction,
-        publication_year=metadata.publication_year,
-        lyricist_death_year=metadata.lyricist_death_year,
-        renewal_status=metadata.renewal_status,
-    )
     return rights, UrlEvaluation(metadata=metadata)
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
 from typing import Optional
 
+from ..search_sources.models import SLOTS
 
-@dataclass
+
+@dataclass(**SLOTS)
 class UrlMetadata:
     title: Optional[str] = None
     lyricist_or_composer: Optional[str] = None
@@ -12,8 +15,11 @@ class UrlMetadata:
     lyricist_death_year: Optional[int] = None
     renewal_status: str = "unknown"
 
+    def __post_init__(self) -> None:
+        self.renewal_status = sys.intern(self.renewal_status)
+
 
-@dataclass
+@dataclass(**SLOTS)
 class UrlEvaluation:
     metadata: UrlMetadata
     warning: Optional[str] = None
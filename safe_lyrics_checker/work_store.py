@@ -0,0 +1,163 @@
+"""Persistent store of resolved works shared across queries.
+
+Works are keyed by canonical identity: normalized title plus normalized
+lyricist/composer (see :func:`~safe_lyrics_checker.ranking.work_key`), and by
+every ``(source, work_url)`` they were seen under. The store remembers the
+merged :class:`Candidate` metadata and which works each normalized query
+resolved to; rights verdicts are recomputed from that metadata. Repeat
+queries are answered without any search, and a search hit for an already
+known work skips enrichment, so "Danny Boy" and "Londonderry Air" share one
+lookup of the same IMSLP page.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .ranking import merge_into, normalize_title, work_key
+from .search_sources.models import Candidate
+
+DEFAULT_WORK_STORE_DB = Path(".cache/safe_lyrics_checker_works.sqlite")
+DEFAULT_TTL_SECONDS = 30 * 24 * 60 * 60
+
+
+def _sources_key(sources: Iterable[str]) -> str:
+    return ",".join(sorted(sources))
+
+
+class WorkStore:
+    def __init__(self, db_path: Path = DEFAULT_WORK_STORE_DB, ttl_seconds: int = DEFAULT_TTL_SECONDS) -> None:
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_db(self) -> None:
+        with self._connect() as conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS works (
+                    id INTEGER PRIMARY KEY,
+                    title_key TEXT NOT NULL,
+                    person_key TEXT NOT NULL,
+                    candidate TEXT NOT NULL,
+                    updated_at INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS works_title ON works (title_key, person_key);
+                CREATE TABLE IF NOT EXISTS work_sources (
+                    source TEXT NOT NULL,
+                    work_url TEXT NOT NULL,
+                    work_id INTEGER NOT NULL REFERENCES works (id),
+                    PRIMARY KEY (source, work_url)
+                );
+                CREATE TABLE IF NOT EXISTS work_queries (
+                    query_key TEXT NOT NULL,
+                    sources TEXT NOT NULL,
+                    rank INTEGER NOT NULL,
+                    work_id INTEGER NOT NULL REFERENCES works (id),
+                    PRIMARY KEY (query_key, sources, rank)
+                );
+                """
+            )
+
+    def _fresh_after(self) -> int:
+        return int(time.time()) - self.ttl_seconds
+
+    def _find_id(self, conn: sqlite3.Connection, candidate: Candidate) -> Optional[int]:
+        row = conn.execute(
+            "SELECT work_id FROM work_sources WHERE source = ? AND work_url = ?",
+            (candidate.source, candidate.work_url),
+        ).fetchone()
+        if row is not None:
+            return int(row[0])
+        title_key, person_key = work_key(candidate)
+        if not person_key:
+            # Across queries only a named person is trusted as identity; a
+            # title and year alone (see ranking.find_duplicate) are too weak.
+            return None
+        row = conn.execute(
+            "SELECT id FROM works WHERE title_key = ? AND person_key = ? ORDER BY id LIMIT 1",
+            (title_key, person_key),
+        ).fetchone()
+        return None if row is None else int(row[0])
+
+    def _load(self, conn: sqlite3.Connection, work_id: int) -> Optional[Candidate]:
+        row = conn.execute(
+            "SELECT candidate FROM works WHERE id = ? AND updated_at >= ?", (work_id, self._fresh_after())
+        ).fetchone()
+        return None if row is None else Candidate(**json.loads(row[0]))
+
+    def _save(self, conn: sqlite3.Connection, candidate: Candidate) -> int:
+        seen_at = (candidate.source, candidate.work_url)
+        work_id = self._find_id(conn, candidate)
+        if work_id is not None:
+            stored = self._load(conn, work_id)
+            if stored is not None:
+                candidate = merge_into(stored, candidate)
+        title_key, person_key = work_key(candidate)
+        values = (title_key, person_key, json.dumps(asdict(candidate)), int(time.time()))
+        if work_id is None:
+            work_id = int(
+                conn.execute(
+                    "INSERT INTO works (title_key, person_key, candidate, updated_at) VALUES (?, ?, ?, ?)", values
+                ).lastrowid
+            )
+        else:
+            conn.execute(
+                "UPDATE works SET title_key = ?, person_key = ?, candidate = ?, updated_at = ? WHERE id = ?",
+                values + (work_id,),
+            )
+        conn.execute(
+            "INSERT OR REPLACE INTO work_sources (source, work_url, work_id) VALUES (?, ?, ?)",
+            (*seen_at, work_id),
+        )
+        return work_id
+
+    def known_work(self, source: str, work_url: str) -> Optional[Candidate]:
+        """Return the stored work last seen at ``work_url`` on ``source``."""
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT work_id FROM work_sources WHERE source = ? AND work_url = ?", (source, work_url)
+            ).fetchone()
+            return None if row is None else self._load(conn, int(row[0]))
+
+    def lookup(self, query: str, sources: Iterable[str]) -> list[Candidate]:
+        """Return the works ``query`` fully resolved to before on ``sources``, best first."""
+
+        with self._connect() as conn:
+            ids = [
+                int(row[0])
+                for row in conn.execute(
+                    "SELECT work_id FROM work_queries WHERE query_key = ? AND sources = ? ORDER BY rank",
+                    (normalize_title(query), _sources_key(sources)),
+                )
+            ]
+            found = [self._load(conn, work_id) for work_id in ids]
+        if any(candidate is None for candidate in found):
+            # Part of the answer expired; searching again beats a partial answer.
+            return []
+        return [candidate for candidate in found if candidate is not None]
+
+    def remember_work(self, candidate: Candidate) -> None:
+        with self._connect() as conn:
+            self._save(conn, candidate)
+
+    def remember_query(self, query: str, sources: Iterable[str], candidates: Iterable[Candidate]) -> None:
+        query_key = normalize_title(query)
+        sources_key = _sources_key(sources)
+        with self._connect() as conn:
+            conn.execute("DELETE FROM work_queries WHERE query_key = ? AND sources = ?", (query_key, sources_key))
+            for rank, candidate in enumerate(candidates):
+                conn.execute(
+                    "INSERT INTO work_queries (query_key, sources, rank, work_id) VALUES (?, ?, ?, ?)",
+                    (query_key, sources_key, rank, self._save(conn, candidate)),
+                )
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from safe_lyrics_checker.authority import AuthorityIndex, fill_candidate, import_authority, normalize_person
+from safe_lyrics_checker.cli import main
+from safe_lyrics_checker.http_cache import HttpCache
+from safe_lyrics_checker.search_engine import iter_candidates
+from safe_lyrics_checker.search_sources.models import Candidate
+from safe_lyrics_checker.url_sources.evaluator import evaluate_url
+
+
+class DummyResponse:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def raise_for_status(self) -> None:
+        return None
+
+
+def _authority(tmp_path: Path) -> AuthorityIndex:
+    dump = tmp_path / "people.csv"
+    dump.write_text(
+        "name,birth_year,death_year,alt_names\n"
+        '"Newton, John, 1725-1807",,,\n'
+        '"Weatherly, Fred E.",1848,1929,Frederic Weatherly|F. E. Weatherly\n'
+        "John Smith,1801,1870,\n"
+        "John Smith,1890,1950,\n"
+        "Zoë Young,1960,,\n"
+        '"Williams, John",1850,1900,\n',
+        encoding="utf-8",
+    )
+    assert import_authority(dump, "csv", tmp_path / "authority.sqlite") == 6
+    return AuthorityIndex(tmp_path / "authority.sqlite")
+
+
+def test_normalize_person_ignores_order_accents_and_dates() -> None:
+    assert normalize_person("Newton, John, 1725-1807") == "john newton"
+    assert normalize_person("John Newton (1725-1807)") == "john newton"
+    assert normalize_person("ZOË  Young") == "zoe young"
+    assert normalize_person("Weatherly, Fred E. (Frederic Edward), 1848-1929") == "fred e weatherly"
+
+
+def test_resolve_is_conservative(tmp_path: Path) -> None:
+    authority = _authority(tmp_path)
+
+    assert authority.death_year("John Newton", 1779) == 1807
+    assert authority.death_year("frederic weatherly", 1913) == 1929
+    # Without a publication year nothing corroborates the name match.
+    assert authority.death_year("John Newton", None) is None
+    # Two different people share the name: refuse to guess...
+    assert authority.death_year("John Smith", 1895) is None
+    # ...unless the publication year rules one of them out.
+    assert authority.death_year("John Smith", 1860) == 1870
+    # Living (or undated) people never get a death year.
+    assert authority.death_year("Zoe Young", 2000) is None
+    assert authority.death_year("Nobody Known", 1900) is None
+
+
+def test_homonym_who_died_long_before_publication_is_not_used(tmp_path: Path) -> None:
+    authority = _authority(tmp_path)
+    candidate = Candidate(
+        title="Theme", source="loc", work_url="https://example.com/theme", lyricist="John Williams", publication_year=1990
+    )
+
+    assert fill_candidate(candidate, authority).lyricist_death_year is None
+    candidate.publication_year = None
+    assert fill_candidate(candidate, authority).lyricist_death_year is None
+    candidate.publication_year = 1885
+    assert fill_candidate(candidate, authority).lyricist_death_year == 1900
+
+
+def test_search_skips_enrichment_once_authority_settles_the_verdict(monkeypatch, tmp_path: Path) -> None:
+    item_url = "https://www.loc.gov/item/2009/"
+    responses = {
+        "https://www.loc.gov/search/?q=danny+boy&fo=json&c=5": json.dumps(
+            {"results": [{"title": "Danny boy", "url": item_url, "date": "1913", "contributor_names": ["Weatherly, Fred E."]}]}
+        ),
+    }
+    fetched: list[str] = []
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        fetched.append(url)
+        return DummyResponse(responses[url])
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    candidates = list(
+        iter_candidates(
+            "danny boy",
+            sources=["loc"],
+            max_results=5,
+            cache=HttpCache(db_path=tmp_path / "cache.sqlite"),
+            jurisdiction="UK",
+            authority=_authority(tmp_path),
+        )
+    )
+
+    assert [c.lyricist_death_year for c in candidates] == [1929]
+    assert fetched == ["https://www.loc.gov/search/?q=danny+boy&fo=json&c=5"]
+
+
+def test_evaluate_url_uses_authority_for_life_plus_70(monkeypatch, tmp_path: Path, capsys) -> None:
+    body = "<html><title>Amazing Grace</title><body>Lyrics by John Newton. Published 1779.</body></html>"
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        return DummyResponse(body)
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    cache = HttpCache(db_path=tmp_path / "cache.sqlite")
+    url = "https://example.com/amazing-grace"
+
+    assert evaluate_url(url, "UK", cache=cache)[0].status.value == "UNKNOWN"
+    rights, evaluation = evaluate_url(url, "UK", cache=cache, authority=_authority(tmp_path))
+    assert rights.status.value == "SAFE"
+    assert evaluation.metadata.lyricist_death_year == 1807
+
+    monkeypatch.chdir(tmp_path)
+    assert main(["evaluate-url", "--jurisdiction", "UK", url, "--authority-db", "authority.sqlite"]) == 0
+    assert "Lyricist death year: 1807" in capsys.readouterr().out
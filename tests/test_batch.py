@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import requests
+
+from safe_lyrics_checker.batch import evaluate_urls
+from safe_lyrics_checker.cache_backends import BackendError
+from safe_lyrics_checker.cli import main
+from safe_lyrics_checker.http_archive import HttpArchive
+from safe_lyrics_checker.http_cache import HttpCache
+from safe_lyrics_checker.metrics import METRICS
+
+
+class DummyResponse:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def raise_for_status(self) -> None:
+        return None
+
+
+PAGES = {
+    "https://example.org/old": "<title>Old Hymn</title> Lyrics by John Newton. died 1807. Published 1920.",
+    "https://example.org/new": "<title>New Song</title> Lyrics by Jane Doe. died 2010. Published 2001.",
+    "https://example.org/empty": "<title>Nothing here</title>",
+}
+
+
+def _fake_network(monkeypatch) -> None:
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        if url not in PAGES:
+            response = requests.Response()
+            response.status_code = 403
+            raise requests.HTTPError(response=response)
+        return DummyResponse(PAGES[url])
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+
+
+def test_evaluate_urls_process_pool_keeps_input_order(monkeypatch, tmp_path: Path) -> None:
+    _fake_network(monkeypatch)
+    urls = [*PAGES, "https://example.org/blocked"]
+    METRICS.reset()
+
+    results = list(
+        evaluate_urls(urls, "US", cache=HttpCache(db_path=tmp_path / "cache.sqlite"), workers=2, queue_size=2)
+    )
+
+    assert [url for url, _, _ in results] == urls
+    assert [rights.status.value for _, rights, _ in results] == ["SAFE", "NOT_SAFE", "UNKNOWN", "UNKNOWN"]
+    assert results[0][2].metadata.title == "Old Hymn"
+    assert results[3][2].warning == "Received HTTP 403 (possible anti-bot protection)"
+    # The adapter runs in the worker processes; their spans reach the parent.
+    adapter_runs = sum(span["count"] for span in METRICS.snapshot()["spans"] if span["stage"] == "adapter")
+    assert adapter_runs == len(PAGES)
+
+
+def test_workers_never_parse_a_stored_copy_other_than_the_fetched_body(monkeypatch, tmp_path: Path) -> None:
+    _fake_network(monkeypatch)
+    cache = HttpCache(db_path=tmp_path / "cache.sqlite", ttl_seconds=60)
+    url = "https://example.org/new"
+    cache.backend.set(url, 0, "<title>Old</title> Lyrics by John Newton. died 1807. Published 1920.")
+
+    def store_down(*args) -> None:
+        raise BackendError("store down")
+
+    monkeypatch.setattr(cache.backend, "set", store_down)
+
+    [(_, rights, evaluation)] = list(evaluate_urls([url], "US", cache=cache, workers=1))
+
+    assert evaluation.metadata.title == "New Song"
+    assert rights.status.value == "NOT_SAFE"
+
+
+def test_replayed_batches_parse_the_replayed_body(tmp_path: Path) -> None:
+    url = "https://example.org/new"
+    archive = HttpArchive(tmp_path / "session.sqlite")
+    archive.record(url, status=200, body=PAGES[url], elapsed=0.0)
+    cache = HttpCache(db_path=tmp_path / "cache.sqlite", replay=archive)
+    cache.backend.set(url, 2**31, "<title>Old</title> Lyrics by John Newton. died 1807. Published 1920.")
+
+    [(_, rights, evaluation)] = list(evaluate_urls([url], "US", cache=cache, workers=2))
+
+    assert evaluation.metadata.title == "New Song"
+    assert rights.status.value == "NOT_SAFE"
+
+
+def test_cli_evaluate_urls_in_thread_mode(monkeypatch, tmp_path: Path, capsys) -> None:
+    _fake_network(monkeypatch)
+    monkeypatch.chdir(tmp_path)
+    urls_file = tmp_path / "urls.txt"
+    urls_file.write_text("\n".join(PAGES) + "\n", encoding="utf-8")
+
+    exit_code = main(["evaluate-urls", "--jurisdiction", "US", str(urls_file), "--workers", "0", "--format", "jsonl"])
+
+    lines = capsys.readouterr().out.splitlines()
+    assert exit_code == 0
+    assert len(lines) == 3
+    assert '"evidence_url":"https://example.org/old"' in lines[0]
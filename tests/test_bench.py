@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from safe_lyrics_checker.bench import (
+    SEARCH_QUERY,
+    BenchContext,
+    StubCatalogServer,
+    builtin_pages,
+    compare_results,
+    load_fixture_pages,
+    run_benchmarks,
+)
+from safe_lyrics_checker.cli import main
+from safe_lyrics_checker.http_cache import HttpCache
+from safe_lyrics_checker.search_engine import search_candidates
+
+FIXTURES = Path(__file__).resolve().parents[1] / "benchmarks" / "fixtures"
+
+
+def test_bench_runs_against_checked_in_fixtures(tmp_path: Path) -> None:
+    output = tmp_path / "results.json"
+    code = main([
+        "bench",
+        "--only",
+        "quote_check,extract_metadata,search",
+        "--corpus-sizes",
+        "100",
+        "--repeat",
+        "1",
+        "--fixtures",
+        str(FIXTURES),
+        "--output",
+        str(output),
+    ])
+
+    document = json.loads(output.read_text(encoding="utf-8"))
+    names = {result["name"] for result in document["results"]}
+    assert code == 0
+    assert {"quote_check_list", "extract_metadata_generic", "search_warm_cache"} <= names
+    assert all(result["seconds_per_op"] > 0 for result in document["results"])
+
+
+def test_compare_results_flags_slowdowns_beyond_threshold() -> None:
+    baseline = {"results": [
+        {"name": "rights_check", "seconds_per_op": 1.0, "params": {}},
+        {"name": "quote_check_list", "seconds_per_op": 1.0, "params": {"corpus_lines": 1000}},
+    ]}
+    current = {"results": [
+        {"name": "rights_check", "seconds_per_op": 1.1, "params": {}},
+        {"name": "quote_check_list", "seconds_per_op": 2.0, "params": {"corpus_lines": 1000}},
+    ]}
+
+    regressions = compare_results(current, baseline, threshold=0.25)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("quote_check_list[corpus_lines=1000]")
+
+
+def test_run_benchmarks_removes_its_scratch_directory(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    ctx = BenchContext(pages=builtin_pages(), repeat=1)
+
+    run_benchmarks(ctx, ["http_cache"])
+
+    assert ctx.workdir is None
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize(
+    ("pages", "sources"),
+    [(builtin_pages(), ["gutenberg", "imslp"]), (load_fixture_pages(FIXTURES), ["gutenberg"])],
+    ids=["builtin", "fixtures"],
+)
+def test_stub_serves_every_request_the_search_makes(tmp_path: Path, pages: dict[str, str], sources: list[str]) -> None:
+    # Structured endpoints included, so the search benchmark times the real
+    # hot path rather than 404s and the HTML fallback.
+    with StubCatalogServer(pages) as server:
+        cache = HttpCache(db_path=tmp_path / "cache.sqlite", session=server.session())
+        candidates = search_candidates(SEARCH_QUERY, sources=sources, max_results=5, cache=cache)
+
+    assert candidates
+    assert server.misses == []
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from safe_lyrics_checker.cache_backends import (
+    CACHE_TOKEN_ENV,
+    BackendError,
+    CacheServer,
+    LmdbBackend,
+    RemoteBackend,
+    SqliteBackend,
+    open_backend,
+)
+from safe_lyrics_checker.http_cache import HttpCache
+from safe_lyrics_checker.metrics import METRICS
+
+
+class DummyResponse:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def raise_for_status(self) -> None:
+        return None
+
+
+TOKEN = "s3cret"
+
+
+@pytest.fixture
+def cache_server(tmp_path: Path):
+    server = CacheServer(("127.0.0.1", 0), SqliteBackend(tmp_path / "shared.sqlite"), token=TOKEN)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_remote_backend_shares_entries_between_caches(monkeypatch, tmp_path: Path, cache_server) -> None:
+    calls = {"count": 0}
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        calls["count"] += 1
+        return DummyResponse("<html>Ünïcode body</html>")
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    url = "https://www.gutenberg.org/ebooks/1"
+    first = HttpCache(db_path=tmp_path / "a.sqlite", backend=RemoteBackend(cache_server.url, token=TOKEN))
+    second = HttpCache(db_path=tmp_path / "b.sqlite", backend=RemoteBackend(cache_server.url, token=TOKEN))
+
+    assert first.get_text(url) == second.get_text(url) == "<html>Ünïcode body</html>"
+    assert calls["count"] == 1
+    assert RemoteBackend(cache_server.url).get("https://example.org/missing") is None
+
+
+@pytest.mark.parametrize("token", [None, "wrong"])
+def test_cache_server_rejects_writes_without_the_token(cache_server, token) -> None:
+    with pytest.raises(BackendError):
+        RemoteBackend(cache_server.url, token=token).set("https://example.org/a", 123, "planted")
+
+    assert cache_server.backend.get("https://example.org/a") is None
+
+
+def test_cache_server_without_a_token_is_read_only(tmp_path: Path) -> None:
+    backend = SqliteBackend(tmp_path / "shared.sqlite")
+    backend.set("https://example.org/a", 123, "body")
+    server = CacheServer(("127.0.0.1", 0), backend)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        remote = RemoteBackend(server.url, token="anything")
+        assert remote.get("https://example.org/a") == (123, "body")
+        with pytest.raises(BackendError):
+            remote.set("https://example.org/a", 456, "planted")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert backend.get("https://example.org/a") == (123, "body")
+
+
+def test_open_backend_reads_the_cache_token_from_the_environment(monkeypatch, cache_server) -> None:
+    monkeypatch.setenv(CACHE_TOKEN_ENV, TOKEN)
+
+    open_backend(cache_server.url).set("https://example.org/a", 123, "body")
+
+    assert cache_server.backend.get("https://example.org/a") == (123, "body")
+
+
+def test_lmdb_backend_round_trip(tmp_path: Path) -> None:
+    pytest.importorskip("lmdb")
+    backend = LmdbBackend(tmp_path / "cache.lmdb")
+
+    backend.set("https://example.org/a", 123, "body")
+
+    assert backend.get("https://example.org/a") == (123, "body")
+    assert backend.get("https://example.org/b") is None
+
+
+def test_open_backend_specs(tmp_path: Path) -> None:
+    assert isinstance(open_backend(f"sqlite:{tmp_path / 'c.sqlite'}"), SqliteBackend)
+    assert isinstance(open_backend("http://127.0.0.1:8766"), RemoteBackend)
+    with pytest.raises(ValueError):
+        open_backend("redis:localhost")
+
+
+def test_cache_server_outage_falls_back_to_origin(monkeypatch, tmp_path: Path, cache_server) -> None:
+    fetched: list[str] = []
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        fetched.append(url)
+        return DummyResponse(f"<html>{url}</html>")
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    METRICS.reset()
+    cache = HttpCache(db_path=tmp_path / "unused.sqlite", backend=RemoteBackend(cache_server.url, token=TOKEN))
+    cache.get_text("https://www.gutenberg.org/ebooks/1")
+
+    cache_server.shutdown()
+    cache_server.server_close()
+
+    assert cache.get_text("https://www.gutenberg.org/ebooks/2") == "<html>https://www.gutenberg.org/ebooks/2</html>"
+    assert fetched == ["https://www.gutenberg.org/ebooks/1", "https://www.gutenberg.org/ebooks/2"]
+    errors = {
+        counter["tags"]["op"]
+        for counter in METRICS.snapshot()["counters"]
+        if counter["name"] == "cache_backend_errors"
+    }
+    assert errors == {"get", "set"}
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+from pathlib import Path
+
+from safe_lyrics_checker.cache_warm import warm_cache
+from safe_lyrics_checker.cli import main
+from safe_lyrics_checker.http_cache import HttpCache
+
+
+class DummyResponse:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def raise_for_status(self) -> None:
+        return None
+
+
+GUTENBERG_RDF = """<?xml version="1.0" encoding="utf-8"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+         xmlns:pgterms="http://www.gutenberg.org/2009/pgterms/"
+         xmlns:dcterms="http://purl.org/dc/terms/">
+  <pgterms:ebook rdf:about="ebooks/123">
+    <dcterms:title>Amazing Grace</dcterms:title>
+    <dcterms:issued>1929</dcterms:issued>
+  </pgterms:ebook>
+</rdf:RDF>
+"""
+
+RESPONSES = {
+    "https://www.gutenberg.org/ebooks/search/?query=amazing+grace": "<a href='/ebooks/123'>Amazing Grace</a>",
+    "https://www.gutenberg.org/ebooks/123.rdf": GUTENBERG_RDF,
+    # The RDF record has no publication year, so the work page is read too.
+    "https://www.gutenberg.org/ebooks/123": "Published 1929.",
+}
+
+
+def _fake_network(monkeypatch) -> list[str]:
+    fetched: list[str] = []
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        fetched.append(url)
+        return DummyResponse(RESPONSES[url])
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    return fetched
+
+
+def test_warm_fetches_search_and_work_pages_once(monkeypatch, tmp_path: Path) -> None:
+    fetched = _fake_network(monkeypatch)
+    cache = HttpCache(db_path=tmp_path / "cache.sqlite")
+
+    first = warm_cache(cache, queries=["amazing grace"], sources=["gutenberg"], rate=0)
+    second = warm_cache(cache, queries=["amazing grace"], sources=["gutenberg"], rate=0)
+
+    assert sorted(fetched) == sorted(RESPONSES)
+    assert (first.fetched, first.failed) == (3, 0)
+    assert second.fetched == 0
+
+
+def test_warm_refreshes_entries_nearing_expiry(monkeypatch, tmp_path: Path) -> None:
+    fetched = _fake_network(monkeypatch)
+    cache = HttpCache(db_path=tmp_path / "cache.sqlite", ttl_seconds=1000)
+    url = "https://www.gutenberg.org/ebooks/123.rdf"
+    cache.get_text(url)
+    with sqlite3.connect(cache.db_path) as conn:
+        conn.execute("UPDATE http_cache SET fetched_at = ?", (int(time.time()) - 950,))
+
+    report = warm_cache(cache, urls=[url], rate=0, refresh_window=100)
+
+    assert report.fetched == 1
+    assert fetched == [url, url]
+
+
+def test_cli_cache_warm(monkeypatch, tmp_path: Path, capsys) -> None:
+    _fake_network(monkeypatch)
+    queries = tmp_path / "queries.txt"
+    queries.write_text("# nightly\namazing grace\n\n", encoding="utf-8")
+
+    exit_code = main(
+        [
+            "cache",
+            "warm",
+            "--queries",
+            str(queries),
+            "--sources",
+            "gutenberg",
+            "--rate",
+            "0",
+            "--cache-db",
+            str(tmp_path / "cache.sqlite"),
+        ]
+    )
+
+    assert exit_code == 0
+    assert "Warmed 1 queries and 0 URLs: 3 fetched, 0 failed." in capsys.readouterr().out
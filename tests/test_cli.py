@@ -20,3 +20,24 @@ def test_quote_check_works_as_secondary_command(capsys) -> None:
     captured = capsys.readouterr()
     assert code == 1
     assert "Result: UNSAFE" in captured.out
+
+
+def test_rights_check_json_output(capsys) -> None:
+    import json
+
+    code = main(["rights-check", "--jurisdiction", "UK", "--lyricist-death-year", "1960", "--format", "json"])
+    record = json.loads(capsys.readouterr().out)
+    assert code == 1
+    assert record["kind"] == "rights"
+    assert record["status"] == "NOT_SAFE"
+    assert record["jurisdiction"] == "UK"
+
+
+def test_quote_check_jsonl_output(capsys) -> None:
+    import json
+
+    code = main(["quote-check", "sunrise over quiet water", "--format", "jsonl"])
+    lines = capsys.readouterr().out.splitlines()
+    assert code == 0
+    assert len(lines) == 1
+    assert json.loads(lines[0])["is_safe"] is True
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import sqlite3
 from pathlib import Path
 
 import requests
 
 from safe_lyrics_checker.cli import main
+from safe_lyrics_checker.http_archive import HttpArchive
 from safe_lyrics_checker.http_cache import HttpCache
 from safe_lyrics_checker.url_sources.evaluator import evaluate_url
 
@@ -27,7 +29,7 @@ def test_evaluate_url_known_domain_extracts_metadata(monkeypatch, tmp_path: Path
     </html>
     """
 
-    def fake_get(url: str, timeout: int = 15, headers=None):
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
         return DummyResponse(body)
 
     monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
@@ -47,7 +49,7 @@ def test_evaluate_url_known_domain_extracts_metadata(monkeypatch, tmp_path: Path
 
 
 def test_evaluate_url_returns_unknown_on_403(monkeypatch, tmp_path: Path, capsys) -> None:
-    def fake_get(url: str, timeout: int = 15, headers=None):
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
         response = requests.Response()
         response.status_code = 403
         response.reason = "Forbidden"
@@ -73,7 +75,7 @@ def test_evaluate_url_returns_unknown_on_403(monkeypatch, tmp_path: Path, capsys
 def test_evaluate_url_unknown_domain_insufficient_metadata(monkeypatch, tmp_path: Path, capsys) -> None:
     body = "<html><title>Example</title><body>No explicit metadata.</body></html>"
 
-    def fake_get(url: str, timeout: int = 15, headers=None):
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
         return DummyResponse(body)
 
     monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
@@ -91,3 +93,149 @@ def test_evaluate_url_unknown_domain_insufficient_metadata(monkeypatch, tmp_path
     assert "Result: UNKNOWN" in captured.out
     assert "Evidence URL: https://example.com/work" in captured.out
     assert "Publication year: UNKNOWN" in captured.out
+
+
+class StreamedResponse:
+    """Streamed response whose body must not be read unless it is usable."""
+
+    def __init__(self, status_code: int, headers: dict[str, str], body: str = "") -> None:
+        self.status_code = status_code
+        self.headers = requests.structures.CaseInsensitiveDict(headers)
+        self.body = body
+        self.read = False
+        self.closed = False
+
+    @property
+    def text(self) -> str:
+        self.read = True
+        return self.body
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(response=self)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_evaluate_url_rejects_blocked_responses_before_reading_or_caching(monkeypatch, tmp_path: Path) -> None:
+    responses = {
+        "https://example.com/challenge": StreamedResponse(
+            403, {"Server": "cloudflare", "cf-mitigated": "challenge", "Content-Type": "text/html"}
+        ),
+        "https://example.com/score.pdf": StreamedResponse(200, {"Content-Type": "application/pdf"}),
+        "https://example.com/interstitial": StreamedResponse(
+            200,
+            {"Content-Type": "text/html; charset=utf-8"},
+            "<html><title>Just a moment...</title>" + "x" * 10_000 + "Published 1920</html>",
+        ),
+    }
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        assert stream is True
+        return responses[url]
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    cache = HttpCache(db_path=tmp_path / "cache.sqlite")
+
+    _, challenge = evaluate_url("https://example.com/challenge", "US", cache=cache)
+    _, pdf = evaluate_url("https://example.com/score.pdf", "US", cache=cache)
+    _, interstitial = evaluate_url("https://example.com/interstitial", "US", cache=cache)
+
+    assert challenge.warning == "Blocked by anti-bot protection (Cloudflare/captcha)"
+    assert pdf.warning == "Evidence URL is not an HTML page (application/pdf)"
+    assert interstitial.warning == "Blocked by anti-bot protection (Cloudflare/captcha)"
+    assert not responses["https://example.com/challenge"].read
+    assert not responses["https://example.com/score.pdf"].read
+    assert all(response.closed for response in responses.values())
+    assert all(cache.backend.get(url) is None for url in responses)
+
+
+def test_recording_archives_blocked_responses_from_headers_only(monkeypatch, tmp_path: Path) -> None:
+    responses = {
+        "https://example.com/challenge": StreamedResponse(
+            403, {"Server": "cloudflare", "cf-mitigated": "challenge", "Content-Type": "text/html"}, "x" * 10_000
+        ),
+        "https://example.com/score.pdf": StreamedResponse(200, {"Content-Type": "application/pdf"}, "%PDF-1.7"),
+    }
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        return responses[url]
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    archive = HttpArchive(tmp_path / "session.sqlite")
+    cache = HttpCache(db_path=tmp_path / "cache.sqlite", recorder=archive)
+
+    recorded = [evaluate_url(url, "US", cache=cache)[1].warning for url in responses]
+
+    assert not any(response.read for response in responses.values())
+    assert len(archive) == 2
+
+    replay = HttpCache(db_path=tmp_path / "replay-cache.sqlite", replay=archive)
+    assert [evaluate_url(url, "US", cache=replay)[1].warning for url in responses] == recorded
+
+
+def test_failed_fetches_are_negatively_cached_per_failure_class(monkeypatch, tmp_path: Path) -> None:
+    calls: list[str] = []
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        calls.append(url)
+        if url.endswith("/slow"):
+            raise requests.Timeout("read timed out")
+        return StreamedResponse(403 if url.endswith("/forbidden") else 404, {"Content-Type": "text/html"})
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    cache = HttpCache(db_path=tmp_path / "cache.sqlite")
+    urls = ["https://example.com/forbidden", "https://example.com/gone", "https://example.com/slow"]
+
+    first = [evaluate_url(url, "US", cache=cache)[1].warning for url in urls]
+    again = [evaluate_url(url, "US", cache=cache)[1].warning for url in urls]
+
+    assert first == again == [
+        "Received HTTP 403 (possible anti-bot protection)",
+        "HTTP error while fetching evidence URL (404)",
+        "Request timed out",
+    ]
+    assert calls == urls
+
+    # Timeouts expire after minutes, 404s only after a day.
+    with sqlite3.connect(cache.db_path) as conn:
+        conn.execute("UPDATE http_cache SET fetched_at = fetched_at - 600")
+    for url in urls:
+        evaluate_url(url, "US", cache=cache)
+    assert calls == urls + ["https://example.com/slow"]
+
+    uncached = HttpCache(db_path=tmp_path / "cache.sqlite", negative_ttls={})
+    evaluate_url("https://example.com/gone", "US", cache=uncached)
+    assert calls[-1] == "https://example.com/gone"
+
+
+def test_pages_that_only_mention_challenge_words_are_kept(monkeypatch, tmp_path: Path) -> None:
+    responses = {
+        "https://example.com/work": StreamedResponse(
+            200,
+            {"Content-Type": "text/html"},
+            "<html><title>Amazing Grace</title><body>Access denied to the manuscript room; no captcha needed. "
+            "Lyrics by John Newton. died 1807. Published 1920. not renewed.</body></html>",
+        ),
+        "https://example.com/record.json": StreamedResponse(
+            200, {"Content-Type": "application/json"}, '{"note": "Attention Required: access denied"}'
+        ),
+        "https://example.com/blocked": StreamedResponse(
+            200, {"Content-Type": "text/html"}, "<html><head><title>Access Denied</title></head></html>"
+        ),
+    }
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        return responses[url]
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    cache = HttpCache(db_path=tmp_path / "cache.sqlite")
+
+    rights, work = evaluate_url("https://example.com/work", "US", cache=cache)
+    _, blocked = evaluate_url("https://example.com/blocked", "US", cache=cache)
+
+    assert rights.status.value == "SAFE"
+    assert work.warning is None
+    assert cache.get_text("https://example.com/record.json").startswith('{"note"')
+    assert blocked.warning == "Blocked by anti-bot protection (Cloudflare/captcha)"
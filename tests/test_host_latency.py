@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+from safe_lyrics_checker.host_latency import HostLatency
+from safe_lyrics_checker.http_cache import HttpCache
+from safe_lyrics_checker.metrics import METRICS
+
+
+class DummyResponse:
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.closed = False
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_timeouts_follow_host_latency() -> None:
+    latency = HostLatency(15, min_samples=5)
+    assert latency.timeouts("fast.example") == (15.0, 15.0)
+    assert latency.hedge_after("fast.example") is None
+
+    for _ in range(20):
+        latency.observe("fast.example", 0.1)
+        latency.observe("slow.example", 12.0)
+
+    assert latency.timeouts("fast.example") == (1.0, 2.0)
+    assert latency.timeouts("slow.example") == (15.0, 36.0)
+    assert latency.hedge_after("fast.example") == 0.1
+
+
+def test_fetches_use_adaptive_timeouts(monkeypatch, tmp_path: Path) -> None:
+    seen: list[tuple[float, float]] = []
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        seen.append(timeout)
+        return DummyResponse("<html></html>")
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    cache = HttpCache(db_path=tmp_path / "cache.sqlite", ttl_seconds=0)
+    for n in range(10):
+        cache.get_text(f"https://fast.example/{n}")
+
+    assert seen[0] == (15, 15)
+    assert seen[-1] == (1.0, 2.0)
+
+
+def test_hedged_request_returns_first_answer(monkeypatch, tmp_path: Path) -> None:
+    calls: list[DummyResponse] = []
+    lock = threading.Lock()
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        with lock:
+            attempt = len(calls)
+            response = DummyResponse("fast" if attempt else "slow")
+            calls.append(response)
+        if attempt == 0:
+            time.sleep(0.5)
+        return response
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    cache = HttpCache(db_path=tmp_path / "cache.sqlite", hedge=True)
+    for _ in range(10):
+        cache.latency.observe("stalls.example", 0.05)
+    METRICS.reset()
+
+    started = time.monotonic()
+    assert cache.get_text("https://stalls.example/work") == "fast"
+    assert time.monotonic() - started < 0.4
+
+    cache.close()
+    assert len(calls) == 2
+    assert calls[0].closed
+    retries = [c for c in METRICS.snapshot()["counters"] if c["name"] == "retries"]
+    assert retries == [{"name": "retries", "tags": {"host": "stalls.example", "reason": "hedge"}, "value": 1}]
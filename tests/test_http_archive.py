@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from safe_lyrics_checker.cli import main
+from safe_lyrics_checker.http_archive import HttpArchive, ReplayMissError
+from safe_lyrics_checker.http_cache import HttpCache
+from safe_lyrics_checker.search_engine import search_candidates
+
+
+class DummyResponse:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def raise_for_status(self) -> None:
+        return None
+
+
+RESPONSES = {
+    "https://www.gutenberg.org/ebooks/search/?query=amazing+grace": "<a href='/ebooks/123'>Amazing Grace</a>",
+    "https://www.gutenberg.org/ebooks/123": "Published 1929. lyricist died 1950. not renewed.",
+}
+
+
+def _record_session(monkeypatch, archive_path: Path, cache_path: Path) -> None:
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        return DummyResponse(RESPONSES[url])
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    cache = HttpCache(db_path=cache_path, recorder=HttpArchive(archive_path))
+    search_candidates("amazing grace", sources=["gutenberg"], max_results=5, cache=cache)
+
+
+def _no_network(url: str, timeout: int = 15, headers=None, stream=False):
+    raise AssertionError(f"network access during replay: {url}")
+
+
+def test_replay_serves_recorded_responses_without_network(monkeypatch, tmp_path: Path) -> None:
+    archive_path = tmp_path / "session.sqlite"
+    _record_session(monkeypatch, archive_path, tmp_path / "record-cache.sqlite")
+    assert len(HttpArchive(archive_path)) == 2
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", _no_network)
+    cache = HttpCache(db_path=tmp_path / "replay-cache.sqlite", replay=HttpArchive(archive_path))
+    candidates = search_candidates("amazing grace", sources=["gutenberg"], max_results=5, cache=cache)
+
+    assert len(candidates) == 1
+    assert candidates[0].publication_year == 1929
+    assert candidates[0].renewal_status == "not_renewed"
+
+
+def test_replay_miss_raises(tmp_path: Path) -> None:
+    cache = HttpCache(db_path=tmp_path / "cache.sqlite", replay=HttpArchive(tmp_path / "empty.sqlite"))
+
+    with pytest.raises(ReplayMissError):
+        cache.get_text("https://www.gutenberg.org/ebooks/999")
+
+
+def test_cli_replay_flag(monkeypatch, tmp_path: Path, capsys) -> None:
+    archive_path = tmp_path / "session.sqlite"
+    _record_session(monkeypatch, archive_path, tmp_path / "record-cache.sqlite")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", _no_network)
+
+    exit_code = main(
+        ["--replay", str(archive_path), "search", "amazing grace", "--jurisdiction", "US", "--sources", "gutenberg"]
+    )
+
+    assert exit_code == 0
+    assert "Amazing Grace" in capsys.readouterr().out
+
+
+def test_replaying_twice_bypasses_the_cache(monkeypatch, tmp_path: Path) -> None:
+    archive_path = tmp_path / "session.sqlite"
+    _record_session(monkeypatch, archive_path, tmp_path / "record-cache.sqlite")
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", _no_network)
+    replayed: list[str] = []
+    archive = HttpArchive(archive_path)
+    original = archive.replay
+    monkeypatch.setattr(archive, "replay", lambda url: replayed.append(url) or original(url))
+    cache_path = tmp_path / "replay-cache.sqlite"
+
+    for _ in range(2):
+        cache = HttpCache(db_path=cache_path, replay=archive)
+        search_candidates("amazing grace", sources=["gutenberg"], max_results=5, cache=cache)
+
+    # The second run replays exactly what the first did instead of hitting a cache.
+    assert replayed[: len(replayed) // 2] == replayed[len(replayed) // 2 :]
+    assert "https://www.gutenberg.org/ebooks/123" in replayed[len(replayed) // 2 :]
+    assert HttpCache(db_path=cache_path).backend.get("https://www.gutenberg.org/ebooks/123") is None
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from safe_lyrics_checker.cli import main
+from safe_lyrics_checker.search_engine import search_candidates
+from safe_lyrics_checker.search_sources.local_catalog import CatalogIndex, LocalCatalogSource, import_catalog
+
+GUTENBERG_RDF = """<?xml version="1.0" encoding="utf-8"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+         xmlns:pgterms="http://www.gutenberg.org/2009/pgterms/"
+         xmlns:dcterms="http://purl.org/dc/terms/">
+  <pgterms:ebook rdf:about="ebooks/4242">
+    <dcterms:title>Olney Hymns: Amazing Grace</dcterms:title>
+    <dcterms:issued>1925-03-01</dcterms:issued>
+    <dcterms:creator>
+      <pgterms:agent rdf:about="2009/agents/99">
+        <pgterms:name>Newton, John</pgterms:name>
+        <pgterms:birthdate>1725</pgterms:birthdate>
+        <pgterms:deathdate>1807</pgterms:deathdate>
+      </pgterms:agent>
+    </dcterms:creator>
+  </pgterms:ebook>
+</rdf:RDF>
+"""
+
+LOC_RESULTS = {
+    "results": [
+        {
+            "title": "Danny boy",
+            "url": "https://www.loc.gov/item/2009/",
+            "date": "1913",
+            "contributor_names": ["Weatherly, Fred E. (Frederic Edward), 1848-1929"],
+        },
+        {"title": "Untitled record without a URL"},
+    ]
+}
+
+
+def test_import_gutenberg_rdf_and_search_offline(monkeypatch, tmp_path: Path) -> None:
+    rdf_path = tmp_path / "pg4242.rdf"
+    rdf_path.write_text(GUTENBERG_RDF, encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("local source must not touch the network")
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", no_network)
+
+    exit_code = main(["import-catalog", str(rdf_path), "--format", "gutenberg-rdf"])
+    candidates = search_candidates("amazing grace", sources=["local"], max_results=5)
+
+    assert exit_code == 0
+    assert len(candidates) == 1
+    candidate = candidates[0]
+    assert candidate.source == "gutenberg"
+    assert candidate.work_url == "https://www.gutenberg.org/ebooks/4242"
+    assert candidate.lyricist == "Newton, John"
+    # dcterms:issued is the ebook release date, not the work's publication.
+    assert candidate.publication_year is None
+    assert candidate.lyricist_death_year == 1807
+
+
+def test_import_loc_json_reads_death_year_from_name_heading(tmp_path: Path) -> None:
+    dump = tmp_path / "loc.json"
+    dump.write_text(json.dumps(LOC_RESULTS), encoding="utf-8")
+    db_path = tmp_path / "catalog.sqlite"
+
+    assert import_catalog(dump, "loc-json", db_path) == 1
+    assert import_catalog(dump, "loc-json", db_path) == 1
+
+    candidates = CatalogIndex(db_path).search("Danny Boy")
+    assert len(candidates) == 1
+    assert candidates[0].publication_year == 1913
+    assert candidates[0].lyricist_death_year == 1929
+
+
+def test_local_source_without_index_returns_nothing(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    assert search_candidates("amazing grace", sources=["local"], max_results=5) == []
+
+
+def test_import_loc_json_sniffs_arrays_and_pretty_printed_documents(tmp_path: Path) -> None:
+    array = tmp_path / "array.json"
+    array.write_text(json.dumps(LOC_RESULTS["results"]), encoding="utf-8")
+    pretty = tmp_path / "pretty.json"
+    pretty.write_text("\n  " + json.dumps(LOC_RESULTS, indent=2), encoding="utf-8")
+    lines = tmp_path / "lines.json"
+    lines.write_text("".join(json.dumps(item) + "\n" for item in LOC_RESULTS["results"]), encoding="utf-8")
+
+    for dump in (array, pretty, lines):
+        assert import_catalog(dump, "loc-json", tmp_path / f"{dump.stem}.sqlite") == 1
+
+
+def test_catalog_env_var_is_shared_by_import_and_search(monkeypatch, tmp_path: Path) -> None:
+    dump = tmp_path / "loc.json"
+    dump.write_text(json.dumps(LOC_RESULTS), encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("SAFE_LYRICS_CHECKER_CATALOG", str(tmp_path / "elsewhere.sqlite"))
+
+    assert main(["import-catalog", str(dump), "--format", "loc-json"]) == 0
+    source = LocalCatalogSource()
+    assert [c.title for c in source.search("danny boy")] == ["Danny boy"]
+    index = source._index
+    source.search("danny boy")
+    assert source._index is index
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from safe_lyrics_checker.cli import main
+from safe_lyrics_checker.metrics import METRICS, Metrics
+
+
+class DummyResponse:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def raise_for_status(self) -> None:
+        return None
+
+
+def test_spans_and_counters_render_as_prometheus_text() -> None:
+    metrics = Metrics()
+    with metrics.span("fetch", host="imslp.org"):
+        pass
+    with metrics.span("fetch", host="imslp.org"):
+        pass
+    metrics.incr("cache_hits", host="imslp.org")
+    metrics.incr("bytes_fetched", 512, host='odd"host')
+
+    text = metrics.render_prometheus()
+
+    assert 'safe_lyrics_checker_stage_seconds_count{stage="fetch",host="imslp.org"} 2' in text
+    assert 'safe_lyrics_checker_cache_hits_total{host="imslp.org"} 1' in text
+    assert 'safe_lyrics_checker_bytes_fetched_total{host="odd\\"host"} 512' in text
+    assert metrics.snapshot()["spans"][0]["count"] == 2
+
+
+def test_snapshots_merge_into_another_registry() -> None:
+    worker = Metrics()
+    worker.observe("adapter", 0.5, host="imslp.org")
+    worker.incr("cache_hits", host="imslp.org")
+    parent = Metrics()
+    parent.observe("adapter", 0.25, host="imslp.org")
+
+    parent.merge(worker.snapshot(reset=True))
+
+    assert parent.snapshot()["spans"] == [
+        {"stage": "adapter", "tags": {"host": "imslp.org"}, "count": 2, "total_seconds": 0.75, "max_seconds": 0.5}
+    ]
+    assert parent.snapshot()["counters"] == [{"name": "cache_hits", "tags": {"host": "imslp.org"}, "value": 1}]
+    assert worker.snapshot() == {"spans": [], "counters": []}
+
+
+def test_tag_values_beyond_the_cap_are_folded_into_other(monkeypatch) -> None:
+    monkeypatch.setattr("safe_lyrics_checker.metrics.MAX_TAG_VALUES", 2)
+    metrics = Metrics()
+    for host in ("a.example", "b.example", "c.example", "d.example", "a.example"):
+        metrics.incr("cache_misses", host=host)
+
+    counters = {counter["tags"]["host"]: counter["value"] for counter in metrics.snapshot()["counters"]}
+
+    assert counters == {"a.example": 2, "b.example": 1, "other": 2}
+
+
+def test_profile_flag_prints_stage_breakdown(monkeypatch, tmp_path: Path, capsys) -> None:
+    body = "<html><title>Work</title><body>Published 1920.</body></html>"
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        return DummyResponse(body)
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    monkeypatch.chdir(tmp_path)
+    METRICS.reset()
+
+    main(["--profile", "evaluate-url", "--jurisdiction", "US", "https://imslp.org/wiki/Work"])
+    main(["--profile", "evaluate-url", "--jurisdiction", "US", "https://imslp.org/wiki/Work"])
+
+    err = capsys.readouterr().err
+    assert "Profile (stage breakdown):" in err
+    assert "fetch[host=imslp.org]" in err
+    assert "parse" in err
+    assert "cache_hits[host=imslp.org]" in err
+    assert "cache_misses[host=imslp.org]" in err
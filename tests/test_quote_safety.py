@@ -1,3 +1,5 @@
+import pytest
+
 from safe_lyrics_checker.quote_safety import check_quote_safety
 
 
@@ -28,3 +30,61 @@ def test_known_lyrics_match_violation() -> None:
     )
     assert result.is_safe is False
     assert "known_lyric_match" in result.rule_hits
+
+
+def test_bloom_index_matches_without_loading_corpus(tmp_path) -> None:
+    from safe_lyrics_checker.lyrics_index import BloomLyricsIndex, build_bloom_index
+
+    corpus = tmp_path / "corpus.txt"
+    corpus.write_text(
+        "Hello from the other side\n\n  another   LINE \n" + "".join(f"filler line {i}\n" for i in range(500)),
+        encoding="utf-8",
+    )
+    assert build_bloom_index(corpus, tmp_path / "lyrics") == 502
+
+    index = BloomLyricsIndex(tmp_path / "lyrics")
+    assert len(index) == 502
+    assert "another line" in index
+    assert "filler line 499" in index
+    assert "filler line 500" not in index
+
+    hit = check_quote_safety("hello   from the OTHER side", known_lyrics=index)
+    assert "known_lyric_match" in hit.rule_hits
+    assert check_quote_safety("sunrise over quiet water", known_lyrics=index).is_safe is True
+
+
+def test_compiled_corpus_is_queried_in_place(tmp_path) -> None:
+    from safe_lyrics_checker.lyrics_index import CompiledLyricsIndex, compile_corpus, open_lyrics_index
+
+    corpus = tmp_path / "corpus.txt"
+    corpus.write_text(
+        "Hello from the other side\nhello FROM the other side\nÉté  indien\n"
+        + "".join(f"filler line {i}\n" for i in range(500)),
+        encoding="utf-8",
+    )
+    assert compile_corpus(corpus, tmp_path / "lyrics") == 502
+    assert not (tmp_path / "lyrics.lyrics-build.sqlite").exists()
+
+    index = open_lyrics_index(tmp_path / "lyrics")
+    assert isinstance(index, CompiledLyricsIndex)
+    assert len(index) == 502
+    assert "été indien" in index
+    assert all(f"filler line {i}" in index for i in range(500))
+    assert "filler line 500" not in index
+    assert "hello from the other" not in index
+
+    hit = check_quote_safety("Hello from the other side", known_lyrics=index)
+    assert "known_lyric_match" in hit.rule_hits
+    assert check_quote_safety("sunrise over quiet water", known_lyrics=index).is_safe is True
+    index.close()
+
+
+def test_lyrics_index_requires_membership_and_length() -> None:
+    from safe_lyrics_checker.quote_safety import LyricsIndex
+
+    class NoLength(LyricsIndex):
+        def __contains__(self, normalized: object) -> bool:
+            return False
+
+    with pytest.raises(TypeError):
+        NoLength()
@@ -1,4 +1,7 @@
-from safe_lyrics_checker.rights_engine import RightsStatus, check_lyrics_rights
+import pickle
+
+from safe_lyrics_checker.rights_engine import RightsResult, RightsStatus, check_lyrics_rights
+from safe_lyrics_checker.search_sources.models import Candidate, CandidateColumns
 
 
 def test_us_1929_vs_1930_boundary() -> None:
@@ -40,3 +43,46 @@ def test_missing_metadata_unknown() -> None:
     assert us_missing_pub.status is RightsStatus.UNKNOWN
     assert uk_missing_death.status is RightsStatus.UNKNOWN
     assert us_1930_unknown_renewal.status is RightsStatus.UNKNOWN
+
+
+def test_results_share_instances_and_render_explanations() -> None:
+    first = check_lyrics_rights(jurisdiction="UK", lyricist_death_year=1940)
+    second = check_lyrics_rights(jurisdiction="UK", lyricist_death_year=1940)
+
+    assert first is second
+    assert first.code == "LIFE70_SAFE"
+    assert first.explanation == "UK: lyricist died in 1940 (<=1954), treated as public domain."
+    assert first == RightsResult(RightsStatus.SAFE, code="LIFE70_SAFE", params=("UK", 1940))
+    # Equality is on the code, not the rendered text.
+    assert first != RightsResult(RightsStatus.SAFE, first.explanation)
+    assert pickle.loads(pickle.dumps(first)) == first
+
+
+def test_candidate_columns_round_trip() -> None:
+    columns = CandidateColumns()
+    candidate = Candidate(
+        title="Amazing Grace",
+        source="gutenberg",
+        work_url="https://www.gutenberg.org/ebooks/1",
+        publication_year=1779,
+        renewal_status="not_renewed",
+        evidence_urls=["https://www.gutenberg.org/ebooks/1"],
+    )
+    rights = check_lyrics_rights(jurisdiction="US", publication_year=1779)
+
+    columns.append(candidate, rights)
+    columns.append(Candidate(title="Untitled", source="gutenberg", work_url="https://www.gutenberg.org/ebooks/2"))
+
+    assert len(columns) == 2
+    assert columns[0] == candidate
+    assert columns.rights(0) is rights
+    assert columns[1].publication_year is None
+    assert columns.rights(1) is None
+    assert list(columns.source_codes) == [0, 0]
+
+
+def test_candidate_columns_store_unrecognised_renewal_as_unknown() -> None:
+    columns = CandidateColumns()
+    columns.append(Candidate(title="X", source="loc", work_url="https://www.loc.gov/item/1", renewal_status="maybe"))
+
+    assert columns[0].renewal_status == "unknown"
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import sqlite3
+import threading
+import time
 from pathlib import Path
 
+import pytest
 import requests
 
 from safe_lyrics_checker.cli import main
-from safe_lyrics_checker.http_cache import HttpCache
+from safe_lyrics_checker.http_cache import CachedPage, HttpCache
 from safe_lyrics_checker.search_engine import search_candidates
 
 
@@ -20,7 +24,7 @@ class DummyResponse:
 def test_http_cache_reuses_cached_response(monkeypatch, tmp_path: Path) -> None:
     calls = {"count": 0}
 
-    def fake_get(url: str, timeout: int = 15, headers=None):
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
         calls["count"] += 1
         return DummyResponse("<html><a href='/ebooks/1'>Sample Title</a></html>")
 
@@ -35,6 +39,75 @@ def test_http_cache_reuses_cached_response(monkeypatch, tmp_path: Path) -> None:
     assert calls["count"] == 1
 
 
+def _age_cache_entries(cache: HttpCache, seconds: int) -> None:
+    with sqlite3.connect(cache.db_path) as conn:
+        conn.execute("UPDATE http_cache SET fetched_at = fetched_at - ?", (seconds,))
+
+
+def test_http_cache_serves_stale_while_revalidating(monkeypatch, tmp_path: Path) -> None:
+    bodies = iter(["old", "new"])
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        return DummyResponse(next(bodies))
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    cache = HttpCache(db_path=tmp_path / "cache.sqlite", ttl_seconds=60, stale_while_revalidate=600)
+    url = "https://www.gutenberg.org/ebooks/1"
+    cache.get_text(url)
+    _age_cache_entries(cache, 120)
+
+    page = cache.fetch(url)
+    cache.close()
+
+    assert (page.body, page.stale) == ("old", True)
+    assert cache.fetch(url) == CachedPage("new")
+
+
+def test_cli_waits_for_background_revalidation(monkeypatch, tmp_path: Path) -> None:
+    revalidated = threading.Event()
+    calls: list[str] = []
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        calls.append(url)
+        if len(calls) > 1:
+            time.sleep(0.2)
+            revalidated.set()
+        return DummyResponse("<html><title>Amazing Grace</title>Published 1920.</html>")
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    monkeypatch.chdir(tmp_path)
+    argv = ["--stale-while-revalidate", "2592000", "evaluate-url", "https://example.com/work", "--jurisdiction", "US"]
+    main(argv)
+    _age_cache_entries(HttpCache(db_path=tmp_path / ".cache" / "safe_lyrics_checker.sqlite"), 8 * 24 * 60 * 60)
+
+    main(argv)
+
+    assert revalidated.is_set()
+
+
+def test_http_cache_serves_stale_if_error(monkeypatch, tmp_path: Path, capsys) -> None:
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        if calls:
+            raise requests.ConnectionError("catalog down")
+        calls.append(url)
+        return DummyResponse("cached body")
+
+    calls: list[str] = []
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    cache = HttpCache(db_path=tmp_path / "cache.sqlite", ttl_seconds=60, stale_if_error=600)
+    url = "https://www.gutenberg.org/ebooks/1"
+    cache.get_text(url)
+    _age_cache_entries(cache, 120)
+
+    assert cache.fetch(url) == CachedPage("cached body", stale=True, error="catalog down")
+    assert cache.get_text(url) == "cached body"
+    assert "serving stale cached copy" in capsys.readouterr().err
+
+    _age_cache_entries(cache, 1000)
+    with pytest.raises(requests.ConnectionError):
+        cache.get_text(url)
+
+
 def test_search_candidates_parses_and_enriches(monkeypatch, tmp_path: Path) -> None:
     responses = {
         "https://www.gutenberg.org/ebooks/search/?query=amazing+grace": (
@@ -45,7 +118,7 @@ def test_search_candidates_parses_and_enriches(monkeypatch, tmp_path: Path) -> N
         ),
     }
 
-    def fake_get(url: str, timeout: int = 15, headers=None):
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
         return DummyResponse(responses[url])
 
     monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
@@ -75,7 +148,7 @@ def test_cli_search_outputs_rights_status(monkeypatch, tmp_path: Path) -> None:
         "https://www.gutenberg.org/ebooks/123": "Published 1929. not renewed.",
     }
 
-    def fake_get(url: str, timeout: int = 15, headers=None):
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
         return DummyResponse(responses[url])
 
     monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
@@ -103,7 +176,7 @@ def test_search_skips_worldcat_http_error_by_default(monkeypatch, tmp_path: Path
         "https://www.gutenberg.org/ebooks/123": "Published 1929. not renewed.",
     }
 
-    def fake_get(url: str, timeout: int = 15, headers=None):
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
         if url.startswith("https://www.worldcat.org/search"):
             response = requests.Response()
             response.status_code = 403
@@ -132,7 +205,7 @@ def test_search_skips_worldcat_http_error_by_default(monkeypatch, tmp_path: Path
 
 
 def test_search_with_only_failing_source_returns_unknown(monkeypatch, tmp_path: Path, capsys) -> None:
-    def fake_get(url: str, timeout: int = 15, headers=None):
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
         response = requests.Response()
         response.status_code = 403
         response.reason = "Forbidden"
@@ -158,7 +231,7 @@ def test_search_with_only_failing_source_returns_unknown(monkeypatch, tmp_path:
 
 
 def test_search_strict_mode_raises_http_error(monkeypatch, tmp_path: Path) -> None:
-    def fake_get(url: str, timeout: int = 15, headers=None):
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
         response = requests.Response()
         response.status_code = 403
         response.reason = "Forbidden"
@@ -180,3 +253,338 @@ def test_search_strict_mode_raises_http_error(monkeypatch, tmp_path: Path) -> No
             "worldcat",
             "--strict",
         ])
+
+
+def test_search_ranks_across_sources_before_enriching(monkeypatch, tmp_path: Path) -> None:
+    fetched: list[str] = []
+    responses = {
+        "https://www.gutenberg.org/ebooks/search/?query=amazing+grace": (
+            "<a href='/ebooks/1'>Collected Sermons Volume One</a>"
+        ),
+        "https://imslp.org/wiki/Special:Search?search=amazing+grace": (
+            "<a href='/wiki/Amazing_Grace'>Amazing Grace (Newton)</a>"
+        ),
+        "https://imslp.org/wiki/Amazing_Grace": "Published 1779. died 1807.",
+    }
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        fetched.append(url)
+        return DummyResponse(responses[url])
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    cache = HttpCache(db_path=tmp_path / "cache.sqlite")
+
+    candidates = search_candidates(
+        "amazing grace",
+        sources=["gutenberg", "imslp"],
+        max_results=1,
+        cache=cache,
+    )
+
+    assert [c.work_url for c in candidates] == ["https://imslp.org/wiki/Amazing_Grace"]
+    assert "https://www.gutenberg.org/ebooks/1" not in fetched
+
+
+def test_merge_collapses_same_work_from_different_sources() -> None:
+    from safe_lyrics_checker.ranking import find_duplicate, merge_into
+    from safe_lyrics_checker.search_sources.models import Candidate
+
+    imslp = Candidate(
+        title="Amazing Grace",
+        source="imslp",
+        work_url="https://imslp.org/wiki/Amazing_Grace",
+        lyricist="John Newton",
+        publication_year=1779,
+        evidence_urls=["https://imslp.org/wiki/Amazing_Grace"],
+    )
+    loc = Candidate(
+        title="Amazing grace!",
+        source="loc",
+        work_url="https://www.loc.gov/item/1/",
+        lyricist="Newton, John",
+        lyricist_death_year=1807,
+        evidence_urls=["https://www.loc.gov/item/1/"],
+    )
+
+    duplicate = find_duplicate(loc, [imslp])
+    assert duplicate is imslp
+    merged = merge_into(duplicate, loc)
+    assert merged.lyricist_death_year == 1807
+    assert merged.evidence_urls == ["https://imslp.org/wiki/Amazing_Grace", "https://www.loc.gov/item/1/"]
+    assert find_duplicate(Candidate(title="Amazing Grace", source="cpdl", work_url="x"), [imslp]) is None
+
+
+def test_search_stops_enriching_after_definitive_verdict(monkeypatch, tmp_path: Path) -> None:
+    fetched: list[str] = []
+    responses = {
+        "https://www.gutenberg.org/ebooks/search/?query=amazing+grace": (
+            "<a href='/ebooks/1'>Amazing Grace</a><a href='/ebooks/2'>Amazing Grace Hymnal</a>"
+        ),
+        "https://www.gutenberg.org/ebooks/1": "Published 1779.",
+        "https://www.gutenberg.org/ebooks/2": "Published 1910.",
+    }
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        fetched.append(url)
+        return DummyResponse(responses[url])
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    cache = HttpCache(db_path=tmp_path / "cache.sqlite")
+
+    candidates = search_candidates(
+        "amazing grace",
+        sources=["gutenberg"],
+        max_results=5,
+        cache=cache,
+        jurisdiction="US",
+    )
+
+    assert [c.work_url for c in candidates] == ["https://www.gutenberg.org/ebooks/1"]
+    assert "https://www.gutenberg.org/ebooks/2" not in fetched
+
+
+def test_pending_candidates_defer_enrichment(monkeypatch, tmp_path: Path) -> None:
+    import asyncio
+
+    from safe_lyrics_checker.search_engine import find_candidates
+
+    fetched: list[str] = []
+    responses = {
+        "https://www.gutenberg.org/ebooks/search/?query=amazing+grace": "<a href='/ebooks/1'>Amazing Grace</a>",
+        "https://www.gutenberg.org/ebooks/1": "Published 1779.",
+    }
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        fetched.append(url)
+        return DummyResponse(responses[url])
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    cache = HttpCache(db_path=tmp_path / "cache.sqlite")
+
+    pending = find_candidates("amazing grace", sources=["gutenberg"], cache=cache)
+    assert len(pending) == 1
+    assert pending[0].resolved is False
+    assert "https://www.gutenberg.org/ebooks/1" not in fetched
+
+    async def resolve_all():
+        return await pending[0]
+
+    candidate = asyncio.run(resolve_all())
+    assert candidate.publication_year == 1779
+    assert pending[0].resolve() is candidate
+    assert fetched.count("https://www.gutenberg.org/ebooks/1") == 1
+
+
+def test_iter_candidates_yields_before_enriching_the_rest(monkeypatch, tmp_path: Path) -> None:
+    from safe_lyrics_checker.search_engine import iter_candidates
+
+    fetched: list[str] = []
+    responses = {
+        "https://www.gutenberg.org/ebooks/search/?query=amazing+grace": (
+            "<a href='/ebooks/1'>Amazing Grace</a><a href='/ebooks/2'>Amazing Grace Hymnal</a>"
+        ),
+        "https://www.gutenberg.org/ebooks/1": "Published 1779.",
+        "https://www.gutenberg.org/ebooks/2": "Published 1910.",
+    }
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        fetched.append(url)
+        return DummyResponse(responses[url])
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    cache = HttpCache(db_path=tmp_path / "cache.sqlite")
+
+    stream = iter_candidates("amazing grace", sources=["gutenberg"], max_results=5, cache=cache)
+    first = next(stream)
+
+    assert first.work_url == "https://www.gutenberg.org/ebooks/1"
+    assert "https://www.gutenberg.org/ebooks/2" not in fetched
+    stream.close()
+
+
+def test_cli_search_first_exits_with_definitive_verdict(monkeypatch, tmp_path: Path, capsys) -> None:
+    responses = {
+        "https://www.gutenberg.org/ebooks/search/?query=amazing+grace": (
+            "<a href='/ebooks/1'>Amazing Grace</a><a href='/ebooks/2'>Amazing Grace Hymnal</a>"
+        ),
+        "https://www.gutenberg.org/ebooks/1": "Published 1970.",
+        "https://www.gutenberg.org/ebooks/2": "Published 1910.",
+    }
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        return DummyResponse(responses[url])
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    monkeypatch.chdir(tmp_path)
+
+    exit_code = main([
+        "search",
+        "amazing grace",
+        "--jurisdiction",
+        "US",
+        "--sources",
+        "gutenberg",
+        "--first",
+    ])
+
+    out = capsys.readouterr().out
+    assert exit_code == 1
+    assert "[1] Amazing Grace" in out
+    assert "[2]" not in out
+
+
+def test_cli_search_jsonl_and_json_output(monkeypatch, tmp_path: Path, capsys) -> None:
+    import json
+
+    responses = {
+        "https://www.gutenberg.org/ebooks/search/?query=amazing+grace": (
+            "<a href='/ebooks/1'>Amazing Grace</a><a href='/ebooks/2'>Amazing Grace Hymnal</a>"
+        ),
+        "https://www.gutenberg.org/ebooks/1": "Published 1779.",
+        "https://www.gutenberg.org/ebooks/2": "Published 1910.",
+    }
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        return DummyResponse(responses[url])
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    monkeypatch.chdir(tmp_path)
+    argv = ["search", "amazing grace", "--jurisdiction", "US", "--sources", "gutenberg"]
+
+    assert main([*argv, "--format", "jsonl"]) == 0
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r["work_url"] for r in records] == [
+        "https://www.gutenberg.org/ebooks/1",
+        "https://www.gutenberg.org/ebooks/2",
+    ]
+    assert records[0]["rights"]["status"] == "SAFE"
+
+    assert main([*argv, "--format", "json"]) == 0
+    document = json.loads(capsys.readouterr().out)
+    assert document["query"] == "amazing grace"
+    assert len(document["candidates"]) == 2
+
+
+def test_search_deadline_returns_partial_results(monkeypatch, tmp_path: Path, capsys) -> None:
+    import json
+    import time
+
+    search_url = "https://www.gutenberg.org/ebooks/search/?query=amazing+grace"
+    timeouts: list[float] = []
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        if url == search_url:
+            return DummyResponse("<a href='/ebooks/1'>Amazing Grace</a><a href='/ebooks/2'>Amazing Grace Hymnal</a>")
+        # A hung catalog: every work page runs into whatever timeout it was given.
+        connect, read = timeout
+        timeouts.append(read)
+        time.sleep(read)
+        raise requests.Timeout("read timed out")
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    cache = HttpCache(db_path=tmp_path / "cache.sqlite")
+
+    started = time.monotonic()
+    candidates = search_candidates("amazing grace", sources=["gutenberg"], max_results=5, cache=cache, deadline=0.3)
+
+    assert time.monotonic() - started < 1.0
+    assert candidates.partial is True
+    assert [c.work_url for c in candidates] == [
+        "https://www.gutenberg.org/ebooks/1",
+        "https://www.gutenberg.org/ebooks/2",
+    ]
+    assert timeouts and max(timeouts) < 0.3
+    with sqlite3.connect(cache.db_path) as conn:
+        # Running out of budget says nothing about the host, so no failure is cached.
+        assert conn.execute("SELECT COUNT(*) FROM http_cache WHERE url LIKE 'failure:%'").fetchone()[0] == 0
+
+    monkeypatch.chdir(tmp_path)
+    argv = ["search", "amazing grace", "--jurisdiction", "US", "--sources", "gutenberg", "--deadline", "200ms"]
+    assert main([*argv, "--format", "json"]) == 0
+    assert json.loads(capsys.readouterr().out)["partial"] is True
+    assert main(argv) == 0
+    assert "results are partial" in capsys.readouterr().err
+
+
+def test_search_without_deadline_is_not_partial(monkeypatch, tmp_path: Path) -> None:
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        return DummyResponse("<a href='/ebooks/1'>Amazing Grace</a>" if "search" in url else "Published 1779.")
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    cache = HttpCache(db_path=tmp_path / "cache.sqlite")
+
+    candidates = search_candidates("amazing grace", sources=["gutenberg"], max_results=5, cache=cache, deadline=30)
+
+    assert candidates.partial is False
+    assert candidates[0].publication_year == 1779
+
+
+def test_cli_search_first_reports_candidate_made_definitive_by_a_merge(monkeypatch, tmp_path: Path, capsys) -> None:
+    import json
+
+    from safe_lyrics_checker.search_sources.structured import archive_search_url
+
+    loc_item = {"title": "Danny boy", "url": "https://www.loc.gov/item/2009/", "date": "1913"}
+    loc_item["contributor_names"] = ["Weatherly, Fred E."]
+    archive_creator = "Weatherly, Fred E., 1848-1929"
+    responses = {
+        "https://www.loc.gov/search/?q=danny+boy&fo=json&c=5": json.dumps({"results": [loc_item]}),
+        "https://www.loc.gov/item/2009/?fo=json": json.dumps({"item": loc_item}),
+        "https://www.loc.gov/item/2009/": "<title>Danny boy</title>",
+        archive_search_url("danny boy", 5): json.dumps(
+            {"response": {"docs": [{"identifier": "db", "title": "Danny Boy", "creator": archive_creator}]}}
+        ),
+    }
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        return DummyResponse(responses[url])
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    monkeypatch.chdir(tmp_path)
+
+    exit_code = main(["search", "danny boy", "--jurisdiction", "UK", "--sources", "loc,archive", "--first"])
+
+    out = capsys.readouterr().out
+    assert exit_code == 0
+    # Printed first with an unknown death year, then again once the archive.org hit merged in.
+    assert out.count("[1] Danny boy") == 2
+    assert "Rights status: UNKNOWN" in out
+    assert out.rstrip().endswith("https://archive.org/details/db")
+    assert "Lyricist death year: 1929" in out
+    assert "[2]" not in out
+
+    argv = ["search", "danny boy", "--jurisdiction", "UK", "--sources", "loc,archive", "--first", "--format"]
+    main([*argv, "json"])
+    document = json.loads(capsys.readouterr().out)
+    main([*argv, "jsonl"])
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+    assert [record["rights"]["status"] for record in document["candidates"]] == ["SAFE"]
+    assert [record["kind"] for record in lines] == ["candidate", "candidate_update"]
+    assert lines[0]["work_url"] == lines[1]["work_url"]
+    assert lines[1]["lyricist_death_year"] == 1929
+
+
+def test_html_only_duplicates_merge_on_title_and_publication_year(monkeypatch, tmp_path: Path) -> None:
+    responses = {
+        "https://www.gutenberg.org/ebooks/search/?query=danny+boy": "<a href='/ebooks/7'>Danny Boy</a>",
+        "https://www.gutenberg.org/ebooks/7": "Published 1913.",
+        "https://www.worldcat.org/search?q=danny+boy": "<a href='/title/42'>Danny Boy</a>",
+        "https://www.worldcat.org/title/42": "Published 1913. lyricist died 1929.",
+    }
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        if url not in responses:
+            response = requests.Response()
+            response.status_code = 404
+            raise requests.HTTPError(response=response)
+        return DummyResponse(responses[url])
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    candidates = search_candidates(
+        "danny boy", sources=["gutenberg", "worldcat"], max_results=5, cache=HttpCache(db_path=tmp_path / "c.sqlite")
+    )
+
+    assert len(candidates) == 1
+    assert candidates[0].lyricist_death_year == 1929
+    assert "https://www.worldcat.org/title/42" in candidates[0].evidence_urls
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+import pytest
+import requests
+
+from safe_lyrics_checker.cli import main
+from safe_lyrics_checker.http_cache import HttpCache
+from safe_lyrics_checker.metrics import METRICS
+from safe_lyrics_checker.quote_safety import KnownLyricsIndex
+from safe_lyrics_checker.service import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_QUEUE_SIZE, CheckerService, ServiceServer
+
+
+class DummyResponse:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def raise_for_status(self) -> None:
+        return None
+
+
+class StubUpstreamHandler(BaseHTTPRequestHandler):
+    pages = {
+        "/work": (
+            "<html><title>Amazing Grace</title>"
+            "<body>Lyrics by John Newton. died 1807. Published 1920. not renewed.</body></html>"
+        ),
+    }
+    hits: list[str] = []
+
+    def do_GET(self) -> None:
+        self.hits.append(self.path)
+        body = self.pages.get(self.path)
+        if body is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        encoded = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format, *args) -> None:
+        return None
+
+
+def _start(server: HTTPServer) -> str:
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+@pytest.fixture
+def upstream():
+    StubUpstreamHandler.hits = []
+    server = HTTPServer(("127.0.0.1", 0), StubUpstreamHandler)
+    yield _start(server)
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def service_url(tmp_path: Path):
+    service = CheckerService(
+        cache=HttpCache(db_path=tmp_path / "cache.sqlite"),
+        known_lyrics=KnownLyricsIndex(["hello from the other side"]),
+    )
+    server = ServiceServer(("127.0.0.1", 0), service, workers=2, queue_size=2)
+    yield _start(server)
+    server.shutdown()
+    server.server_close()
+
+
+def _post(base: str, path: str, payload: dict) -> tuple[int, dict]:
+    request = urllib.request.Request(
+        f"{base}{path}",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+def test_service_rights_check(service_url: str) -> None:
+    status, body = _post(service_url, "/rights-check", {"jurisdiction": "US", "publication_year": 1929})
+    assert status == 200
+    assert body["status"] == "SAFE"
+
+
+def test_service_quote_check_uses_preloaded_index(service_url: str) -> None:
+    status, body = _post(service_url, "/quote-check", {"excerpt": "Hello from the other side"})
+    assert status == 200
+    assert body["is_safe"] is False
+    assert "known_lyric_match" in body["rule_hits"]
+
+
+def test_service_evaluate_url_reuses_warm_cache(service_url: str, upstream: str) -> None:
+    payload = {"jurisdiction": "US", "url": f"{upstream}/work"}
+    first_status, first = _post(service_url, "/evaluate-url", payload)
+    second_status, second = _post(service_url, "/evaluate-url", payload)
+
+    assert first_status == second_status == 200
+    assert first["rights"]["status"] == "SAFE"
+    assert first["metadata"]["publication_year"] == 1920
+    assert second == first
+    assert StubUpstreamHandler.hits == ["/work"]
+
+
+def test_service_rejects_bad_requests(service_url: str) -> None:
+    status, body = _post(service_url, "/rights-check", {"publication_year": 1929})
+    assert status == 400
+    assert "jurisdiction" in body["error"]
+
+    METRICS.reset()
+    status, _ = _post(service_url, "/unknown?client-chosen", {})
+    assert status == 404
+    assert [span["tags"] for span in METRICS.snapshot()["spans"]] == [{"endpoint": "other"}]
+
+
+@pytest.mark.parametrize(
+    "path, payload, field",
+    [
+        ("/quote-check", {"excerpt": "la la", "max_words": "many"}, "max_words"),
+        ("/rights-check", {"jurisdiction": "US", "publication_year": "nineteen"}, "publication_year"),
+        ("/search", {"query": "danny boy", "jurisdiction": "US", "deadline": "soon"}, "deadline"),
+        ("/search", {"query": "danny boy", "jurisdiction": "US", "sources": "loc"}, "sources"),
+        ("/search", {"query": "danny boy", "jurisdiction": "US", "strict": "false"}, "strict"),
+        ("/rights-check", {"jurisdiction": "US", "renewal_status": 5}, "renewal_status"),
+        ("/rights-check", {"jurisdiction": "US", "renewal_status": "maybe"}, "renewal_status"),
+        ("/quote-check", {"excerpt": "la la", "known_lyrics": [1, 2]}, "known_lyrics"),
+        ("/quote-check", {"excerpt": "la la", "known_lyrics": "hi there"}, "known_lyrics"),
+    ],
+)
+def test_service_rejects_malformed_fields(service_url: str, path: str, payload: dict, field: str) -> None:
+    status, body = _post(service_url, path, payload)
+    assert status == 400
+    assert field in body["error"]
+
+
+def test_service_search_first_stops_at_the_first_definitive_verdict(monkeypatch, tmp_path: Path) -> None:
+    pages = {
+        "https://www.gutenberg.org/ebooks/search/?query=amazing+grace": (
+            "<a href='/ebooks/1'>Amazing Grace</a><a href='/ebooks/2'>Amazing Grace (arr.)</a>"
+        ),
+        "https://www.gutenberg.org/ebooks/1": "Published 1920.",
+        "https://www.gutenberg.org/ebooks/2": "Published 1925.",
+    }
+    fetched: list[str] = []
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        fetched.append(url)
+        if url not in pages:
+            response = requests.Response()
+            response.status_code = 404
+            raise requests.HTTPError(response=response)
+        return DummyResponse(pages[url])
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    service = CheckerService(cache=HttpCache(db_path=tmp_path / "cache.sqlite"), known_lyrics=KnownLyricsIndex())
+
+    body = service.search({"query": "amazing grace", "jurisdiction": "US", "sources": ["gutenberg"], "first": True})
+
+    assert [candidate["rights"]["status"] for candidate in body["candidates"]] == ["SAFE"]
+    assert "https://www.gutenberg.org/ebooks/2" not in fetched
+
+
+def test_cli_serve_passes_the_service_defaults(monkeypatch, tmp_path: Path) -> None:
+    calls: list[dict] = []
+    monkeypatch.setattr("safe_lyrics_checker.service.serve", lambda **kwargs: calls.append(kwargs))
+
+    assert main(["serve", "--cache-db", str(tmp_path / "cache.sqlite"), "--workers", "2"]) == 0
+
+    options = {name: calls[0][name] for name in ("host", "port", "workers", "queue_size")}
+    assert options == {
+        "host": DEFAULT_HOST,
+        "port": DEFAULT_PORT,
+        "workers": 2,
+        "queue_size": DEFAULT_QUEUE_SIZE,
+    }
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+from safe_lyrics_checker.http_cache import HttpCache
+from safe_lyrics_checker.search_engine import search_candidates
+from safe_lyrics_checker.search_sources import registry
+from safe_lyrics_checker.search_sources.registry import SourceRegistry
+from safe_lyrics_checker.search_sources.spec import SourceSpec
+from safe_lyrics_checker.url_sources.evaluator import _find_adapter
+
+
+class DummyResponse:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def raise_for_status(self) -> None:
+        return None
+
+
+MIRROR = SourceSpec(
+    name="mirror",
+    domain="https://catalog.example.internal",
+    search_path="/find?q=",
+    link_re=re.compile(r"href=['\"]((?:https://catalog\.example\.internal)?/record/\d+)['\"]"),
+    result_limit=2,
+)
+
+
+class FakeEntryPoint:
+    name = "mirror"
+
+    def __init__(self) -> None:
+        self.loads = 0
+
+    def load(self) -> SourceSpec:
+        self.loads += 1
+        return MIRROR
+
+
+def test_registry_discovers_entry_point_sources_lazily(monkeypatch) -> None:
+    entry_point = FakeEntryPoint()
+    monkeypatch.setattr(registry, "_discover_entry_points", lambda: {"mirror": entry_point})
+    sources = SourceRegistry({"gutenberg": "safe_lyrics_checker.search_sources.gutenberg:SPEC"})
+
+    assert list(sources) == ["gutenberg", "mirror"]
+    assert entry_point.loads == 0
+    assert sources["mirror"] is MIRROR
+    assert sources["mirror"] is MIRROR
+    assert entry_point.loads == 1
+
+
+def test_spec_search_respects_result_limit_and_absolute_links(monkeypatch, tmp_path: Path) -> None:
+    responses = {
+        "https://catalog.example.internal/find?q=danny+boy": (
+            "<a href='/record/1'>Danny Boy</a>"
+            "<a href='https://catalog.example.internal/record/2'>Londonderry Air</a>"
+            "<a href='/record/3'>Third Result</a>"
+        ),
+        "https://catalog.example.internal/record/1": "Published 1913. died 1934.",
+        "https://catalog.example.internal/record/2": "Published 1855.",
+    }
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        return DummyResponse(responses[url])
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    monkeypatch.setattr(registry, "_discover_entry_points", lambda: {})
+    registry.SOURCES.register(MIRROR)
+    try:
+        candidates = search_candidates(
+            "danny boy",
+            sources=["mirror"],
+            max_results=5,
+            cache=HttpCache(db_path=tmp_path / "cache.sqlite"),
+        )
+    finally:
+        registry.SOURCES.unregister("mirror")
+
+    assert [c.work_url for c in candidates] == [
+        "https://catalog.example.internal/record/1",
+        "https://catalog.example.internal/record/2",
+    ]
+    assert candidates[0].publication_year == 1913
+
+
+def test_evaluator_adapters_come_from_source_specs() -> None:
+    from safe_lyrics_checker.url_sources import gutenberg, imslp
+    from safe_lyrics_checker.url_sources.common import extract_metadata_generic
+
+    assert _find_adapter("https://www.gutenberg.org/ebooks/1") is gutenberg.extract_metadata
+    assert _find_adapter("https://imslp.org/wiki/Amazing_Grace") is imslp.extract_metadata
+    assert _find_adapter("https://www.worldcat.org/title/1") is extract_metadata_generic
+
+
+def test_find_spec_loads_only_the_matching_source(monkeypatch, capsys) -> None:
+    class BrokenEntryPoint:
+        name = "broken"
+
+        def load(self):
+            raise ImportError("plugin is broken")
+
+    monkeypatch.setattr(registry, "_discover_entry_points", lambda: {"broken": BrokenEntryPoint()})
+    sources = SourceRegistry(
+        {
+            "gutenberg": "safe_lyrics_checker.search_sources.gutenberg:SPEC",
+            "missing": "safe_lyrics_checker.search_sources.no_such_module:SPEC",
+        },
+        domains={"gutenberg": "gutenberg.org", "missing": "missing.example"},
+    )
+    monkeypatch.setattr("safe_lyrics_checker.url_sources.evaluator.SOURCES", sources)
+
+    from safe_lyrics_checker.url_sources import gutenberg
+    from safe_lyrics_checker.url_sources.common import extract_metadata_generic
+
+    assert _find_adapter("https://www.gutenberg.org/ebooks/1") is gutenberg.extract_metadata
+    assert _find_adapter("https://unknown.example/page") is extract_metadata_generic
+    assert "broken failed to load" in capsys.readouterr().err
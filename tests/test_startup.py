@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+HEAVY_MODULES = [
+    "requests",
+    "sqlite3",
+    "safe_lyrics_checker.http_cache",
+    "safe_lyrics_checker.search_engine",
+    "safe_lyrics_checker.search_sources.gutenberg",
+    "safe_lyrics_checker.url_sources.evaluator",
+    "safe_lyrics_checker.service",
+]
+
+
+def _loaded_after(argv: list[str]) -> list[str]:
+    script = (
+        "import json, sys\n"
+        "from safe_lyrics_checker.cli import main\n"
+        f"main({argv!r})\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=REPO_ROOT,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def test_rights_check_does_not_import_network_modules() -> None:
+    assert _loaded_after(["rights-check", "--jurisdiction", "US", "--publication-year", "1929"]) == []
+
+
+def test_quote_check_does_not_import_network_modules() -> None:
+    assert _loaded_after(["quote-check", "short excerpt"]) == []
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+
+import pytest
+import requests
+
+from safe_lyrics_checker.http_cache import HttpCache
+from safe_lyrics_checker.search_engine import evaluate_candidate, search_candidates
+from safe_lyrics_checker.search_sources.spec import SourceSpec
+from safe_lyrics_checker.search_sources.structured import StructuredApi, loc_search_url, parse_wikitext
+from safe_lyrics_checker.url_sources.evaluator import evaluate_url
+
+
+class DummyResponse:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def raise_for_status(self) -> None:
+        return None
+
+
+def _stub(monkeypatch, responses: dict[str, str]) -> list[str]:
+    fetched: list[str] = []
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        fetched.append(url)
+        if url not in responses:
+            response = requests.Response()
+            response.status_code = 404
+            raise requests.HTTPError(response=response)
+        return DummyResponse(responses[url])
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    return fetched
+
+
+def test_loc_search_uses_json_results(monkeypatch, tmp_path: Path) -> None:
+    item_url = "https://www.loc.gov/item/2009/"
+    fetched = _stub(
+        monkeypatch,
+        {
+            "https://www.loc.gov/search/?q=danny+boy&fo=json&c=5": json.dumps(
+                {"results": [{"title": "Danny boy", "url": item_url, "date": "1913"}]}
+            ),
+            f"{item_url}?fo=json": json.dumps(
+                {"item": {"title": "Danny boy", "contributor_names": ["Weatherly, Fred E., 1848-1929"]}}
+            ),
+        },
+    )
+
+    candidates = search_candidates(
+        "danny boy", sources=["loc"], max_results=5, cache=HttpCache(db_path=tmp_path / "cache.sqlite")
+    )
+
+    assert [c.work_url for c in candidates] == [item_url]
+    assert candidates[0].publication_year == 1913
+    assert candidates[0].lyricist_death_year == 1929
+    assert item_url not in fetched
+
+
+def test_imslp_search_and_enrich_through_mediawiki_api(monkeypatch, tmp_path: Path) -> None:
+    wikitext = "{{#fte:imslppage\n|Librettist=Frederic Weatherly\n|First Publication=1913 - London: Boosey\n}}"
+    _stub(
+        monkeypatch,
+        {
+            "https://imslp.org/api.php?action=query&list=search&srsearch=danny+boy&srlimit=5&format=json": json.dumps(
+                {"query": {"search": [{"title": "Danny Boy (Weatherly, Frederic)"}]}}
+            ),
+            "https://imslp.org/api.php?action=parse&page=Danny_Boy_%28Weatherly%2C_Frederic%29"
+            "&prop=wikitext&redirects=1&format=json": json.dumps(
+                {"parse": {"title": "Danny Boy (Weatherly, Frederic)", "wikitext": {"*": wikitext}}}
+            ),
+        },
+    )
+
+    candidates = search_candidates(
+        "danny boy", sources=["imslp"], max_results=5, cache=HttpCache(db_path=tmp_path / "cache.sqlite")
+    )
+
+    assert candidates[0].work_url == "https://imslp.org/wiki/Danny_Boy_%28Weatherly%2C_Frederic%29"
+    assert candidates[0].lyricist == "Frederic Weatherly"
+    assert candidates[0].publication_year == 1913
+
+
+def test_evaluate_url_prefers_archive_metadata_api(monkeypatch, tmp_path: Path) -> None:
+    fetched = _stub(
+        monkeypatch,
+        {
+            "https://archive.org/metadata/dannyboy1913": json.dumps(
+                {"metadata": {"title": "Danny Boy", "creator": "Weatherly, Fred, 1848-1929", "year": "1913"}}
+            )
+        },
+    )
+
+    rights, evaluation = evaluate_url(
+        "https://archive.org/details/dannyboy1913", "US", cache=HttpCache(db_path=tmp_path / "cache.sqlite")
+    )
+
+    assert rights.status.value == "SAFE"
+    assert evaluation.metadata.publication_year == 1913
+    assert fetched == ["https://archive.org/metadata/dannyboy1913"]
+
+
+def test_search_falls_back_to_html_when_api_fails(monkeypatch, tmp_path: Path) -> None:
+    _stub(
+        monkeypatch,
+        {
+            "https://www.loc.gov/search/?q=danny+boy": "<a href='https://www.loc.gov/item/2009/'>Danny Boy song</a>",
+            "https://www.loc.gov/item/2009/": "Published 1913.",
+        },
+    )
+
+    candidates = search_candidates(
+        "danny boy", sources=["loc"], max_results=5, cache=HttpCache(db_path=tmp_path / "cache.sqlite")
+    )
+
+    assert candidates[0].work_url == "https://www.loc.gov/item/2009/"
+    assert candidates[0].publication_year == 1913
+
+
+def test_wikitext_death_year_comes_only_from_the_lyricist_entry() -> None:
+    comments = "|Misc. Comments=Revised ed. 1950\n|First Publication=1913\n"
+    undated = parse_wikitext(
+        f"|Librettist=Frederic Weatherly\n{comments}", "Danny Boy", "https://imslp.org/wiki/X", "imslp"
+    )
+    dated = parse_wikitext(
+        f"|Librettist=[[:Category:Weatherly, Frederic|Frederic Weatherly]] (1848–1929)\n{comments}",
+        "Danny Boy",
+        "https://imslp.org/wiki/X",
+        "imslp",
+    )
+
+    assert undated.lyricist_death_year is None
+    assert dated.lyricist_death_year == 1929
+
+
+def test_structured_parser_bugs_are_not_hidden_by_html_fallback(monkeypatch, tmp_path: Path) -> None:
+    def broken_parser(body: str):
+        raise TypeError("parser bug")
+
+    spec = SourceSpec(
+        name="loc",
+        domain="https://www.loc.gov",
+        search_path="/search/?q=",
+        link_re=re.compile(r"href='([^']+)'"),
+        api=StructuredApi(search_url=loc_search_url, parse_search=broken_parser),
+    )
+    _stub(monkeypatch, {"https://www.loc.gov/search/?q=danny+boy&fo=json&c=5": "{}"})
+
+    with pytest.raises(TypeError):
+        spec.search("danny boy", cache=HttpCache(db_path=tmp_path / "cache.sqlite"))
+
+
+GUTENBERG_RDF = """<?xml version="1.0" encoding="utf-8"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+         xmlns:pgterms="http://www.gutenberg.org/2009/pgterms/"
+         xmlns:dcterms="http://purl.org/dc/terms/">
+  <pgterms:ebook rdf:about="ebooks/123">
+    <dcterms:title>Amazing Grace</dcterms:title>
+    <dcterms:creator>
+      <pgterms:agent rdf:about="2009/agents/99">
+        <pgterms:name>Newton, John</pgterms:name>
+        <pgterms:deathdate>1807</pgterms:deathdate>
+      </pgterms:agent>
+    </dcterms:creator>
+  </pgterms:ebook>
+</rdf:RDF>
+"""
+
+
+def test_gutenberg_record_without_a_year_still_reads_the_work_page(monkeypatch, tmp_path: Path) -> None:
+    work_url = "https://www.gutenberg.org/ebooks/123"
+    _stub(
+        monkeypatch,
+        {
+            "https://www.gutenberg.org/ebooks/search/?query=amazing+grace": "<a href='/ebooks/123'>Amazing Grace</a>",
+            f"{work_url}.rdf": GUTENBERG_RDF,
+            work_url: "<title>Amazing Grace</title> Published 1920.",
+        },
+    )
+    cache = HttpCache(db_path=tmp_path / "cache.sqlite")
+
+    [candidate] = search_candidates("amazing grace", sources=["gutenberg"], max_results=5, cache=cache)
+    rights, evaluation = evaluate_url(work_url, "US", cache=cache)
+
+    assert (candidate.publication_year, candidate.lyricist_death_year) == (1920, 1807)
+    assert work_url in candidate.evidence_urls
+    assert evaluate_candidate(candidate, "US").status.value == "SAFE"
+    assert rights.status.value == "SAFE"
+    assert evaluation.metadata.lyricist_death_year == 1807
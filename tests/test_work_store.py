@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from safe_lyrics_checker.cli import main
+from safe_lyrics_checker.http_cache import HttpCache
+from safe_lyrics_checker.search_engine import search_candidates
+from safe_lyrics_checker.search_sources.models import Candidate
+from safe_lyrics_checker.work_store import WorkStore
+
+
+class DummyResponse:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def raise_for_status(self) -> None:
+        return None
+
+
+RESPONSES = {
+    "https://www.gutenberg.org/ebooks/search/?query=danny+boy": "<a href='/ebooks/7'>Danny Boy</a>",
+    "https://www.gutenberg.org/ebooks/search/?query=londonderry+air": "<a href='/ebooks/7'>Londonderry Air</a>",
+    "https://www.gutenberg.org/ebooks/7": "Published 1913. lyricist died 1928. not renewed.",
+}
+
+
+def _fake_network(monkeypatch) -> list[str]:
+    fetched: list[str] = []
+
+    def fake_get(url: str, timeout: int = 15, headers=None, stream=False):
+        fetched.append(url)
+        return DummyResponse(RESPONSES[url])
+
+    monkeypatch.setattr("safe_lyrics_checker.http_cache.requests.get", fake_get)
+    return fetched
+
+
+def _search(query: str, tmp_path: Path, store: WorkStore) -> list[Candidate]:
+    # A fresh HTTP cache per call isolates the work store's effect.
+    cache = HttpCache(db_path=tmp_path / f"{query}.sqlite")
+    return search_candidates(query, sources=["gutenberg"], max_results=5, cache=cache, store=store)
+
+
+def test_repeat_query_is_served_from_store(monkeypatch, tmp_path: Path) -> None:
+    fetched = _fake_network(monkeypatch)
+    store = WorkStore(tmp_path / "works.sqlite")
+
+    first = _search("danny boy", tmp_path, store)
+    fetched.clear()
+    (tmp_path / "danny boy.sqlite").unlink()
+    second = _search("Danny Boy!", tmp_path, store)
+
+    assert fetched == []
+    assert [c.publication_year for c in second] == [c.publication_year for c in first] == [1913]
+
+
+def test_alias_query_skips_enrichment_of_known_work(monkeypatch, tmp_path: Path) -> None:
+    fetched = _fake_network(monkeypatch)
+    store = WorkStore(tmp_path / "works.sqlite")
+    _search("danny boy", tmp_path, store)
+    fetched.clear()
+
+    alias = _search("londonderry air", tmp_path, store)
+
+    assert fetched == ["https://www.gutenberg.org/ebooks/search/?query=londonderry+air"]
+    assert alias[0].renewal_status == "not_renewed"
+
+
+def test_work_identity_merges_sources(tmp_path: Path) -> None:
+    store = WorkStore(tmp_path / "works.sqlite")
+    imslp = Candidate(title="Danny Boy", source="imslp", work_url="https://imslp.org/wiki/1", lyricist="Weatherly, Frederic")
+    loc = Candidate(
+        title="Danny boy",
+        source="loc",
+        work_url="https://www.loc.gov/item/2",
+        lyricist="Frederic Weatherly",
+        publication_year=1913,
+    )
+    store.remember_work(imslp)
+    store.remember_work(loc)
+
+    merged = store.known_work("imslp", "https://imslp.org/wiki/1")
+    assert merged is not None and merged.publication_year == 1913
+
+
+def test_truncated_answer_is_not_served_to_larger_requests(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setitem(
+        RESPONSES,
+        "https://www.gutenberg.org/ebooks/search/?query=air",
+        "<a href='/ebooks/7'>Londonderry Air</a><a href='/ebooks/8'>Air on the G String</a>",
+    )
+    monkeypatch.setitem(RESPONSES, "https://www.gutenberg.org/ebooks/8", "Published 1871.")
+    fetched = _fake_network(monkeypatch)
+    store = WorkStore(tmp_path / "works.sqlite")
+    cache = HttpCache(db_path=tmp_path / "cache.sqlite")
+
+    first = search_candidates("air", sources=["gutenberg"], max_results=1, cache=cache, store=store)
+    fetched.clear()
+    second = search_candidates("air", sources=["gutenberg"], max_results=5, cache=cache, store=store)
+
+    assert len(first) == 1
+    assert len(second) == 2
+    assert "https://www.gutenberg.org/ebooks/8" in fetched
+
+
+def test_cli_search_with_work_store(monkeypatch, tmp_path: Path, capsys) -> None:
+    fetched = _fake_network(monkeypatch)
+    monkeypatch.chdir(tmp_path)
+    argv = ["search", "danny boy", "--jurisdiction", "US", "--sources", "gutenberg", "--work-store", "works.sqlite"]
+
+    assert main(argv) == 0
+    fetched.clear()
+    (tmp_path / ".cache" / "safe_lyrics_checker.sqlite").unlink()
+    assert main(argv) == 0
+
+    assert fetched == []
+    assert capsys.readouterr().out.count("Danny Boy") == 2